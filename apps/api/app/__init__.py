@@ -1,7 +1,10 @@
 from flask import Flask
 from flask_cors import CORS
 from app.config import Config
-from app.models.database import get_connection_pool, close_connection_pool
+from app.models.database import get_connection_pool, close_connection_pool, init_app as init_database
+from app.utils.query_stats import init_app as init_query_stats
+from app.models.schema import init_app as init_schema
+from app.utils.serializers import init_app as init_serializers
 import atexit
 import logging
 
@@ -19,6 +22,15 @@ def create_app():
         logger.error(f"❌ Failed to initialize connection pool: {e}")
         raise
 
+    # Request bazlı bağlantıyı teardown'da pool'a geri ver
+    init_database(app)
+
+    # Sorgu sayısı / DB süresi (Server-Timing header) ve slow query log
+    init_query_stats(app)
+
+    # orjson JSON provider (jsonify, stream_json_list ve request.get_json için)
+    init_serializers(app)
+
     # Uygulama kapanırken pool'u temizle
     @atexit.register
     def cleanup():
@@ -94,6 +106,9 @@ def create_app():
     app.register_blueprint(procurement_bp)
     app.register_blueprint(hr_documents_bp)
 
+    # Opsiyonel kolonlar ve idempotent DDL adımları açılışta bir kez çözülür
+    init_schema(app)
+
     # Root endpoint
     @app.route('/', methods=['GET'])
     def index():
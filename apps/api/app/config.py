@@ -19,14 +19,74 @@ class Config:
     if not DATABASE_URL:
         DATABASE_URL = f"postgresql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
 
+    # Read replica (opsiyonel): analitik/okuma ağırlıklı GET'ler buraya yönlenir
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL', None)
+    # 'decorator': sadece @read_replica route'ları, 'method': tüm GET istekleri
+    DB_REPLICA_ROUTING = os.getenv('DB_REPLICA_ROUTING', 'decorator').lower()
+    # Yazma yapan kullanıcının okumaları bu süre boyunca primary'den (read-your-writes)
+    # Kayıt cache backend'inde tutulur; CACHE_BACKEND=redis değilse replica kullanılmaz
+    DB_REPLICA_STICKY_SECONDS = float(os.getenv('DB_REPLICA_STICKY_SECONDS', '5'))
+
     # Database Connection Pool
     DB_POOL_MIN_CONNECTIONS = int(os.getenv('DB_POOL_MIN_CONNECTIONS', '2'))
     DB_POOL_MAX_CONNECTIONS = int(os.getenv('DB_POOL_MAX_CONNECTIONS', '10'))
+    # Tüm bağlantılar kullanımdayken sırada bekleme süresi (saniye)
+    DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '10'))
+    # Bağlantı sağlığı: max yaş, boşta kalma süresi ve ping eşiği (saniye)
+    # DB_POOL_PRE_PING_INTERVAL=0 her checkout'ta, negatif değer hiçbir zaman ping atar
+    DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))
+    DB_POOL_IDLE_TIMEOUT = float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300'))
+    DB_POOL_PRE_PING_INTERVAL = float(os.getenv('DB_POOL_PRE_PING_INTERVAL', '30'))
+
+    # Sıcak sorgular için prepared statement cache (opt-in)
+    # Sadece doğrudan bağlantı veya session modundaki pooler'da (5432) açılmalı;
+    # transaction modundaki pooler'larda (pgbouncer/Supavisor 6543) kapalı kalmalı
+    DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', 'false').lower() == 'true'
+
+    # bulk_insert bu satır sayısından itibaren COPY kullanır (RETURNING yoksa)
+    DB_BULK_COPY_THRESHOLD = int(os.getenv('DB_BULK_COPY_THRESHOLD', '5000'))
+
+    # Bu süreyi (ms) aşan sorgular slow query olarak loglanır
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '200'))
+
+    # Cache backend: 'memory' (worker başına) veya 'redis' (tüm worker'lar ortak)
+    # Tag invalidation sadece redis'te tüm worker'lara ulaşır; uzun TTL'ler (dashboard,
+    # yetki matrisi) yalnızca redis ile etkinleşir
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory').lower()
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+    CACHE_KEY_NAMESPACE = os.getenv('CACHE_KEY_NAMESPACE', 'reklam:cache:')
+    CACHE_REDIS_SOCKET_TIMEOUT = float(os.getenv('CACHE_REDIS_SOCKET_TIMEOUT', '0.5'))
+    # Memory backend limitleri (worker başına); aşılınca en az kullanılan girdiler atılır
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '2000'))
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+    # Aynı anahtar hesaplanırken diğer isteklerin bekleme süresi (saniye)
+    CACHE_LOCK_TIMEOUT = float(os.getenv('CACHE_LOCK_TIMEOUT', '10'))
+    # stale-while-revalidate yenilemelerini yapan arka plan thread sayısı
+    CACHE_REFRESH_WORKERS = int(os.getenv('CACHE_REFRESH_WORKERS', '2'))
+
+    # Kullanıcı rol/yetki matrisi cache süresi (saniye, worker bazlı)
+    # PERMISSION_CACHE_TTL sadece CACHE_BACKEND=redis ile (invalidation tüm worker'lara ulaşır);
+    # memory backend'de yetki değişikliği diğer worker'larda en geç PERMISSION_CACHE_LOCAL_TTL sonra görülür
+    PERMISSION_CACHE_TTL = float(os.getenv('PERMISSION_CACHE_TTL', '300'))
+    PERMISSION_CACHE_LOCAL_TTL = float(os.getenv('PERMISSION_CACHE_LOCAL_TTL', '5'))
 
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'change-this-secret-key')
     JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
     JWT_EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS', 24))
+    # Token'a yetki claim'i (resource başına bitset + versiyon) ekle.
+    # Sadece paylaşımlı cache backend'de (redis) etkin olur; versiyon sayacı orada tutulur.
+    JWT_PERMISSION_CLAIMS = os.getenv('JWT_PERMISSION_CLAIMS', 'false').lower() == 'true'
+    # Doğrulanmış token payload cache'i (worker başına girdi sayısı, 0 = kapalı)
+    JWT_DECODE_CACHE_SIZE = int(os.getenv('JWT_DECODE_CACHE_SIZE', '1024'))
+
+    # Şifre doğrulama (bcrypt) API tarafında, sınırlı thread pool ile
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    # Sırada bekleyebilecek en fazla doğrulama; aşılırsa login 503 döner
+    PASSWORD_VERIFY_MAX_PENDING = int(os.getenv('PASSWORD_VERIFY_MAX_PENDING', '32'))
+    PASSWORD_VERIFY_TIMEOUT = float(os.getenv('PASSWORD_VERIFY_TIMEOUT', '10'))
+    # Yeni hash'lerin bcrypt cost'u (pgcrypto gen_salt('bf') varsayılanı 6)
+    PASSWORD_BCRYPT_ROUNDS = int(os.getenv('PASSWORD_BCRYPT_ROUNDS', '10'))
     
     # S3 / Cloudflare R2 Storage
     # For local development, use MinIO (localhost:9000)
@@ -42,3 +102,6 @@ class Config:
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     FLASK_DEBUG = os.getenv('FLASK_DEBUG', '1') == '1'
     FLASK_PORT = int(os.getenv('FLASK_PORT', 5000))
+
+    # JSON response encoder: 'orjson' (datetime/UUID native, hızlı) veya 'stdlib' (Flask varsayılanı)
+    JSON_ENCODER = os.getenv('JSON_ENCODER', 'orjson').lower()
@@ -1,7 +1,45 @@
 from functools import wraps
+import time
 from flask import request, jsonify
+from app.config import Config
 from app.utils.jwt_helper import decode_token
-from app.models.database import execute_query_one
+from app.models.database import execute_query
+from app.models.schema import has_column
+from app.utils.cache import get_cache_backend, invalidate_cache_tags
+
+# Worker bazlı yetki matrisi cache'i: user_id -> (version, expires_at, role)
+# role: {'id', 'code', 'permissions': {resource: {'can_view': ..., ...}}} veya None
+_permission_cache = {}
+_PERMISSION_CACHE_MAX_USERS = 10000
+PERMISSIONS_CACHE_TAG = 'permissions'
+
+# JWT 'perm' claim'inde her resource için action bitleri
+_ACTION_BITS = {'view': 1, 'create': 2, 'update': 4, 'delete': 8}
+
+# Legacy users.role kolonundan rol (kolon varsa); user_roles kaydı önceliklidir
+_LEGACY_ROLE_CANDIDATE = """
+            UNION ALL
+            SELECT r.id, r.code, 1 AS priority
+            FROM users u
+            JOIN roles r ON u.role = r.code
+            WHERE u.id = %s AND r.is_active = TRUE"""
+
+_USER_PERMISSION_MATRIX_QUERY = """
+    WITH user_role AS (
+        SELECT id, code FROM (
+            SELECT r.id, r.code, 0 AS priority
+            FROM user_roles ur
+            JOIN roles r ON ur.role_id = r.id
+            WHERE ur.user_id = %s AND r.is_active = TRUE{legacy_role}
+        ) candidates
+        ORDER BY priority
+        LIMIT 1
+    )
+    SELECT ur.id AS role_id, ur.code AS role_code,
+           rp.resource, rp.can_view, rp.can_create, rp.can_update, rp.can_delete
+    FROM user_role ur
+    LEFT JOIN role_permissions rp ON rp.role_id = ur.id
+"""
 
 def token_required(f):
     """Token kontrolü yapan decorator"""
@@ -78,43 +116,24 @@ def permission_required(resource, action='view'):
             if user_role == 'admin' or user_role == 'yonetici':
                 return f(*args, **kwargs)
 
-            # Kullanıcının rollerini al (önce user_roles tablosundan, yoksa users.role kolonundan)
-            role_query = """
-                SELECT r.id, r.code
-                FROM user_roles ur
-                JOIN roles r ON ur.role_id = r.id
-                WHERE ur.user_id = %s AND r.is_active = TRUE
-                LIMIT 1
-            """
-            role_result = execute_query_one(role_query, (user_id,))
-
-            # Eğer user_roles'de yoksa, users.role kolonuna göre bul (legacy support)
-            if not role_result:
-                legacy_role_query = """
-                    SELECT r.id, r.code
-                    FROM users u
-                    JOIN roles r ON u.role = r.code
-                    WHERE u.id = %s AND r.is_active = TRUE
-                    LIMIT 1
-                """
-                role_result = execute_query_one(legacy_role_query, (user_id,))
-
-            if not role_result:
-                return jsonify({'error': 'Kullanıcı rolü bulunamadı'}), 403
+            # Token'daki yetki claim'i güncelse DB'ye/cache'e hiç gitme
+            if action in _ACTION_BITS and _permission_claims_current(request.current_user):
+                if not request.current_user['perm'].get(resource, 0) & _ACTION_BITS[action]:
+                    return jsonify({
+                        'error': f'{resource} kaynağı için {action} yetkisi yok'
+                    }), 403
+                return f(*args, **kwargs)
 
-            role_id = role_result['id']
+            # Rol + yetki matrisi (cache'ten; miss olursa tek sorgu)
+            role = get_cached_role_permissions(user_id)
 
-            # Permission kontrolü
-            permission_column = f'can_{action}'
-            permission_query = f"""
-                SELECT {permission_column} as has_permission
-                FROM role_permissions
-                WHERE role_id = %s AND resource = %s
-            """
+            if not role:
+                return jsonify({'error': 'Kullanıcı rolü bulunamadı'}), 403
 
-            permission = execute_query_one(permission_query, (role_id, resource))
+            # Permission kontrolü
+            permission = role['permissions'].get(resource)
 
-            if not permission or not permission.get('has_permission'):
+            if not permission or not permission.get(f'can_{action}'):
                 return jsonify({
                     'error': f'{resource} kaynağı için {action} yetkisi yok'
                 }), 403
@@ -125,6 +144,126 @@ def permission_required(resource, action='view'):
     return decorator
 
 
+def _load_role_permissions(user_id):
+    """
+    Kullanıcının rolünü ve rolün yetki matrisini tek sorguda yükle
+    Rol önce user_roles tablosundan, yoksa users.role kolonundan (legacy, kolon varsa) bulunur
+    """
+    # SQL kolona göre değiştiği için her varyantın prepared statement adı ayrı
+    if has_column('users', 'role'):
+        query = _USER_PERMISSION_MATRIX_QUERY.format(legacy_role=_LEGACY_ROLE_CANDIDATE)
+        params, statement_name = (user_id, user_id), 'auth_user_permission_matrix_role'
+    else:
+        query = _USER_PERMISSION_MATRIX_QUERY.format(legacy_role='')
+        params, statement_name = (user_id,), 'auth_user_permission_matrix_norole'
+
+    rows = execute_query(query, params, prepared=statement_name)
+    if not rows:
+        return None
+
+    permissions = {}
+    for row in rows:
+        if row['resource'] is None:
+            continue
+        permissions[row['resource']] = {
+            'can_view': row['can_view'],
+            'can_create': row['can_create'],
+            'can_update': row['can_update'],
+            'can_delete': row['can_delete']
+        }
+
+    return {
+        'id': rows[0]['role_id'],
+        'code': rows[0]['role_code'],
+        'permissions': permissions
+    }
+
+
+def get_cached_role_permissions(user_id):
+    """
+    Kullanıcının rolü ve yetki matrisi (worker bazlı cache)
+
+    Rol/yetki değişikliklerinde PERMISSIONS_CACHE_TAG invalidate edilir; tag versiyonu
+    cache backend'de tutulduğu için Redis ile tüm worker'lara ulaşır ve girdiler
+    PERMISSION_CACHE_TTL boyunca tutulur. Memory backend'de invalidation sadece değişikliği
+    yapan worker'a ulaştığından girdiler PERMISSION_CACHE_LOCAL_TTL sonunda yeniden yüklenir.
+    """
+    backend = get_cache_backend()
+    ttl = Config.PERMISSION_CACHE_TTL if backend.shared else Config.PERMISSION_CACHE_LOCAL_TTL
+    versions = backend.get_tag_versions((PERMISSIONS_CACHE_TAG,))
+    version = versions[0] if versions else None
+    now = time.time()
+
+    cached = _permission_cache.get(user_id)
+    if cached and version is not None and cached[0] == version and cached[1] > now:
+        return cached[2]
+
+    role = _load_role_permissions(user_id)
+
+    if version is not None and ttl > 0:
+        if len(_permission_cache) >= _PERMISSION_CACHE_MAX_USERS:
+            _permission_cache.clear()
+        _permission_cache[user_id] = (version, now + ttl, role)
+
+    return role
+
+
+def _permission_claims_enabled():
+    # Versiyon sayacı tüm worker'larda aynı olmalı; memory backend'de claim kullanılmaz
+    return Config.JWT_PERMISSION_CLAIMS and get_cache_backend().shared
+
+
+def _permission_claims_current(payload):
+    """
+    Token'daki yetki claim'i mevcut yetki versiyonuyla üretilmiş mi?
+
+    Versiyon sayaç + rastgele epoch'tur (get_tag_token): cache temizlenir, Redis yeniden
+    başlar veya anahtar düşerse yeni epoch üretilir, eski token'lar bir daha eşleşmez.
+    """
+    if 'perm' not in payload or 'pv' not in payload or not _permission_claims_enabled():
+        return False
+    token = get_cache_backend().get_tag_token(PERMISSIONS_CACHE_TAG)
+    return token is not None and token == payload['pv']
+
+
+def build_permission_claims(user_id):
+    """
+    Login'de token'a eklenecek yetki claim'i
+
+    Returns:
+        tuple: ({resource: bitmask}, versiyon) veya claim kullanılamıyorsa (None, None)
+    """
+    if not _permission_claims_enabled():
+        return None, None
+
+    # Versiyon önce okunur: yükleme sırasında değişiklik olursa claim eski versiyonla
+    # işaretlenir ve ilk istekte DB'ye düşülür
+    version = get_cache_backend().get_tag_token(PERMISSIONS_CACHE_TAG)
+    if version is None:
+        return None, None
+
+    role = _load_role_permissions(user_id)
+    if not role:
+        return None, None
+
+    claims = {}
+    for resource, permission in role['permissions'].items():
+        mask = 0
+        for action, bit in _ACTION_BITS.items():
+            if permission.get(f'can_{action}'):
+                mask |= bit
+        if mask:
+            claims[resource] = mask
+
+    return claims, version
+
+
+def invalidate_permission_cache():
+    """Rol, kullanıcı-rol veya yetki değişikliğinden sonra tüm yetki cache'ini geçersiz kıl"""
+    _permission_cache.clear()
+    invalidate_cache_tags(PERMISSIONS_CACHE_TAG)
+
+
 def get_user_permissions(user_id):
     """
     Kullanıcının tüm yetkilerini döndürür (helper function)
@@ -143,7 +282,6 @@ def get_user_permissions(user_id):
         WHERE ur.user_id = %s
     """
 
-    from app.models.database import execute_query
     permissions = execute_query(query, (user_id,))
 
     result = {}
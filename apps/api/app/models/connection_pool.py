@@ -0,0 +1,424 @@
+"""
+Blocking, FIFO connection pool for psycopg2
+
+psycopg2'nin ThreadedConnectionPool'u tüm bağlantılar kullanımdayken
+hemen PoolError fırlatır. Bu pool ise bekleyenleri sıraya alır (FIFO),
+acquire timeout süresi dolana kadar bekletir ve bekleme/kullanım
+sürelerini metrik olarak tutar.
+
+Bağlantı sağlığı da pool tarafından yönetilir: kirli (transaction'da
+kalmış) bağlantılar geri dönüşte rollback edilir, uzun süre boşta kalan
+bağlantılar checkout'ta ping'lenir, max yaşı aşan veya fazla boşta kalan
+bağlantılar kapatılıp yenilenir.
+"""
+
+import time
+import threading
+from collections import deque
+
+import psycopg2
+from psycopg2 import pool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bekleyene "yeni bağlantı açabilirsin" sinyali
+_OPEN_SLOT = object()
+
+
+class PoolTimeout(pool.PoolError):
+    """acquire_timeout süresi içinde bağlantı alınamadı"""
+
+
+class Histogram:
+    """Milisaniye bazlı basit histogram (thread-safe değil, pool lock'u ile korunur)"""
+
+    BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    __slots__ = ('counts', 'count', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds):
+        ms = seconds * 1000.0
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        for i, bound in enumerate(self.BOUNDS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def percentile(self, p):
+        """Bucket üst sınırına göre yaklaşık yüzdelik (ms)"""
+        if not self.count:
+            return 0
+        target = self.count * p
+        running = 0
+        for i, bound in enumerate(self.BOUNDS_MS):
+            running += self.counts[i]
+            if running >= target:
+                return bound
+        return round(self.max_ms, 2)
+
+    def snapshot(self):
+        buckets = {f'le_{bound}ms': self.counts[i] for i, bound in enumerate(self.BOUNDS_MS)}
+        buckets['inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 2) if self.count else 0,
+            'max_ms': round(self.max_ms, 2),
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'buckets': buckets
+        }
+
+
+class _Waiter:
+    __slots__ = ('event', 'conn')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+
+
+class BlockingConnectionPool:
+    """
+    ThreadedConnectionPool yerine kullanılan, bekleyebilen pool.
+
+    - Boş bağlantı yoksa ve maxconn'a ulaşıldıysa bekleyenler FIFO sırayla
+      bağlantı alır (geri verilen bağlantı doğrudan sıradakine devredilir).
+    - acquire_timeout saniye içinde bağlantı alınamazsa PoolTimeout fırlatır.
+    - max_lifetime saniyeden eski bağlantılar geri dönüşte/checkout'ta yenilenir.
+    - idle_timeout saniyeden uzun boşta kalanlar (minconn üstü) kapatılır.
+    - pre_ping_interval saniyeden uzun boşta kalan bağlantı checkout'ta
+      SELECT 1 ile test edilir; kopmuşsa yerine yenisi açılır.
+    - getconn/putconn/closeall imzaları psycopg2 pool'u ile uyumludur.
+    """
+
+    def __init__(self, minconn, maxconn, *args, acquire_timeout=10.0,
+                 max_lifetime=1800.0, idle_timeout=300.0, pre_ping_interval=30.0, **kwargs):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise pool.PoolError("invalid minconn/maxconn values")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.acquire_timeout = acquire_timeout
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.pre_ping_interval = pre_ping_interval
+        self.closed = False
+
+        self._args = args
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._idle = deque()     # (conn, boşa düştüğü zaman); sağ uç en yeni
+        self._used = {}          # id(conn) -> (conn, checkout zamanı)
+        self._created = {}       # id(conn) -> açılış zamanı
+        self._waiters = deque()
+        self._size = 0           # açık + açılmakta olan bağlantı sayısı
+
+        # Metrikler
+        self._acquire_wait = Histogram()
+        self._checkout_duration = Histogram()
+        self._acquire_count = 0
+        self._timeouts = 0
+        self._connections_opened = 0
+        self._connections_closed = 0
+        self._max_waiting = 0
+        self._pings = 0
+        self._ping_failures = 0
+        self._dirty_rollbacks = 0
+        self._broken_discarded = 0
+        self._recycled_max_age = 0
+        self._evicted_idle = 0
+
+        for _ in range(minconn):
+            self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                self._size -= 1
+                self.closeall()
+                raise
+            self._register(conn)
+            self._idle.append((conn, time.monotonic()))
+
+    def _connect(self):
+        return psycopg2.connect(*self._args, **self._kwargs)
+
+    def _register(self, conn):
+        """Lock altında (veya init'te) çağrılır: yeni bağlantıyı kaydet"""
+        self._created[id(conn)] = time.monotonic()
+        self._connections_opened += 1
+
+    def _is_expired(self, conn, now):
+        """Kapanmış veya max_lifetime'ı aşmış bağlantı mı?"""
+        if conn.closed:
+            return True
+        if self.max_lifetime:
+            created_at = self._created.get(id(conn), now)
+            return now - created_at > self.max_lifetime
+        return False
+
+    def _checkout(self, conn, started):
+        """Lock altında çağrılır: bağlantıyı kullanımda olarak işaretle"""
+        if self.closed:
+            self._discard(conn)
+            raise pool.PoolError("connection pool is closed")
+        now = time.monotonic()
+        self._used[id(conn)] = (conn, now)
+        self._acquire_count += 1
+        self._acquire_wait.observe(now - started)
+        return conn
+
+    def _ping(self, conn):
+        """Bağlantıyı SELECT 1 ile test et (transaction açmadan)"""
+        try:
+            conn.autocommit = True
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.close()
+            finally:
+                conn.autocommit = False
+            return True
+        except Exception as e:
+            logger.info(f"Discarding stale pooled connection: {e}")
+            return False
+
+    def _take_idle(self, now):
+        """
+        Lock altında çağrılır: boştaki en yeni sağlıklı bağlantıyı al.
+        Kapanmış veya yaşlanmış olanlar yol üstünde kapatılır.
+
+        Returns:
+            (conn, idle_since) veya (None, None)
+        """
+        while self._idle:
+            conn, idle_since = self._idle.pop()
+            if self._is_expired(conn, now):
+                if conn.closed:
+                    self._broken_discarded += 1
+                else:
+                    self._recycled_max_age += 1
+                self._discard(conn)
+                continue
+            return conn, idle_since
+        return None, None
+
+    def _evict_idle(self, now):
+        """Lock altında çağrılır: idle_timeout'u aşan (minconn üstü) bağlantıları kapat"""
+        if not self.idle_timeout:
+            return
+        while self._idle and self._size > self.minconn:
+            conn, idle_since = self._idle[0]
+            if now - idle_since <= self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._evicted_idle += 1
+            self._discard(conn)
+
+    def getconn(self, timeout=None):
+        """
+        Pool'dan bağlantı al; gerekirse sıraya girip bekle.
+
+        Args:
+            timeout: Saniye (None ise acquire_timeout kullanılır)
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        conn = None
+        idle_since = None
+        open_new = False
+
+        with self._lock:
+            if self.closed:
+                raise pool.PoolError("connection pool is closed")
+
+            if not self._waiters:
+                self._evict_idle(started)
+                conn, idle_since = self._take_idle(started)
+                if conn is None and self._size < self.maxconn:
+                    self._size += 1
+                    open_new = True
+
+            if conn is None and not open_new:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                if len(self._waiters) > self._max_waiting:
+                    self._max_waiting = len(self._waiters)
+
+        if conn is None and not open_new:
+            waiter.event.wait(timeout)
+            with self._lock:
+                if waiter.conn is None:
+                    if self.closed:
+                        raise pool.PoolError("connection pool is closed")
+                    # Süre doldu ve kimse devretmedi
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        pass
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"could not acquire connection within {timeout:.1f}s "
+                        f"(in_use={len(self._used)}, max={self.maxconn})"
+                    )
+                if waiter.conn is not _OPEN_SLOT:
+                    # Az önce geri verilmiş bağlantı, ping gerekmez
+                    return self._checkout(waiter.conn, started)
+            # Bir bağlantı kapatıldı, yerine yenisini bu waiter açacak
+            open_new = True
+
+        if conn is not None:
+            if self.pre_ping_interval is None or time.monotonic() - idle_since < self.pre_ping_interval:
+                with self._lock:
+                    return self._checkout(conn, started)
+
+            healthy = self._ping(conn)
+            with self._lock:
+                self._pings += 1
+                if healthy:
+                    return self._checkout(conn, started)
+                # Slot bizde kalır, yerine yeni bağlantı açılır
+                self._ping_failures += 1
+                self._connections_closed += 1
+                self._created.pop(id(conn), None)
+            try:
+                conn.close()
+            except Exception as e:
+                logger.debug(f"Ignored error while closing connection: {e}")
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._wake_for_open_slot()
+            raise
+
+        with self._lock:
+            self._register(conn)
+            return self._checkout(conn, started)
+
+    def _wake_for_open_slot(self):
+        """Lock altında çağrılır: boşalan kapasiteyi sıradaki bekleyene ver"""
+        if self._waiters and not self.closed and self._size < self.maxconn:
+            waiter = self._waiters.popleft()
+            self._size += 1
+            waiter.conn = _OPEN_SLOT
+            waiter.event.set()
+
+    def _discard(self, conn):
+        """Lock altında çağrılır: bağlantıyı kapat ve kapasiteyi serbest bırak"""
+        self._size -= 1
+        self._connections_closed += 1
+        self._created.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Ignored error while closing connection: {e}")
+        self._wake_for_open_slot()
+
+    def putconn(self, conn, key=None, close=False):
+        """
+        Bağlantıyı pool'a geri koy (sıradaki bekleyene devredilir).
+        Açık transaction'da kalmış bağlantı rollback edilir; kopmuş veya
+        max_lifetime'ı aşmış bağlantı kapatılır.
+        """
+        reusable = not close and not conn.closed
+        rolled_back = False
+        if reusable:
+            status = conn.info.transaction_status
+            if status == TRANSACTION_STATUS_UNKNOWN:
+                reusable = False
+            elif status != TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                    rolled_back = True
+                except Exception:
+                    reusable = False
+
+        with self._lock:
+            entry = self._used.pop(id(conn), None)
+            if entry is None:
+                raise pool.PoolError("trying to put unkeyed connection")
+            now = time.monotonic()
+            self._checkout_duration.observe(now - entry[1])
+            if rolled_back:
+                self._dirty_rollbacks += 1
+
+            if self.closed or not reusable:
+                if not self.closed and not close:
+                    self._broken_discarded += 1
+                self._discard(conn)
+                return
+
+            if self._is_expired(conn, now):
+                self._recycled_max_age += 1
+                self._discard(conn)
+                return
+
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.conn = conn
+                waiter.event.set()
+            else:
+                self._idle.append((conn, now))
+                self._evict_idle(now)
+
+    def closeall(self):
+        """Tüm bağlantıları kapat ve bekleyenleri uyandır"""
+        with self._lock:
+            self.closed = True
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+            # Kullanımdaki bağlantılar da kapatılır; putconn ile dönünce sayaçtan düşer
+            for conn, _ in self._used.values():
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.debug(f"Ignored error while closing connection: {e}")
+            while self._waiters:
+                # conn None kalır -> bekleyen "pool closed" hatası alır
+                self._waiters.popleft().event.set()
+
+    def stats(self):
+        """Pool durumu ve metrikleri (monitoring için)"""
+        with self._lock:
+            return {
+                'min_connections': self.minconn,
+                'max_connections': self.maxconn,
+                'available': len(self._idle),
+                'in_use': len(self._used),
+                'total': self._size,
+                'waiting': len(self._waiters),
+                'max_waiting': self._max_waiting,
+                'acquire_timeout_seconds': self.acquire_timeout,
+                'acquire_count': self._acquire_count,
+                'timeouts': self._timeouts,
+                'connections_opened': self._connections_opened,
+                'connections_closed': self._connections_closed,
+                'acquire_wait': self._acquire_wait.snapshot(),
+                'checkout_duration': self._checkout_duration.snapshot(),
+                'health': {
+                    'max_lifetime_seconds': self.max_lifetime,
+                    'idle_timeout_seconds': self.idle_timeout,
+                    'pre_ping_interval_seconds': self.pre_ping_interval,
+                    'pings': self._pings,
+                    'ping_failures': self._ping_failures,
+                    'dirty_rollbacks': self._dirty_rollbacks,
+                    'broken_discarded': self._broken_discarded,
+                    'recycled_max_age': self._recycled_max_age,
+                    'evicted_idle': self._evicted_idle
+                }
+            }
@@ -1,15 +1,54 @@
 import psycopg2
-from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor, Json, execute_values
+from contextlib import contextmanager
+from functools import wraps
+from flask import g, has_app_context, has_request_context, request
 from app.config import Config
+from app.models.connection_pool import BlockingConnectionPool
+from app.utils.cache import get_cache_backend
+from app.utils.query_stats import record_query
+import io
+import json
 import logging
+import math
+import re
+import threading
+import time
+import uuid
+import weakref
 
 logger = logging.getLogger(__name__)
 
 # Global connection pool
 _connection_pool = None
+_replica_pool = None
+_replica_unavailable = False
 _pool_shutting_down = False
 
+# Read-your-writes: cache anahtarı -> primary'ye yönlendirme bitiş zamanı (tüm worker'lar ortak)
+_RECENT_WRITE_KEY = 'db:recent_write:'
+_replica_sticky_warned = False
+_READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# transaction() bloğu içindeki bağlantı (thread bazlı)
+_tx_state = threading.local()
+
+# Prepared statement kayıtları
+# name -> çevrilmiş SQL; fiziksel bağlantı -> o bağlantıda hazırlanmış isimler
+_prepared_sql = {}
+_prepared_by_conn = weakref.WeakKeyDictionary()
+_prepared_stats = {}
+_prepared_lock = threading.Lock()
+_PLACEHOLDER_RE = re.compile(r'%(s|%)')
+_STATEMENT_NAME_RE = re.compile(r'^[a-z_][a-z0-9_]*$')
+# Bağlantıdaki statement'ların takip edilen kayıtla uyuşmadığını gösteren hatalar
+_PREPARED_STATE_ERRORS = (
+    psycopg2.errors.InvalidSqlStatementName,
+    psycopg2.errors.DuplicatePreparedStatement,
+)
+
 
 class PooledConnection:
     __slots__ = ('_conn', '_pool', '_closed')
@@ -34,6 +73,17 @@ class PooledConnection:
     def __getattr__(self, item):
         return getattr(self._conn, item)
 
+def _pool_options():
+    """Primary ve replica pool'ları için ortak bekleme/sağlık ayarları"""
+    return {
+        'acquire_timeout': Config.DB_POOL_ACQUIRE_TIMEOUT,
+        'max_lifetime': Config.DB_POOL_MAX_LIFETIME,
+        'idle_timeout': Config.DB_POOL_IDLE_TIMEOUT,
+        'pre_ping_interval': (
+            Config.DB_POOL_PRE_PING_INTERVAL if Config.DB_POOL_PRE_PING_INTERVAL >= 0 else None
+        )
+    }
+
 def get_connection_pool():
     """
     Singleton pattern ile connection pool döndür.
@@ -48,21 +98,24 @@ def get_connection_pool():
             # Pool parametreleri
             minconn = Config.DB_POOL_MIN_CONNECTIONS
             maxconn = Config.DB_POOL_MAX_CONNECTIONS
+            pool_options = _pool_options()
 
             if database_url:
                 # DATABASE_URL ile pool oluştur (Supabase/Production)
-                _connection_pool = pool.ThreadedConnectionPool(
+                _connection_pool = BlockingConnectionPool(
                     minconn,
                     maxconn,
                     database_url,
+                    **pool_options,
                     cursor_factory=RealDictCursor,
                     sslmode='prefer'
                 )
             else:
                 # Ayrı parametreler ile pool oluştur (Local development)
-                _connection_pool = pool.ThreadedConnectionPool(
+                _connection_pool = BlockingConnectionPool(
                     minconn,
                     maxconn,
+                    **pool_options,
                     host=Config.DATABASE_HOST,
                     port=Config.DATABASE_PORT,
                     database=Config.DATABASE_NAME,
@@ -71,16 +124,45 @@ def get_connection_pool():
                     cursor_factory=RealDictCursor
                 )
 
-            logger.info(f"✅ Database connection pool created: min={minconn}, max={maxconn}")
+            logger.info(
+                f"✅ Database connection pool created: min={minconn}, max={maxconn}, "
+                f"acquire_timeout={pool_options['acquire_timeout']}s, "
+                f"max_lifetime={pool_options['max_lifetime']}s"
+            )
         except Exception as e:
             logger.error(f"❌ Failed to create connection pool: {e}")
             raise
 
     return _connection_pool
 
+def get_replica_pool():
+    """
+    DATABASE_REPLICA_URL tanımlıysa read replica pool'unu döndür, yoksa None.
+    Replica'ya bağlanılamazsa bir kez loglanır ve okumalar primary'de kalır.
+    """
+    global _replica_pool, _replica_unavailable
+
+    if _replica_pool is None and Config.DATABASE_REPLICA_URL and not _replica_unavailable:
+        try:
+            _replica_pool = BlockingConnectionPool(
+                Config.DB_POOL_MIN_CONNECTIONS,
+                Config.DB_POOL_MAX_CONNECTIONS,
+                Config.DATABASE_REPLICA_URL,
+                **_pool_options(),
+                cursor_factory=RealDictCursor,
+                sslmode='prefer'
+            )
+            logger.info("✅ Read replica connection pool created")
+        except Exception as e:
+            _replica_unavailable = True
+            logger.error(f"❌ Failed to create replica pool, reads stay on primary: {e}")
+
+    return _replica_pool
+
 def get_db_connection():
     """
     Connection pool'dan bir bağlantı al.
+    Boş bağlantı yoksa DB_POOL_ACQUIRE_TIMEOUT saniyeye kadar sırada bekler.
     Kullanım sonrası mutlaka putconn() ile geri koy!
     """
     try:
@@ -116,6 +198,7 @@ def close_connection_pool():
     Connection pool'u tamamen kapat (uygulama shutdown'da kullanılır)
     """
     global _connection_pool
+    global _replica_pool
     global _pool_shutting_down
     if _connection_pool:
         _pool_shutting_down = True
@@ -125,35 +208,420 @@ def close_connection_pool():
             _pool_shutting_down = False
         _connection_pool = None
         logger.info("✅ Connection pool closed")
+    if _replica_pool:
+        _pool_shutting_down = True
+        try:
+            _replica_pool.closeall()
+        finally:
+            _pool_shutting_down = False
+        _replica_pool = None
+        logger.info("✅ Replica connection pool closed")
 
 def get_pool_stats():
     """
     Pool istatistiklerini döndür (monitoring için)
+    Bekleme süresi histogramı, checkout süreleri ve timeout sayısı dahil.
+    """
+    return get_connection_pool().stats()
+
+def get_replica_pool_stats():
+    """Replica pool istatistikleri (replica tanımlı değilse None)"""
+    replica_pool = get_replica_pool()
+    return replica_pool.stats() if replica_pool else None
+
+
+def read_replica(f):
+    """
+    Route'un okuma sorgularını read replica'ya yönlendir.
+    DATABASE_REPLICA_URL yoksa, kullanıcı yakın zamanda yazdıysa veya
+    request içinde yazma yapıldıysa sorgular primary'de çalışır.
+
+    Usage:
+        @jobs_bp.route('/<job_id>/timeline', methods=['GET'])
+        @token_required
+        @read_replica
+        def get_job_timeline(job_id):
+            ...
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        g._db_prefer_replica = True
+        return f(*args, **kwargs)
+
+    return decorated
+
+
+def _current_user_id():
+    current_user = getattr(request, 'current_user', None) if has_request_context() else None
+    return current_user.get('user_id') if current_user else None
+
+
+def mark_recent_write(user_id=None):
     """
-    pool = get_connection_pool()
-    # ThreadedConnectionPool'da _used ve _pool private attributes'lar
-    # Bu bilgiyi almak için biraz workaround gerekir
+    Kullanıcıyı DB_REPLICA_STICKY_SECONDS boyunca primary'ye sabitle.
+    Kayıt paylaşılan cache backend'inde (Redis) tutulur; kullanıcının sonraki
+    isteği hangi worker'a düşerse düşsün görülür.
+    """
+    user_id = user_id or _current_user_id()
+    if not user_id:
+        return
+
+    backend = get_cache_backend()
+    if not backend.shared:
+        # Replica yönlendirmesi zaten kapalı (bkz. _replica_sticky_available)
+        return
+
+    sticky_seconds = Config.DB_REPLICA_STICKY_SECONDS
+    backend.set(f'{_RECENT_WRITE_KEY}{user_id}', time.time() + sticky_seconds,
+                max(1, math.ceil(sticky_seconds)))
+
+
+def _recently_wrote(user_id):
+    until = get_cache_backend().get(f'{_RECENT_WRITE_KEY}{user_id}')
+    return isinstance(until, (int, float)) and until > time.time()
+
+
+def _replica_sticky_available():
+    """
+    Read-your-writes için paylaşılan backend gerekir: memory backend'de yazmayı
+    yapan worker dışındaki worker'lar kaydı görmez. Bu durumda okumalar primary'de kalır.
+    """
+    global _replica_sticky_warned
+    if get_cache_backend().shared:
+        return True
+    if not _replica_sticky_warned:
+        _replica_sticky_warned = True
+        logger.warning("DATABASE_REPLICA_URL requires a shared cache backend (CACHE_BACKEND=redis) "
+                       "for read-your-writes; routing all reads to the primary")
+    return False
+
+
+def _should_use_replica():
+    """Bu request'teki okuma sorgusu replica'ya gidebilir mi?"""
+    if not Config.DATABASE_REPLICA_URL or not has_request_context():
+        return False
+    if g.get('_db_wrote'):
+        return False
+
+    prefer = g.get('_db_prefer_replica') or (
+        Config.DB_REPLICA_ROUTING == 'method' and request.method in _READ_METHODS
+    )
+    if not prefer:
+        return False
+
+    if not _replica_sticky_available():
+        return False
+
+    user_id = _current_user_id()
+    if user_id and _recently_wrote(user_id):
+        return False
+
+    return get_replica_pool() is not None
+
+
+def get_request_connection():
+    """
+    Request boyunca kullanılacak bağlantıyı döndür.
+    İlk sorguda pool'dan alınır, Flask `g` üzerinde saklanır ve
+    teardown'da release_request_connection() ile geri verilir.
+    Flask app context yoksa (script, CLI) None döner.
+    """
+    if not has_app_context():
+        return None
+
+    conn = g.get('_db_conn')
+    if conn is None or conn._closed:
+        conn = get_db_connection()
+        g._db_conn = conn
+    return conn
+
+
+def get_request_replica_connection():
+    """
+    Request boyunca kullanılacak replica bağlantısı (bkz. get_request_connection).
+    Replica'dan bağlantı alınamazsa None döner; okuma primary'ye düşer.
+    """
+    conn = g.get('_db_replica_conn')
+    if conn is None or conn._closed:
+        replica_pool = get_replica_pool()
+        try:
+            conn = PooledConnection(replica_pool.getconn(), replica_pool)
+        except Exception as e:
+            logger.warning(f"Replica connection unavailable, using primary: {e}")
+            return None
+        g._db_replica_conn = conn
+    return conn
+
+
+def release_request_connection(exc=None):
+    """
+    Request'e bağlı bağlantıları pool'a geri ver (teardown_appcontext hook'u).
+    Açık kalan (sadece okuma yapılmış veya hatalı) transaction geri alınır.
+    """
+    for attr in ('_db_conn', '_db_replica_conn'):
+        conn = g.pop(attr, None)
+        if conn is None:
+            continue
+
+        try:
+            if not conn.closed and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception as e:
+            logger.warning(f"Could not rollback request connection: {e}")
+        release_db_connection(conn)
+
+
+def _remember_writer(response):
+    """Yazma isteği yapan kullanıcının sonraki okumalarını kısa süre primary'de tut"""
+    if Config.DATABASE_REPLICA_URL and request.method not in _READ_METHODS:
+        mark_recent_write()
+    return response
+
+
+def init_app(app):
+    """Request bazlı bağlantı yönetimini Flask uygulamasına bağla"""
+    app.teardown_appcontext(release_request_connection)
+    app.after_request(_remember_writer)
+
+
+@contextmanager
+def transaction():
+    """
+    Birden fazla yazma işlemini tek transaction'da topla.
+    Blok içinde execute_write / execute_query(fetch=False) commit etmez;
+    blok sonunda commit, hata durumunda rollback yapılır.
+
+    Usage:
+        with transaction():
+            execute_write("INSERT ...", params)
+            execute_write("UPDATE ...", params)
+    """
+    outer = getattr(_tx_state, 'conn', None)
+    if outer is not None:
+        # İç içe kullanım: dıştaki transaction'a katıl
+        yield outer
+        return
+
+    conn = get_request_connection()
+    owns_connection = conn is None
+    if owns_connection:
+        conn = get_db_connection()
+
+    _tx_state.conn = conn
     try:
-        # pool._pool: kullanılabilir bağlantılar
-        # pool._used: kullanımda olan bağlantılar
-        return {
-            'min_connections': Config.DB_POOL_MIN_CONNECTIONS,
-            'max_connections': Config.DB_POOL_MAX_CONNECTIONS,
-            'available': len(pool._pool),
-            'in_use': len(pool._used),
-            'total': len(pool._pool) + len(pool._used)
-        }
-    except Exception as e:
-        logger.warning(f"Could not get pool stats: {e}")
-        return {
-            'min_connections': Config.DB_POOL_MIN_CONNECTIONS,
-            'max_connections': Config.DB_POOL_MAX_CONNECTIONS,
-            'available': 'unknown',
-            'in_use': 'unknown',
-            'total': 'unknown'
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        _tx_state.conn = None
+        if owns_connection:
+            release_db_connection(conn)
+
+
+@contextmanager
+def _connection_scope(readonly=False):
+    """
+    Helper'ların kullanacağı bağlantıyı seç.
+    Öncelik: transaction() bloğu > (okumada) replica > request bağlantısı
+    > tek seferlik checkout.
+
+    Yields:
+        (conn, in_transaction)
+    """
+    tx_conn = getattr(_tx_state, 'conn', None)
+    if tx_conn is not None:
+        yield tx_conn, True
+        return
+
+    if readonly and _should_use_replica():
+        replica_conn = get_request_replica_connection()
+        if replica_conn is not None:
+            yield replica_conn, False
+            return
+
+    if not readonly and has_app_context():
+        # Request içinde yazma yapıldı: sonraki okumalar da primary'den
+        g._db_wrote = True
+
+    conn = get_request_connection()
+    if conn is not None:
+        yield conn, False
+        return
+
+    conn = get_db_connection()
+    try:
+        yield conn, False
+    finally:
+        release_db_connection(conn)
+
+
+def _to_server_placeholders(query):
+    """psycopg2 %s yer tutucularını PREPARE için $1, $2... biçimine çevir"""
+    counter = 0
+
+    def replace(match):
+        nonlocal counter
+        if match.group(1) == '%':
+            return '%'
+        counter += 1
+        return f'${counter}'
+
+    return _PLACEHOLDER_RE.sub(replace, query), counter
+
+
+def _adapt_prepared_param(value):
+    """
+    EXECUTE argümanı olarak gönderilecek değeri hazırla.
+    Listeler tipsiz array literal'ine ('{"a","b"}') çevrilir; böylece
+    PREPARE'de çıkarılan tipe (uuid[], int[]...) otomatik dönüşür.
+    """
+    if isinstance(value, list):
+        items = []
+        for item in value:
+            if item is None:
+                items.append('NULL')
+            else:
+                text = str(item).replace('\\', '\\\\').replace('"', '\\"')
+                items.append(f'"{text}"')
+        return '{' + ','.join(items) + '}'
+    return value
+
+
+def _register_prepared(name, query):
+    """Statement adını SQL ile eşle; aynı ad farklı SQL ile kullanılamaz"""
+    if not _STATEMENT_NAME_RE.match(name):
+        raise ValueError(f"Invalid prepared statement name: {name}")
+
+    server_sql = _prepared_sql.get(name)
+    if server_sql is None:
+        converted, param_count = _to_server_placeholders(query)
+        with _prepared_lock:
+            server_sql = _prepared_sql.setdefault(name, (converted, param_count))
+            _prepared_stats.setdefault(name, {
+                'prepares': 0, 'executions': 0, 'total_ms': 0.0, 'errors': 0, 'retries': 0
+            })
+    elif server_sql[0] != _to_server_placeholders(query)[0]:
+        raise ValueError(f"Prepared statement '{name}' is already registered with different SQL")
+    return server_sql
+
+
+def _prepare_and_execute(cursor, name, server_sql, params, prepared_names, stats):
+    if name not in prepared_names:
+        cursor.execute(f'PREPARE {name} AS {server_sql}')
+        prepared_names.add(name)
+        with _prepared_lock:
+            stats['prepares'] += 1
+
+    if params:
+        placeholders = ', '.join(['%s'] * len(params))
+        cursor.execute(
+            f'EXECUTE {name} ({placeholders})',
+            tuple(_adapt_prepared_param(value) for value in params)
+        )
+    else:
+        cursor.execute(f'EXECUTE {name}')
+
+
+def _execute_prepared(conn, cursor, name, query, params):
+    """
+    Sorguyu fiziksel bağlantı başına bir kez PREPARE et, sonra EXECUTE ile çalıştır.
+    DB_PREPARED_STATEMENTS kapalıysa normal execute'a düşer.
+
+    Sunucu tarafındaki statement'lar takip edilenle uyuşmazsa (DISCARD ALL, pooler'ın
+    bağlantıyı başka backend'e vermesi) bağlantıdaki statement'lar DEALLOCATE ALL ile
+    sıfırlanır, statement yeniden hazırlanır ve sorgu bir kez tekrar denenir.
+    """
+    if not Config.DB_PREPARED_STATEMENTS:
+        cursor.execute(query, params)
+        return
+
+    if isinstance(params, dict):
+        raise ValueError("Prepared statements only support positional parameters")
+    params = tuple(params or ())
+
+    server_sql, param_count = _register_prepared(name, query)
+    if len(params) != param_count:
+        raise ValueError(f"Prepared statement '{name}' expects {param_count} parameters, got {len(params)}")
+
+    raw_conn = conn._conn if isinstance(conn, PooledConnection) else conn
+    with _prepared_lock:
+        prepared_names = _prepared_by_conn.setdefault(raw_conn, set())
+    stats = _prepared_stats[name]
+
+    # transaction() bloğunda hata tüm transaction'ı bozmasın diye savepoint;
+    # blok dışında açık transaction sadece okuma içerir ve geri alınabilir
+    in_block = getattr(_tx_state, 'conn', None) is not None
+
+    started = time.perf_counter()
+    try:
+        if in_block:
+            cursor.execute('SAVEPOINT prepared_statement')
+        try:
+            _prepare_and_execute(cursor, name, server_sql, params, prepared_names, stats)
+        except _PREPARED_STATE_ERRORS as e:
+            logger.warning(f"Prepared statement '{name}' out of sync with server, re-preparing: {e}")
+            if in_block:
+                cursor.execute('ROLLBACK TO SAVEPOINT prepared_statement')
+            else:
+                raw_conn.rollback()
+            cursor.execute('DEALLOCATE ALL')
+            prepared_names.clear()
+            with _prepared_lock:
+                stats['retries'] += 1
+            _prepare_and_execute(cursor, name, server_sql, params, prepared_names, stats)
+        if in_block:
+            cursor.execute('RELEASE SAVEPOINT prepared_statement')
+    except Exception:
+        with _prepared_lock:
+            stats['errors'] += 1
+        raise
+
+    with _prepared_lock:
+        stats['executions'] += 1
+        stats['total_ms'] += (time.perf_counter() - started) * 1000.0
+
+
+def get_prepared_statement_stats():
+    """
+    Prepared statement istatistikleri (monitoring için)
+    executions - prepares = planlaması atlanan (cache hit) çalıştırma sayısı
+    """
+    result = {}
+    with _prepared_lock:
+        snapshot = {name: dict(stats) for name, stats in _prepared_stats.items()}
+    for name, stats in sorted(snapshot.items()):
+        executions = stats['executions']
+        hits = max(executions - stats['prepares'], 0)
+        result[name] = {
+            'prepares': stats['prepares'],
+            'executions': executions,
+            'hits': hits,
+            'hit_rate': round(hits / executions, 3) if executions else 0,
+            'avg_ms': round(stats['total_ms'] / executions, 2) if executions else 0,
+            'errors': stats['errors'],
+            'retries': stats['retries']
         }
+    return {
+        'enabled': Config.DB_PREPARED_STATEMENTS,
+        'statements': result
+    }
+
+
+def _run(conn, cursor, query, params, prepared):
+    """Sorguyu (opsiyonel olarak prepared statement ile) çalıştır ve süresini kaydet"""
+    started = time.perf_counter()
+    try:
+        if prepared:
+            _execute_prepared(conn, cursor, prepared, query, params)
+        else:
+            cursor.execute(query, params)
+    finally:
+        record_query(query, params, time.perf_counter() - started, cursor.rowcount)
 
-def execute_query(query, params=None, fetch=True):
+
+def execute_query(query, params=None, fetch=True, prepared=None):
     """
     SQL sorgusu çalıştır (connection pool kullanarak)
 
@@ -161,68 +629,245 @@ def execute_query(query, params=None, fetch=True):
         query: SQL sorgusu
         params: Parametreler (tuple veya dict)
         fetch: True ise sonuçları getir, False ise sadece commit
+        prepared: Statement adı verilirse sorgu her fiziksel bağlantıda bir kez
+                  PREPARE edilir ve sonraki çağrılarda EXECUTE ile çalışır
+                  (sadece sabit SQL metni olan sıcak sorgular için)
 
     Returns:
         fetch=True ise sonuçlar, False ise None
     """
-    conn = get_db_connection()
-    cursor = None
-
-    try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+    with _connection_scope(readonly=fetch) as (conn, in_transaction):
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            _run(conn, cursor, query, params, prepared)
 
-        if fetch:
-            results = cursor.fetchall()
-            return results
-        else:
-            conn.commit()
-            return None
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        if cursor:
-            cursor.close()
-        release_db_connection(conn)
+            if fetch:
+                results = cursor.fetchall()
+                return results
+            else:
+                if not in_transaction:
+                    conn.commit()
+                return None
+        except Exception as e:
+            if not in_transaction:
+                conn.rollback()
+            raise e
+        finally:
+            if cursor:
+                cursor.close()
 
-def execute_query_one(query, params=None):
-    """Tek satır sonuç döndür (connection pool kullanarak)"""
-    conn = get_db_connection()
-    cursor = None
+def execute_query_one(query, params=None, prepared=None):
+    """Tek satır sonuç döndür (connection pool kullanarak, prepared: bkz. execute_query)"""
+    with _connection_scope(readonly=True) as (conn, in_transaction):
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            _run(conn, cursor, query, params, prepared)
+            result = cursor.fetchone()
+            return result
+        except Exception as e:
+            # Paylaşılan bağlantı aborted transaction'da kalmasın
+            if not in_transaction:
+                conn.rollback()
+            raise e
+        finally:
+            if cursor:
+                cursor.close()
 
-    try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-        return result
-    except Exception as e:
-        raise e
-    finally:
-        if cursor:
-            cursor.close()
-        release_db_connection(conn)
-    
 
 
 def execute_write(sql, params=None):
     """
     INSERT/UPDATE/DELETE + RETURNING için helper (connection pool kullanarak)
-    - Transaction'ı COMMIT eder.
+    - Transaction'ı COMMIT eder (transaction() bloğu içinde değilse).
     - RETURNING varsa satırları döndürür.
     """
-    conn = get_db_connection()
-    cur = None
+    with _connection_scope() as (conn, in_transaction):
+        cur = None
+        try:
+            cur = conn.cursor()
+            _run(conn, cur, sql, params or (), None)
+            rows = cur.fetchall() if cur.description is not None else []
+            if not in_transaction:
+                conn.commit()
+            return rows
+        except Exception as e:
+            if not in_transaction:
+                conn.rollback()
+            raise e
+        finally:
+            if cur:
+                cur.close()
+
+
+def _take_request_connection():
+    """
+    Okuma için request bağlantısını g'den al ve sahipliğini çağırana devret.
+    Teardown artık bu bağlantıyı bırakmaz; çağıran release_db_connection ile bırakır.
+    transaction() bloğu içinde veya app context yoksa None.
+    """
+    if not has_app_context() or getattr(_tx_state, 'conn', None) is not None:
+        return None
+
+    if has_request_context() and _should_use_replica():
+        if get_request_replica_connection() is not None:
+            return g.pop('_db_replica_conn')
+
+    conn = get_request_connection()
+    g.pop('_db_conn', None)
+    return conn
+
+
+def execute_stream(query, params=None, itersize=1000):
+    """
+    Büyük sonuç kümelerini server-side (named) cursor ile satır satır akıt.
+
+    Satırlar sunucudan itersize'lık partiler halinde çekilir, böylece tüm
+    tablo worker belleğine alınmaz. Request içinde request bağlantısı stream'e
+    devredilir (ikinci bir bağlantı tutulmaz); generator tükenince veya kapatılınca
+    (ör. istemci bağlantıyı kestiğinde) bağlantı pool'a geri döner.
+
+    Usage:
+        for row in execute_stream("SELECT ...", params, itersize=500):
+            ...
+    """
+    conn = _take_request_connection()
+    if conn is None:
+        replica_pool = get_replica_pool() if _should_use_replica() else None
+        if replica_pool is not None:
+            conn = PooledConnection(replica_pool.getconn(), replica_pool)
+        else:
+            conn = get_db_connection()
+    cursor = None
+    db_time = 0.0
+    row_count = 0
     try:
-        cur = conn.cursor()
-        cur.execute(sql, params or ())
-        rows = cur.fetchall() if cur.description is not None else []
-        conn.commit()
-        return rows
-    except Exception as e:
-        conn.rollback()
-        raise e
+        cursor = conn.cursor(name=f'stream_{uuid.uuid4().hex}')
+        cursor.itersize = itersize
+        started = time.perf_counter()
+        cursor.execute(query, params)
+        db_time += time.perf_counter() - started
+        while True:
+            started = time.perf_counter()
+            rows = cursor.fetchmany(itersize)
+            db_time += time.perf_counter() - started
+            if not rows:
+                break
+            row_count += len(rows)
+            yield from rows
     finally:
-        if cur:
-            cur.close()
+        # Sadece sunucu tarafı süre sayılır (satırların işlenmesi hariç)
+        record_query(query, params, db_time, row_count)
+        if cursor:
+            try:
+                cursor.close()
+            except Exception as e:
+                logger.debug(f"Ignored error while closing stream cursor: {e}")
+        try:
+            conn.rollback()
+        except Exception as e:
+            logger.debug(f"Ignored error while ending stream transaction: {e}")
         release_db_connection(conn)
+
+
+def _copy_value(value):
+    """COPY (CSV) için tek değeri metne çevir; None -> tırnaksız boş (NULL)"""
+    if value is None:
+        return ''
+    if isinstance(value, Json):
+        value = value.adapted
+    if isinstance(value, bool):
+        text = 'true' if value else 'false'
+    elif isinstance(value, dict):
+        text = json.dumps(value)
+    elif isinstance(value, list):
+        text = _adapt_prepared_param(value)
+    elif hasattr(value, 'isoformat'):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _copy_rows(cursor, table, columns, rows):
+    """Satırları COPY ... FROM STDIN (CSV) ile yaz"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+        sql.Identifier(table),
+        sql.SQL(', ').join(map(sql.Identifier, columns))
+    )
+    cursor.copy_expert(copy_sql.as_string(cursor), buffer)
+
+
+def bulk_insert(table, columns, rows, returning=None, page_size=500):
+    """
+    Çok satırlı INSERT için helper (tek round trip, tek transaction).
+
+    psycopg2.extras.execute_values ile satırlar page_size'lık tek INSERT
+    ifadelerine gömülür. RETURNING istenmiyorsa ve satır sayısı
+    DB_BULK_COPY_THRESHOLD'u aşıyorsa COPY FROM STDIN kullanılır.
+    transaction() bloğu içinde commit etmez.
+
+    Args:
+        table: Tablo adı
+        columns: Kolon adları listesi
+        rows: Tuple listesi (kolon sırasıyla)
+        returning: RETURNING kolonları (ör. ['id']) veya None
+
+    Returns:
+        returning verildiyse eklenen satırlar, yoksa []
+
+    Usage:
+        bulk_insert('job_steps', ['job_id', 'process_id'], [(job_id, p1), (job_id, p2)])
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    if isinstance(returning, str):
+        returning = [returning]
+
+    with _connection_scope() as (conn, in_transaction):
+        cur = None
+        try:
+            cur = conn.cursor()
+            started = time.perf_counter()
+            if not returning and len(rows) >= Config.DB_BULK_COPY_THRESHOLD:
+                _copy_rows(cur, table, columns, rows)
+                record_query(f'COPY {table} FROM STDIN', None, time.perf_counter() - started, len(rows))
+                result = []
+            else:
+                insert_sql = sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+                    sql.Identifier(table),
+                    sql.SQL(', ').join(map(sql.Identifier, columns))
+                )
+                if returning:
+                    insert_sql += sql.SQL(" RETURNING {}").format(
+                        sql.SQL(', ').join(map(sql.Identifier, returning))
+                    )
+                result = execute_values(
+                    cur,
+                    insert_sql.as_string(cur),
+                    rows,
+                    page_size=page_size,
+                    fetch=bool(returning)
+                ) or []
+                record_query(
+                    f'INSERT INTO {table} ({", ".join(columns)}) VALUES ...', None,
+                    time.perf_counter() - started, len(rows)
+                )
+            if not in_transaction:
+                conn.commit()
+            return result
+        except Exception as e:
+            if not in_transaction:
+                conn.rollback()
+            raise e
+        finally:
+            if cur:
+                cur.close()
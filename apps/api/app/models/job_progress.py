@@ -0,0 +1,48 @@
+"""
+İş adımı sayaçları (jobs.total_steps, completed_steps, in_progress_steps, blocked_steps)
+
+Sayaçlar job_steps üzerindeki trigger ile (migration 030) aynı transaction içinde
+güncellenir; uygulama tarafında bakım gerekmez. Liste sorguları job_steps join/GROUP BY
+yerine bu kolonları okur. Kolonları henüz bilmeyen worker adımları sorgu anında sayar.
+"""
+
+from app.models.schema import has_column
+
+STEP_COUNTER_COLUMNS = ('total_steps', 'completed_steps', 'in_progress_steps', 'blocked_steps')
+
+
+def has_step_counters():
+    """jobs tablosunda sayaç kolonları var mı"""
+    return all(has_column('jobs', column) for column in STEP_COUNTER_COLUMNS)
+
+
+def step_counter_source(alias='j'):
+    """
+    Sayaçların okunacağı tablo alias'ı ve gerekiyorsa join SQL'i
+
+    Sayaç kolonları varsa (alias, ''); yoksa iş başına LATERAL sayım ('sc', join).
+    Her iki durumda da GROUP BY gerekmez.
+    """
+    if has_step_counters():
+        return alias, ''
+
+    join = f"""
+        LEFT JOIN LATERAL (
+            SELECT
+                COUNT(*) AS total_steps,
+                COUNT(*) FILTER (WHERE status = 'completed') AS completed_steps,
+                COUNT(*) FILTER (WHERE status = 'in_progress') AS in_progress_steps,
+                COUNT(*) FILTER (WHERE status = 'blocked') AS blocked_steps
+            FROM job_steps
+            WHERE job_id = {alias}.id
+        ) sc ON TRUE
+    """
+    return 'sc', join
+
+
+def step_counter_sql(alias='j'):
+    """Liste sorguları için (kolonlar, join) SQL parçaları"""
+    source, join = step_counter_source(alias)
+    columns = ', '.join(f"{source}.{column}" for column in STEP_COUNTER_COLUMNS)
+    return columns, join
+
@@ -0,0 +1,213 @@
+"""
+Schema capability registry
+
+Opsiyonel kolon/tablo bilgisi ve idempotent DDL (CREATE ... IF NOT EXISTS) adımları
+uygulama açılışında bir kez çözülür. Route'lar information_schema sorgusu veya DDL
+çalıştırmak yerine buradaki bayraklara bakar.
+
+Migration sonrası refresh_schema() 'schema' cache tag'ini artırır; diğer worker'lar
+tag'i en fazla _SCHEMA_CHECK_INTERVAL saniyede bir kontrol edip kataloğu yeniden yükler.
+Tag sadece paylaşımlı (Redis) backend'de tüm worker'lara ulaşır; memory backend'de
+diğer worker'lar yeniden başlatılınca güncellenir.
+"""
+
+import logging
+import threading
+import time
+
+from app.models.database import execute_query, execute_write
+from app.utils.cache import get_cache_backend, invalidate_cache_tags
+
+logger = logging.getLogger(__name__)
+
+# Başarısız DDL adımları en fazla bu aralıkla tekrar denenir (saniye)
+_SETUP_RETRY_INTERVAL = 60
+
+# Katalog değişikliği yayını için cache tag'i ve kontrol aralığı (saniye)
+SCHEMA_CACHE_TAG = 'schema'
+_SCHEMA_CHECK_INTERVAL = 10
+
+# table_name -> set(column_name), sadece current_schema()
+_columns = {}
+# current_schema() içindeki fonksiyon adları
+_functions = set()
+_loaded_at = None
+# Yüklemedeki tag token'ı ve son kontrol zamanı
+_schema_token = None
+_checked_at = 0
+
+# Kayıtlı DDL adımları: ad -> SQL listesi; başarıyla çalışanlar _ensured'da tutulur
+_setup_steps = {}
+_ensured = set()
+_last_attempt = {}
+_schema_lock = threading.Lock()
+
+
+def register_schema_setup(name, statements):
+    """
+    Açılışta bir kez çalışacak idempotent DDL adımı kaydet
+
+    Args:
+        name: Adım adı (ensure_schema ile çağrılır)
+        statements: SQL listesi; her biri ayrı çalıştırılır, hatalısı atlanır
+    """
+    _setup_steps[name] = list(statements)
+
+
+def _run_setup(name):
+    """Adımın SQL'lerini çalıştır; hepsi başarılıysa True"""
+    ok = True
+    for statement in _setup_steps[name]:
+        try:
+            execute_write(statement)
+        except Exception as e:
+            ok = False
+            logger.warning(f"Schema setup '{name}' statement failed: {e}")
+    return ok
+
+
+def ensure_schema(name):
+    """Kayıtlı DDL adımını process başına bir kez çalıştır (sonraki çağrılar no-op)"""
+    if name in _ensured:
+        return
+    with _schema_lock:
+        if name in _ensured:
+            return
+        now = time.time()
+        if now - _last_attempt.get(name, 0) < _SETUP_RETRY_INTERVAL:
+            return
+        _last_attempt[name] = now
+        if _run_setup(name):
+            _ensured.add(name)
+
+
+def _current_schema_token():
+    """Paylaşımlı 'schema' tag token'ı; cache erişilemezse None"""
+    try:
+        return get_cache_backend().get_tag_token(SCHEMA_CACHE_TAG)
+    except Exception as e:
+        logger.warning(f"Schema version lookup failed: {e}")
+        return None
+
+
+def load_schema_capabilities():
+    """Mevcut şemadaki tablo/kolon ve fonksiyon listesini yükle"""
+    global _columns, _functions, _loaded_at, _schema_token, _checked_at
+
+    # Token katalogdan önce okunur: arada yapılan bir yayın sonraki kontrolde yakalanır
+    token = _current_schema_token()
+
+    rows = execute_query("""
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+    """)
+
+    columns = {}
+    for row in rows or []:
+        columns.setdefault(row['table_name'], set()).add(row['column_name'])
+
+    routines = execute_query("""
+        SELECT DISTINCT routine_name
+        FROM information_schema.routines
+        WHERE routine_schema = current_schema()
+    """)
+
+    _columns = columns
+    _functions = {row['routine_name'] for row in routines or []}
+    _loaded_at = time.time()
+    _schema_token = token
+    _checked_at = _loaded_at
+    return len(columns)
+
+
+def _ensure_loaded():
+    if _loaded_at is None:
+        with _schema_lock:
+            if _loaded_at is None:
+                load_schema_capabilities()
+        return
+
+    if time.time() - _checked_at < _SCHEMA_CHECK_INTERVAL:
+        return
+    with _schema_lock:
+        if time.time() - _checked_at < _SCHEMA_CHECK_INTERVAL:
+            return
+        _check_schema_version()
+
+
+def _check_schema_version():
+    """Başka bir worker refresh yayınladıysa kataloğu yeniden yükle (_schema_lock altında)"""
+    global _checked_at
+
+    _checked_at = time.time()
+    token = _current_schema_token()
+    if token is None or token == _schema_token:
+        return
+    try:
+        load_schema_capabilities()
+        logger.info("Schema capabilities reloaded after refresh broadcast")
+    except Exception as e:
+        # Eski bilgiyle devam et; sonraki kontrolde tekrar denenir
+        logger.error(f"Failed to reload schema capabilities: {e}")
+
+
+def has_table(table):
+    """Tablo mevcut şemada var mı (açılışta yüklenen bilgiye göre)"""
+    _ensure_loaded()
+    return table in _columns
+
+
+def has_column(table, column):
+    """Kolon mevcut şemada var mı (açılışta yüklenen bilgiye göre)"""
+    _ensure_loaded()
+    return column in _columns.get(table, ())
+
+
+def has_function(name):
+    """Fonksiyon mevcut şemada var mı (migration ile eklenen SQL fonksiyonları)"""
+    _ensure_loaded()
+    return name in _functions
+
+
+def refresh_schema(rerun_setup=False):
+    """
+    Katalog bilgisini yeniden yükle (migration sonrası)
+    Bu worker hemen yenilenir; 'schema' tag'i artırılarak diğer worker'lara yayınlanır
+    (paylaşımlı backend'de en geç _SCHEMA_CHECK_INTERVAL saniye içinde).
+    """
+    if rerun_setup:
+        with _schema_lock:
+            _ensured.clear()
+            _last_attempt.clear()
+        for name in list(_setup_steps):
+            ensure_schema(name)
+    invalidate_cache_tags(SCHEMA_CACHE_TAG)
+    with _schema_lock:
+        load_schema_capabilities()
+    return get_schema_info()
+
+
+def get_schema_info():
+    """Registry durumu"""
+    return {
+        'loaded_at': _loaded_at,
+        'tables': len(_columns),
+        'functions': len(_functions),
+        'broadcast': get_cache_backend().shared,
+        'setup_steps': sorted(_setup_steps),
+        'ensured': sorted(_ensured)
+    }
+
+
+def init_app(app):
+    """Açılışta DDL adımlarını çalıştır ve katalog bilgisini yükle"""
+    try:
+        with app.app_context():
+            for name in list(_setup_steps):
+                ensure_schema(name)
+            table_count = load_schema_capabilities()
+        logger.info(f"✅ Schema capabilities loaded ({table_count} tables)")
+    except Exception as e:
+        # DB hazır değilse ilk kullanımda tekrar denenir
+        logger.error(f"❌ Failed to load schema capabilities: {e}")
@@ -1,10 +1,43 @@
 from flask import Blueprint, request, jsonify
-from passlib.hash import bcrypt
 from app.models.database import execute_query_one, execute_query
 from app.utils.jwt_helper import generate_token
+from app.middleware.auth_middleware import build_permission_claims
+from app.models.schema import has_column
+from app.utils.passwords import BUSY_RETRY_AFTER, PasswordVerifierBusy, is_bcrypt_hash, verify_password
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+
+def _login_query():
+    """
+    Kullanıcı, şifre hash'i ve birincil rolü tek sorguda döndüren SQL
+
+    Returns:
+        (sql, prepared statement adı); SQL users.role kolonuna göre değiştiği için
+        her varyantın adı ayrıdır (schema yenilenince aynı ada farklı SQL gitmez)
+    """
+    if has_column('users', 'role'):
+        legacy_role, statement_name = 'u.role', 'auth_login_role'
+    else:
+        legacy_role, statement_name = 'NULL', 'auth_login_norole'
+    query = f"""
+        SELECT
+            u.id, u.username, u.email, u.full_name,
+            u.password_hash,
+            COALESCE(pr.role_code, {legacy_role}) AS role_code
+        FROM users u
+        LEFT JOIN LATERAL (
+            SELECT r.code AS role_code
+            FROM user_roles ur
+            JOIN roles r ON r.id = ur.role_id
+            WHERE ur.user_id = u.id
+            ORDER BY ur.is_primary DESC, r.name
+            LIMIT 1
+        ) pr ON TRUE
+        WHERE u.username = %s AND u.is_active = true
+    """
+    return query, statement_name
+
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """Kullanıcı girişi"""
@@ -17,62 +50,38 @@ def login():
         username = data.get('username')
         password = data.get('password')
         
-        # Kullanıcıyı bul
-        user_query = """
-            SELECT id, username, email, password_hash, full_name, is_active
-            FROM users
-            WHERE username = %s AND is_active = true
-        """
-        user = execute_query_one(user_query, (username,))
+        # Kullanıcı, şifre hash'i ve birincil rol tek sorguda
+        # Rol: user_roles (multi-role), yoksa legacy users.role kolonu
+        login_query, statement_name = _login_query()
+        user = execute_query_one(login_query, (username,), prepared=statement_name)
         
         if not user:
             return jsonify({'error': 'Kullanıcı bulunamadı'}), 401
         
-        # Şifre kontrolü (PostgreSQL'deki crypt fonksiyonu ile)
-        password_check_query = """
-            SELECT (password_hash = crypt(%s, password_hash)) as password_match
-            FROM users
-            WHERE username = %s
-        """
-        password_match = execute_query_one(password_check_query, (password, username))
+        # Şifre kontrolü API tarafında (bcrypt thread pool); bcrypt olmayan eski hash'ler DB'de
+        try:
+            if is_bcrypt_hash(user['password_hash']):
+                password_ok = verify_password(password, user['password_hash'])
+            else:
+                legacy_check = execute_query_one(
+                    "SELECT (%s::text = crypt(%s, %s::text)) AS password_match",
+                    (user['password_hash'], password, user['password_hash'])
+                )
+                password_ok = bool(legacy_check and legacy_check['password_match'])
+        except PasswordVerifierBusy:
+            return jsonify({'error': 'Sunucu yoğun, lütfen tekrar deneyin'}), 503, {'Retry-After': str(BUSY_RETRY_AFTER)}
         
-        if not password_match or not password_match['password_match']:
+        if not password_ok:
             return jsonify({'error': 'Şifre hatalı'}), 401
-        
-        # Kullanıcının birincil rolünü getir (yeni multi-role yapısı)
-        primary_role_query = """
-            SELECT r.code AS role_code, r.name AS role_name
-            FROM user_roles ur
-            JOIN roles r ON r.id = ur.role_id
-            WHERE ur.user_id = %s
-            ORDER BY ur.is_primary DESC, r.name
-            LIMIT 1
-        """
-        primary_role = execute_query_one(primary_role_query, (user['id'],))
-        user_role_code = primary_role['role_code'] if primary_role else None
 
-        # Legacy destek: eğer primary role yoksa, users tablosundaki role kolonunu kullan (hala mevcutsa)
-        if not user_role_code:
-            role_column_exists_query = """
-                SELECT EXISTS (
-                    SELECT 1
-                    FROM information_schema.columns
-                    WHERE table_name = 'users'
-                    AND column_name = 'role'
-                ) AS role_exists
-            """
-            role_column_exists = execute_query_one(role_column_exists_query)
+        user_role_code = user['role_code']
 
-            if role_column_exists and role_column_exists.get('role_exists'):
-                legacy_role = execute_query_one(
-                    "SELECT role FROM users WHERE id = %s",
-                    (user['id'],)
-                )
-                if legacy_role:
-                    user_role_code = legacy_role.get('role')
-
-        # JWT token oluştur
-        token = generate_token(user['id'], user['username'], user_role_code)
+        # JWT token oluştur (opsiyonel yetki claim'i ile)
+        permissions, permissions_version = build_permission_claims(user['id'])
+        token = generate_token(
+            user['id'], user['username'], user_role_code,
+            permissions=permissions, permissions_version=permissions_version
+        )
         
         return jsonify({
             'message': 'Giriş başarılı',
@@ -100,8 +109,10 @@ def get_current_user():
         try:
             user_id = request.current_user['user_id']
             
-            user_query = """
-                SELECT id, username, email, full_name, is_active, created_at
+            legacy_role = 'role' if has_column('users', 'role') else 'NULL'
+            user_query = f"""
+                SELECT id, username, email, full_name, is_active, created_at,
+                       {legacy_role} AS legacy_role
                 FROM users
                 WHERE id = %s
             """
@@ -138,30 +149,14 @@ def get_current_user():
             user_role_code = primary_role['code'] if primary_role else None
 
             # Legacy destek: eğer primary role yoksa, users tablosundaki role kolonunu kullan (hala mevcutsa)
-            if not user_role_code:
-                role_column_exists_query = """
-                    SELECT EXISTS (
-                        SELECT 1
-                        FROM information_schema.columns
-                        WHERE table_name = 'users'
-                        AND column_name = 'role'
-                    ) AS role_exists
-                """
-                role_column_exists = execute_query_one(role_column_exists_query)
-
-                if role_column_exists and role_column_exists.get('role_exists'):
-                    legacy_role = execute_query_one(
-                        "SELECT role FROM users WHERE id = %s",
-                        (user_id,)
-                    )
-                    if legacy_role:
-                        user_role_code = legacy_role.get('role')
-                        primary_role = {
-                            'id': None,
-                            'code': user_role_code,
-                            'name': None,
-                            'is_primary': True
-                        }
+            if not user_role_code and user['legacy_role']:
+                user_role_code = user['legacy_role']
+                primary_role = {
+                    'id': None,
+                    'code': user_role_code,
+                    'name': None,
+                    'is_primary': True
+                }
             
             return jsonify({
                 'user': {
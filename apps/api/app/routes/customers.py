@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from app.models.database import execute_query, execute_write, execute_query_one
 from app.middleware.auth_middleware import token_required, permission_required
+from app.utils.cache import invalidates_cache
+from app.utils.search import search_condition, search_rank
 from app.services.storage_paths import get_minio, ensure_bucket, make_folder, customer_prefix
 import os
 import logging
@@ -14,14 +16,31 @@ customers_bp = Blueprint('customers', __name__, url_prefix='/api/customers')
 def get_customers():
     """Tüm müşterileri listele (yalnızca aktif)"""
     try:
+        search = request.args.get('search', '').strip()
+
         query = """
             SELECT id, name, code, contact_person, phone, phone_secondary, gsm, email, address,
                    city, tax_office, tax_number, notes, short_code, postal_code, is_active
             FROM customers
             WHERE is_active = TRUE
-            ORDER BY name
         """
-        rows = execute_query(query)
+        params = []
+
+        # Arama: müşteri adı/kodu (trigram indeksli), alaka sırasına göre
+        rank_sql, rank_params = (None, [])
+        if search:
+            search_sql, search_params = search_condition('customers', search)
+            query += f" AND {search_sql}"
+            params.extend(search_params)
+            rank_sql, rank_params = search_rank('customers', search)
+
+        if rank_sql:
+            query += f" ORDER BY {rank_sql} DESC, name"
+            params.extend(rank_params)
+        else:
+            query += " ORDER BY name"
+
+        rows = execute_query(query, tuple(params) if params else None)
         data = [{
             'id': str(r['id']),
             'name': r['name'],
@@ -118,6 +137,7 @@ def get_customer_detail(customer_id):
 @customers_bp.route('/<uuid:customer_id>', methods=['PATCH'])
 @token_required
 @permission_required('customers', 'update')
+@invalidates_cache('customers')
 def update_customer(customer_id):
     """Müşteri güncelle (yalnızca gönderilen alanlar)"""
     try:
@@ -169,6 +189,7 @@ def update_customer(customer_id):
 @customers_bp.route('/<uuid:customer_id>', methods=['DELETE'])
 @token_required
 @permission_required('customers', 'delete')
+@invalidates_cache('customers')
 def delete_customer(customer_id):
     """Soft delete: is_active = false"""
     try:
@@ -214,6 +235,7 @@ def _dealer_payload(data):
 @customers_bp.route('', methods=['POST'])
 @token_required
 @permission_required('customers', 'create')
+@invalidates_cache('customers')
 def create_customer():
     try:
         data = request.get_json(force=True) or {}
@@ -1,13 +1,30 @@
 from flask import Blueprint, request, jsonify
-from app.models.database import execute_query, execute_query_one
+from app.models.database import execute_query, execute_query_one, execute_stream, read_replica
 from app.middleware.auth_middleware import token_required, role_required
+from app.models.job_progress import step_counter_sql
 from app.utils.cache import cache_route_with_user
+from app.utils.fields import Field, FieldSelectionError, Projection, column, iso, requested_fields
+from app.utils.streaming import stream_json_list
 
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
 
+# Uzun TTL'ler (shared_ttl) sadece CACHE_BACKEND=redis ile kullanılır: memory backend'de
+# invalidation yalnızca yazmayı yapan worker'a ulaşır, diğerleri TTL dolana kadar eski veri döner
+
+
+def _operator_user(current_user):
+    """Operatör kendi görevlerini görür; diğer roller aynı istatistiği paylaşır"""
+    if current_user.get('role') == 'operator':
+        return current_user.get('user_id')
+    return 'shared'
+
+
 @dashboard_bp.route('/stats', methods=['GET'])
 @token_required
-@cache_route_with_user(ttl=30)  # Cache for 30 seconds
+@read_replica
+@cache_route_with_user(ttl=30, stale_ttl=10, shared_ttl=300, shared_stale_ttl=60,
+                       tags=('jobs', 'job_steps', 'machines', 'users'),
+                       vary=(_operator_user,))  # 30 sn; Redis ile 5 dk, yazmalarda invalidate
 def get_dashboard_stats():
     """Dashboard istatistiklerini getir - OPTIMIZED: Single query + caching"""
     try:
@@ -180,25 +197,28 @@ def get_dashboard_stats():
 
 @dashboard_bp.route('/recent-jobs', methods=['GET'])
 @token_required
-@cache_route_with_user(ttl=60)  # Cache for 60 seconds
+@read_replica
+@cache_route_with_user(ttl=60, stale_ttl=20, shared_ttl=300, shared_stale_ttl=60,
+                       tags=('jobs', 'job_steps', 'customers', 'users'),
+                       vary=(), args=('limit',))  # 1 dk; Redis ile 5 dk, yazmalarda invalidate
 def get_recent_jobs():
     """Son işleri getir - WITH CACHING"""
     try:
         limit = request.args.get('limit', 10, type=int)
         
-        query = """
+        # Adım sayaçları jobs üzerinde tutulur; job_steps join/GROUP BY yok
+        step_columns, step_join = step_counter_sql('j')
+        query = f"""
             SELECT 
                 j.id, j.job_number, j.title, j.status, j.priority, 
                 j.due_date, j.created_at, j.revision_no,
                 c.name as customer_name,
                 u.full_name as created_by_name,
-                COUNT(js.id) as total_steps,
-                COUNT(js.id) FILTER (WHERE js.status = 'completed') as completed_steps
+                {step_columns}
             FROM jobs j
             LEFT JOIN customers c ON j.customer_id = c.id
             LEFT JOIN users u ON j.created_by = u.id
-            LEFT JOIN job_steps js ON j.id = js.job_id
-            GROUP BY j.id, c.name, u.full_name
+            {step_join}
             ORDER BY j.created_at DESC
             LIMIT %s
         """
@@ -230,85 +250,95 @@ def get_recent_jobs():
         return jsonify({'error': f'Bir hata oluştu: {str(e)}'}), 500
 
 
+def _ref(id_key, name_key):
+    return lambda row: {
+        'id': str(row[id_key]),
+        'name': row[name_key],
+    } if row[id_key] else None
+
+
+# GET /api/dashboard/tasks alanları (?fields=)
+_TASK_FIELDS = Projection(
+    {
+        'id': Field(lambda row: str(row['id']), ('js.id',)),
+        'status': Field(column('status'), ('js.status',)),
+        'order_index': Field(column('order_index'), ('js.order_index',)),
+        'started_at': Field(iso('started_at'), ('js.started_at',)),
+        'completed_at': Field(iso('completed_at'), ('js.completed_at',)),
+        'estimated_duration': Field(column('estimated_duration'), ('js.estimated_duration',)),
+        'actual_duration': Field(column('actual_duration'), ('js.actual_duration',)),
+        'production_quantity': Field(
+            lambda row: float(row['production_quantity']) if row['production_quantity'] is not None else None,
+            ('js.production_quantity',)
+        ),
+        'production_unit': Field(column('production_unit'), ('js.production_unit',)),
+        'created_at': Field(iso('step_created_at'), ('js.created_at as step_created_at',)),
+        'job': Field(
+            lambda row: {
+                'id': str(row['job_id']),
+                'job_number': row['job_number'],
+                'title': row['job_title'],
+                'description': row['job_description'],
+                'created_at': row['job_created_at'].isoformat() if row['job_created_at'] else None,
+                'customer_name': row['customer_name'],
+            },
+            (
+                'j.id AS job_id', 'j.job_number', 'j.title AS job_title', 'j.description AS job_description',
+                'j.created_at AS job_created_at', 'c.name AS customer_name'
+            ),
+            ('job', 'customer')
+        ),
+        'process': Field(
+            lambda row: {
+                'id': str(row['process_id']),
+                'name': row['process_name'],
+                'code': row['process_code'],
+            },
+            ('p.id AS process_id', 'p.name AS process_name', 'p.code AS process_code'),
+            ('process',)
+        ),
+        'assigned_to': Field(
+            _ref('assigned_id', 'assigned_name'),
+            ('u.id AS assigned_id', 'u.full_name AS assigned_name'), ('assignee',)
+        ),
+        'machine': Field(
+            _ref('machine_id', 'machine_name'),
+            ('m.id AS machine_id', 'm.name AS machine_name'), ('machine',)
+        ),
+    },
+    joins={
+        'job': 'JOIN jobs j ON js.job_id = j.id',
+        'customer': 'LEFT JOIN customers c ON j.customer_id = c.id',
+        'process': 'JOIN processes p ON js.process_id = p.id',
+        'assignee': 'LEFT JOIN users u ON js.assigned_to = u.id',
+        'machine': 'LEFT JOIN machines m ON js.machine_id = m.id',
+    },
+)
+
+
 @dashboard_bp.route('/tasks', methods=['GET'])
 @token_required
 @role_required(['yonetici'])
+@read_replica
 def get_all_tasks():
     """Tüm iş adımlarını yönetici için listele"""
     try:
-        query = """
+        try:
+            fields = requested_fields(_TASK_FIELDS)
+        except FieldSelectionError as e:
+            return jsonify({'error': f"Geçersiz alan: {', '.join(e.unknown)}"}), 400
+
+        # Sadece seçilen alanların kolonları ve join'leri
+        query = f"""
             SELECT
-                js.id,
-                js.status,
-                js.order_index,
-                js.started_at,
-                js.completed_at,
-                js.estimated_duration,
-                js.actual_duration,
-                js.production_quantity,
-                js.production_unit,
-                js.created_at as step_created_at,
-                j.id AS job_id,
-                j.job_number,
-                j.title AS job_title,
-                j.description AS job_description,
-                j.created_at AS job_created_at,
-                c.name AS customer_name,
-                p.id AS process_id,
-                p.name AS process_name,
-                p.code AS process_code,
-                u.id AS assigned_id,
-                u.full_name AS assigned_name,
-                m.id AS machine_id,
-                m.name AS machine_name
+                {_TASK_FIELDS.select_sql(fields)}
             FROM job_steps js
-            JOIN jobs j ON js.job_id = j.id
-            LEFT JOIN customers c ON j.customer_id = c.id
-            JOIN processes p ON js.process_id = p.id
-            LEFT JOIN users u ON js.assigned_to = u.id
-            LEFT JOIN machines m ON js.machine_id = m.id
+            {_TASK_FIELDS.join_sql(fields)}
             ORDER BY js.created_at DESC
         """
 
-        rows = execute_query(query)
-
-        tasks = []
-        for row in rows:
-            tasks.append({
-                'id': str(row['id']),
-                'status': row['status'],
-                'order_index': row['order_index'],
-                'started_at': row['started_at'].isoformat() if row['started_at'] else None,
-                'completed_at': row['completed_at'].isoformat() if row['completed_at'] else None,
-                'estimated_duration': row['estimated_duration'],
-                'actual_duration': row['actual_duration'],
-                'production_quantity': float(row['production_quantity']) if row['production_quantity'] is not None else None,
-                'production_unit': row['production_unit'],
-                'created_at': row['step_created_at'].isoformat() if row['step_created_at'] else None,
-                'job': {
-                    'id': str(row['job_id']),
-                    'job_number': row['job_number'],
-                    'title': row['job_title'],
-                    'description': row['job_description'],
-                    'created_at': row['job_created_at'].isoformat() if row['job_created_at'] else None,
-                    'customer_name': row['customer_name'],
-                },
-                'process': {
-                    'id': str(row['process_id']),
-                    'name': row['process_name'],
-                    'code': row['process_code'],
-                },
-                'assigned_to': {
-                    'id': str(row['assigned_id']),
-                    'name': row['assigned_name'],
-                } if row['assigned_id'] else None,
-                'machine': {
-                    'id': str(row['machine_id']),
-                    'name': row['machine_name'],
-                } if row['machine_id'] else None,
-            })
-
-        return jsonify({'data': tasks}), 200
+        rows = execute_stream(query, itersize=1000)
+        return stream_json_list(rows, _TASK_FIELDS.serializer(fields))
 
     except Exception as e:
         return jsonify({'error': f'Bir hata oluştu: {str(e)}'}), 500
@@ -355,7 +385,9 @@ def get_recent_activity():
 
 @dashboard_bp.route('/chart/jobs-by-status', methods=['GET'])
 @token_required
-@cache_route_with_user(ttl=120)  # Cache for 2 minutes
+@read_replica
+@cache_route_with_user(ttl=120, stale_ttl=30, shared_ttl=600, shared_stale_ttl=120,
+                       tags=('jobs',), vary=(), args=())  # 2 dk; Redis ile 10 dk, yazmalarda invalidate
 def get_jobs_by_status_chart():
     """Durum bazlı iş grafiği için veri - WITH CACHING"""
     try:
@@ -385,7 +417,9 @@ def get_jobs_by_status_chart():
 
 @dashboard_bp.route('/chart/jobs-by-month', methods=['GET'])
 @token_required
-@cache_route_with_user(ttl=300)  # Cache for 5 minutes
+@read_replica
+@cache_route_with_user(ttl=300, stale_ttl=60, shared_ttl=1800, shared_stale_ttl=300,
+                       tags=('jobs',), vary=(), args=())  # 5 dk; Redis ile 30 dk, yazmalarda invalidate
 def get_jobs_by_month_chart():
     """Aylık iş grafiği için veri - WITH CACHING"""
     try:
@@ -7,9 +7,11 @@ from werkzeug.utils import secure_filename
 
 from app.config import Config
 from app.middleware.auth_middleware import token_required, role_required, permission_required
-from app.models.database import execute_query, execute_query_one, execute_write
+from app.models.database import execute_query, execute_query_one, execute_write, execute_stream
 from app.routes.notifications import create_notification
+from app.routes.roles import ensure_role_process_table
 from app.services.s3_client import get_s3
+from app.utils.streaming import stream_json_list
 from app.services.storage_paths import (
     ensure_bucket,
     job_files_prefix,
@@ -20,19 +22,6 @@ from app.services.storage_paths import (
 files_bp = Blueprint("files", __name__, url_prefix="/api/files")
 
 
-def _ensure_role_process_table():
-    execute_write(
-        """
-        CREATE TABLE IF NOT EXISTS role_process_permissions (
-            role_id UUID NOT NULL REFERENCES roles(id) ON DELETE CASCADE,
-            process_id UUID NOT NULL REFERENCES processes(id) ON DELETE CASCADE,
-            can_view BOOLEAN DEFAULT TRUE,
-            PRIMARY KEY (role_id, process_id)
-        )
-        """
-    )
-
-
 def _pick(data, *keys):
     for key in keys:
         if key in data and data[key] not in (None, ""):
@@ -596,7 +585,7 @@ def _allowed_process_ids():
     if not role_code or role_code == "yonetici":
         return None
 
-    _ensure_role_process_table()
+    ensure_role_process_table()
 
     role_row = execute_query_one(
         "SELECT id FROM roles WHERE code = %s",
@@ -612,6 +601,44 @@ def _allowed_process_ids():
     return {str(row['process_id']) for row in (rows or [])}
 
 
+def _serialize_explorer_file(row, allowed_process_ids):
+    """Explorer dosya satırını JSON'a çevir; yetkisiz süreç dosyaları için None"""
+    if allowed_process_ids is not None:
+        process_id_val = row['step_id']
+        if process_id_val is None or str(process_id_val) not in allowed_process_ids:
+            return None
+
+    return {
+        'id': str(row['id']),
+        'filename': row['filename'],
+        'object_key': row['object_key'],
+        'folder_path': row['folder_path'],
+        'file_size': row['file_size'],
+        'content_type': row['content_type'],
+        'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+        'ref_type': row['ref_type'],
+        'ref_id': str(row['ref_id']) if row['ref_id'] else None,
+        'uploaded_by': {
+            'id': str(row['uploaded_by']) if row['uploaded_by'] else None,
+            'name': row['uploaded_by_name'],
+        } if row['uploaded_by'] else None,
+        'customer': {
+            'id': str(row['customer_id']) if row['customer_id'] else None,
+            'name': row['customer_name'],
+        } if row['customer_id'] else None,
+        'job': {
+            'id': str(row['job_id']) if row['job_id'] else None,
+            'job_number': row['job_number'],
+            'title': row['job_title'],
+        } if row['job_id'] else None,
+        'process': {
+            'id': str(row['step_id']) if row['step_id'] else None,
+            'code': row['process_code'],
+            'name': row['process_name'],
+        } if row['step_id'] else None,
+    }
+
+
 @files_bp.route("/explorer", methods=["GET"])
 @token_required
 @permission_required('files', 'view')
@@ -650,48 +677,10 @@ def explorer():
             ORDER BY c.name NULLS LAST, j_base.job_number NULLS LAST, f.created_at DESC
         """
 
-        rows = execute_query(query)
-
         allowed_process_ids = _allowed_process_ids()
 
-        data = []
-        for row in rows:
-            if allowed_process_ids is not None:
-                process_id_val = row['step_id']
-                if process_id_val is None or str(process_id_val) not in allowed_process_ids:
-                    continue
-
-            data.append({
-                'id': str(row['id']),
-                'filename': row['filename'],
-                'object_key': row['object_key'],
-                'folder_path': row['folder_path'],
-                'file_size': row['file_size'],
-                'content_type': row['content_type'],
-                'created_at': row['created_at'].isoformat() if row['created_at'] else None,
-                'ref_type': row['ref_type'],
-                'ref_id': str(row['ref_id']) if row['ref_id'] else None,
-                'uploaded_by': {
-                    'id': str(row['uploaded_by']) if row['uploaded_by'] else None,
-                    'name': row['uploaded_by_name'],
-                } if row['uploaded_by'] else None,
-                'customer': {
-                    'id': str(row['customer_id']) if row['customer_id'] else None,
-                    'name': row['customer_name'],
-                } if row['customer_id'] else None,
-                'job': {
-                    'id': str(row['job_id']) if row['job_id'] else None,
-                    'job_number': row['job_number'],
-                    'title': row['job_title'],
-                } if row['job_id'] else None,
-                'process': {
-                    'id': str(row['step_id']) if row['step_id'] else None,
-                    'code': row['process_code'],
-                    'name': row['process_name'],
-                } if row['step_id'] else None,
-            })
-
-        return jsonify({'data': data}), 200
+        rows = execute_stream(query, itersize=1000)
+        return stream_json_list(rows, lambda row: _serialize_explorer_file(row, allowed_process_ids))
 
     except Exception as e:
         print(f"Error getting explorer data: {str(e)}")
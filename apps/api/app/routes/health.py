@@ -1,7 +1,11 @@
 from flask import Blueprint, jsonify, request
-from app.models.database import get_pool_stats
-from app.middleware.auth_middleware import token_required
+from app.models.database import get_pool_stats, get_replica_pool_stats, get_prepared_statement_stats
+from app.middleware.auth_middleware import token_required, role_required
+from app.models.schema import get_schema_info, refresh_schema
 from app.utils.cache import get_cache_info, clear_cache, clear_cache_by_prefix
+from app.utils.query_stats import get_query_stats, reset_query_stats
+from app.utils.jwt_helper import get_token_cache_info
+from app.utils.passwords import get_password_stats
 import psycopg2
 
 health_bp = Blueprint('health', __name__, url_prefix='/api/health')
@@ -26,26 +30,40 @@ def db_health():
         warnings = []
 
         # Kullanımda olan bağlantılar max'a yakınsa uyar
-        if stats['in_use'] != 'unknown' and stats['max_connections'] != 'unknown':
-            usage_percent = (stats['in_use'] / stats['max_connections']) * 100
-            if usage_percent > 80:
-                health_status = 'warning'
-                warnings.append(f'Pool kullanımı %{usage_percent:.0f} (çok yüksek)')
-            elif usage_percent > 60:
-                warnings.append(f'Pool kullanımı %{usage_percent:.0f}')
-
-        # Kullanılabilir bağlantı yoksa uyar
-        if stats['available'] == 0:
+        usage_percent = (stats['in_use'] / stats['max_connections']) * 100
+        if usage_percent > 80:
+            health_status = 'warning'
+            warnings.append(f'Pool kullanımı %{usage_percent:.0f} (çok yüksek)')
+        elif usage_percent > 60:
+            warnings.append(f'Pool kullanımı %{usage_percent:.0f}')
+
+        # Yeni bağlantı açılamıyor ve boşta bağlantı yoksa uyar
+        if stats['available'] == 0 and stats['total'] >= stats['max_connections']:
             health_status = 'warning'
             warnings.append('Kullanılabilir bağlantı yok')
 
+        # Sırada bekleyen istek varsa uyar
+        if stats['waiting'] > 0:
+            health_status = 'warning'
+            warnings.append(f"{stats['waiting']} istek bağlantı bekliyor")
+
+        # Acquire timeout yaşandıysa uyar
+        if stats['timeouts'] > 0:
+            health_status = 'warning'
+            warnings.append(f"{stats['timeouts']} istek bağlantı beklerken zaman aşımına uğradı")
+
         return jsonify({
             'status': health_status,
             'pool_stats': stats,
+            'replica_pool_stats': get_replica_pool_stats(),
+            'prepared_statements': get_prepared_statement_stats(),
             'warnings': warnings,
             'recommendations': {
                 'optimal_range': '60-80% kullanım',
-                'current_config': f"min={stats['min_connections']}, max={stats['max_connections']}"
+                'current_config': (
+                    f"min={stats['min_connections']}, max={stats['max_connections']}, "
+                    f"acquire_timeout={stats['acquire_timeout_seconds']}s"
+                )
             }
         }), 200
 
@@ -76,6 +94,96 @@ def db_connection_test():
             'message': f'Database bağlantısı başarısız: {str(e)}'
         }), 500
 
+@health_bp.route('/queries', methods=['GET'])
+@token_required
+def query_stats():
+    """Top-N queries by total DB time + recent slow queries - auth required"""
+    try:
+        limit = request.args.get('limit', 20, type=int)
+        order_by = request.args.get('order_by', 'total_ms')
+
+        return jsonify({
+            'status': 'ok',
+            'query_stats': get_query_stats(limit, order_by)
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@health_bp.route('/queries/reset', methods=['POST'])
+@token_required
+def reset_query_stats_endpoint():
+    """Reset aggregated query stats - auth required"""
+    try:
+        cleared = reset_query_stats()
+
+        return jsonify({
+            'status': 'ok',
+            'message': f'Cleared {cleared} query fingerprints',
+            'cleared_count': cleared
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@health_bp.route('/schema', methods=['GET'])
+@token_required
+def schema_info():
+    """Schema capability registry state - auth required"""
+    try:
+        return jsonify({
+            'status': 'ok',
+            'schema': get_schema_info()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@health_bp.route('/schema/refresh', methods=['POST'])
+@token_required
+@role_required(['yonetici'])
+def schema_refresh():
+    """Reload schema capabilities after a migration (all workers on a shared cache backend) - admin only"""
+    try:
+        rerun_setup = bool(request.json.get('rerun_setup')) if request.is_json and request.json else False
+
+        return jsonify({
+            'status': 'ok',
+            'schema': refresh_schema(rerun_setup)
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@health_bp.route('/auth', methods=['GET'])
+@token_required
+def auth_stats():
+    """Password verification pool and token cache stats - auth required"""
+    try:
+        return jsonify({
+            'status': 'ok',
+            'password_verification': get_password_stats(),
+            'token_cache_stats': get_token_cache_info()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @health_bp.route('/cache', methods=['GET'])
 @token_required
 def cache_stats():
@@ -86,7 +194,8 @@ def cache_stats():
 
         return jsonify({
             'status': 'ok',
-            'cache_stats': stats
+            'cache_stats': stats,
+            'token_cache_stats': get_token_cache_info()
         }), 200
 
     except Exception as e:
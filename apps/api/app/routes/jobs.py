@@ -1,6 +1,13 @@
 from flask import Blueprint, request, jsonify
-from app.models.database import execute_query, execute_query_one, get_db_connection, release_db_connection
+from app.models.database import (
+    execute_query, execute_query_one, execute_write, get_db_connection, release_db_connection,
+    transaction, bulk_insert, read_replica
+)
 from app.middleware.auth_middleware import token_required, role_required, permission_required
+from app.utils.cache import invalidates_cache
+from app.models.job_progress import step_counter_source
+from app.utils.fields import Field, FieldSelectionError, Projection, column, iso, requested_fields, text_id
+from app.utils.search import search_rank, search_subquery
 from datetime import datetime
 import uuid
 from app.routes.notifications import create_notification
@@ -8,6 +15,148 @@ import json as import_json
 
 jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
 
+
+_TOTAL_MODES = ('exact', 'estimate', 'none')
+
+
+def _job_progress(row):
+    return round((row['completed_steps'] / row['total_steps'] * 100) if row['total_steps'] > 0 else 0)
+
+
+def _user_ref(id_key, name_key):
+    return lambda row: {
+        'id': str(row[id_key]),
+        'name': row.get(name_key)
+    } if row.get(id_key) else None
+
+
+# GET /api/jobs alanları; {counters} sayaç kolonlarının alias'ı (jobs veya LATERAL sayım)
+_JOB_FIELDS = Projection(
+    {
+        'id': Field(text_id('id'), ('j.id',)),
+        'job_number': Field(column('job_number'), ('j.job_number',)),
+        'title': Field(column('title'), ('j.title',)),
+        'description': Field(column('description'), ('j.description',)),
+        'status': Field(column('status'), ('j.status',)),
+        'priority': Field(column('priority'), ('j.priority',)),
+        'due_date': Field(iso('due_date'), ('j.due_date',)),
+        'delivery_date': Field(iso('due_date'), ('j.due_date',)),  # Alias for due_date
+        'created_at': Field(iso('created_at'), ('j.created_at',)),
+        'revision_no': Field(column('revision_no'), ('j.revision_no',)),
+        'customer_id': Field(text_id('customer_id'), ('j.customer_id',)),
+        'customer_name': Field(column('customer_name'), ('c.name AS customer_name',), ('customer',)),
+        'dealer_id': Field(text_id('dealer_id'), ('j.dealer_id',)),
+        'dealer_name': Field(column('dealer_name'), ('d.name AS dealer_name',), ('dealer',)),
+        'created_by_name': Field(column('created_by_name'), ('u.full_name AS created_by_name',), ('creator',)),
+        'total_steps': Field(column('total_steps'), ('{counters}.total_steps',), ('counters',)),
+        'completed_steps': Field(column('completed_steps'), ('{counters}.completed_steps',), ('counters',)),
+        'in_progress_steps': Field(column('in_progress_steps'), ('{counters}.in_progress_steps',), ('counters',)),
+        'blocked_steps': Field(column('blocked_steps'), ('{counters}.blocked_steps',), ('counters',)),
+        'progress': Field(
+            _job_progress, ('{counters}.total_steps', '{counters}.completed_steps'), ('counters',)
+        ),
+        'steps': Field(column('steps', [])),
+    },
+    joins={
+        'customer': 'LEFT JOIN customers c ON j.customer_id = c.id',
+        'dealer': 'LEFT JOIN customer_dealers d ON j.dealer_id = d.id',
+        'creator': 'LEFT JOIN users u ON j.created_by = u.id',
+        'counters': '{counter_join}',
+    },
+    # Cursor ve adım eşleştirmesi için her zaman
+    required_columns=('j.id', 'j.created_at'),
+)
+
+# GET /api/jobs adım alanları (?fields[steps]=)
+_JOB_STEP_FIELDS = Projection(
+    {
+        'id': Field(text_id('id'), ('js.id',)),
+        'process_id': Field(text_id('process_id'), ('js.process_id',)),
+        'status': Field(column('status'), ('js.status',)),
+        'order_index': Field(column('order_index', 0), ('COALESCE(js.order_index, 0) as order_index',)),
+        'due_date': Field(iso('due_date'), ('js.due_date',)),
+        'planned_start_date': Field(iso('planned_start_date'), ('js.planned_start_date',)),
+        'planned_end_date': Field(iso('planned_end_date'), ('js.planned_end_date',)),
+        'due_time': Field(iso('due_time'), ('js.due_time',)),
+        'process_name': Field(column('process_name'), ('p.name as process_name',), ('process',)),
+        'process_code': Field(column('process_code'), ('p.code as process_code',), ('process',)),
+        'process_description': Field(
+            column('process_description'), ('p.description as process_description',), ('process',)
+        ),
+        'process_group_id': Field(text_id('process_group_id'), ('p.group_id as process_group_id',), ('process',)),
+        'process_group_color': Field(
+            column('process_group_color'), ('pg.color as process_group_color',), ('process', 'process_group')
+        ),
+        'process_group_name': Field(
+            column('process_group_name'), ('pg.name as process_group_name',), ('process', 'process_group')
+        ),
+        'assigned_to': Field(
+            _user_ref('assigned_to', 'assigned_to_name'),
+            ('js.assigned_to', 'u.full_name as assigned_to_name'), ('assignee',)
+        ),
+        'completed_at': Field(iso('completed_at'), ('js.completed_at',)),
+        'started_by': Field(
+            _user_ref('started_by', 'started_by_name'),
+            ('js.started_by', 'starter.full_name as started_by_name'), ('starter',)
+        ),
+        'completed_by': Field(
+            _user_ref('completed_by', 'completed_by_name'),
+            ('js.completed_by', 'completer.full_name as completed_by_name'), ('completer',)
+        ),
+        'production_notes': Field(column('production_notes'), ('js.production_notes',)),
+        'requirements': Field(column('requirements'), ('js.requirements',)),
+        'started_at': Field(iso('started_at'), ('js.started_at',)),
+    },
+    joins={
+        'process': 'LEFT JOIN processes p ON js.process_id = p.id',
+        'process_group': 'LEFT JOIN process_groups pg ON p.group_id = pg.id',
+        'assignee': 'LEFT JOIN users u ON js.assigned_to = u.id',
+        'starter': 'LEFT JOIN users starter ON js.started_by = starter.id',
+        'completer': 'LEFT JOIN users completer ON js.completed_by = completer.id',
+    },
+    required_columns=('js.job_id',),
+)
+
+
+def _encode_jobs_cursor(job):
+    """Listedeki son işten keyset cursor'ı: '<created_at ISO>,<id>'"""
+    return f"{job['created_at'].isoformat()},{job['id']}"
+
+
+def _parse_jobs_cursor(value):
+    """'<created_at>,<id>' cursor'ını (datetime, uuid str) olarak çöz; geçersizse None"""
+    try:
+        created_at, job_id = value.rsplit(',', 1)
+        # URL'de kodlanmamış '+' (timezone) boşluk olarak gelir
+        created_at = datetime.fromisoformat(created_at.strip().replace(' ', '+'))
+        return created_at, str(uuid.UUID(job_id.strip()))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _estimate_row_count(count_query, params, filtered):
+    """
+    Tahmini satır sayısı (COUNT çalıştırmadan)
+
+    Filtre yoksa pg_class.reltuples, varsa planner'ın EXPLAIN satır tahmini kullanılır.
+    """
+    if not filtered:
+        result = execute_query_one(
+            "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = 'jobs'::regclass",
+            prepared='jobs_reltuples_estimate'
+        )
+        # Hiç ANALYZE edilmemiş tabloda reltuples -1 (PG14+) veya 0 olur
+        if result and result['estimate'] > 0:
+            return result['estimate']
+
+    plan = execute_query_one(f"EXPLAIN (FORMAT JSON) {count_query}", params)
+    try:
+        # COUNT(*) düğümünün altındaki tarama tahmini
+        root = plan['QUERY PLAN'][0]['Plan']
+        return int(root['Plans'][0]['Plan Rows']) if root.get('Plans') else int(root['Plan Rows'])
+    except (TypeError, KeyError, IndexError, ValueError):
+        return None
+
 @jobs_bp.route('', methods=['GET'])
 @token_required
 @permission_required('jobs', 'view')
@@ -32,195 +181,184 @@ def get_jobs():
         page = safe_int(request.args.get('page', 1), 1)
         per_page = safe_int(request.args.get('per_page', 20), 20)
         
-        query = """
-            SELECT 
-                j.id, j.job_number, j.title, j.description, j.status, 
-                j.priority, j.due_date, j.created_at, j.revision_no,
-                c.id as customer_id, c.name as customer_name,
-                d.id as dealer_id, d.name as dealer_name,
-                u.full_name as created_by_name,
-                COUNT(js.id) as total_steps,
-                COUNT(js.id) FILTER (WHERE js.status = 'completed') as completed_steps
+        # Alan seçimi: ?fields=id,status,steps&include=...&fields[steps]=id,status
+        try:
+            job_fields = requested_fields(_JOB_FIELDS)
+            step_fields = requested_fields(_JOB_STEP_FIELDS, param='fields[steps]', include_param=None)
+        except FieldSelectionError as e:
+            return jsonify({'error': f"Geçersiz alan: {', '.join(e.unknown)}"}), 400
+
+        # Sadece seçilen alanların kolon ve join'leri; adım sayaçları jobs üzerinde (GROUP BY yok)
+        counter_source, counter_join = step_counter_source('j')
+        base_query = f"""
+            SELECT
+                {_JOB_FIELDS.select_sql(job_fields, counters=counter_source)}
             FROM jobs j
-            LEFT JOIN customers c ON j.customer_id = c.id
-            LEFT JOIN customer_dealers d ON j.dealer_id = d.id
-            LEFT JOIN users u ON j.created_by = u.id
-            LEFT JOIN job_steps js ON j.id = js.job_id
+            {_JOB_FIELDS.join_sql(job_fields, counter_join=counter_join)}
             WHERE 1=1
         """
-        
+
+        # Keyset modu: ?after=<created_at>,<id> (önceki sayfanın next_cursor değeri)
+        # Boş ?after= ilk sayfayı keyset modunda döndürür
+        keyset = 'after' in request.args
+        if keyset and search:
+            # Arama alaka sırasıyla döner; created_at cursor'ı bu sırada satır atlar/tekrarlar
+            return jsonify({'error': 'Arama ile cursor (after) birlikte kullanılamaz, page kullanın'}), 400
+        cursor = None
+        if request.args.get('after'):
+            cursor = _parse_jobs_cursor(request.args['after'])
+            if cursor is None:
+                return jsonify({'error': 'Geçersiz cursor'}), 400
+
+        # Toplam: exact | estimate | none (offset modunda varsayılan exact, keyset'te none)
+        total_mode = request.args.get('total', 'none' if keyset else 'exact')
+        if total_mode not in _TOTAL_MODES:
+            return jsonify({'error': 'Geçersiz total parametresi'}), 400
+
+        conditions = []
         params = []
         
-        # Arama
+        # Arama: iş no/başlık veya müşteri adı (trigram indeksli alt sorgular)
         if search:
-            query += """ AND (
-                j.title ILIKE %s OR 
-                j.job_number ILIKE %s OR 
-                c.name ILIKE %s
-            )"""
-            search_pattern = f'%{search}%'
-            params.extend([search_pattern, search_pattern, search_pattern])
+            job_ids_sql, job_ids_params = search_subquery('jobs', search)
+            customer_ids_sql, customer_ids_params = search_subquery('customers', search)
+            conditions.append(
+                f"j.id IN ({job_ids_sql} UNION "
+                f"SELECT id FROM jobs WHERE customer_id IN ({customer_ids_sql}))"
+            )
+            params.extend(job_ids_params + customer_ids_params)
         
         # Durum filtresi
         if status:
-            query += " AND j.status = %s"
+            conditions.append("j.status = %s")
             params.append(status)
         
         # Müşteri filtresi
         if customer_id:
-            query += " AND j.customer_id = %s"
+            conditions.append("j.customer_id = %s")
             params.append(customer_id)
         
         # Öncelik filtresi
         if priority:
-            query += " AND j.priority = %s"
+            conditions.append("j.priority = %s")
             params.append(priority)
         
         # Tarih filtresi
         if date_from:
-            query += " AND j.created_at >= %s"
+            conditions.append("j.created_at >= %s")
             params.append(date_from)
         
         if date_to:
-            query += " AND j.created_at <= %s"
+            conditions.append("j.created_at <= %s")
             params.append(date_to + ' 23:59:59')
+
+        where_clause = ''.join(f" AND {condition}" for condition in conditions)
+
+        # Toplam sayı: job_steps join/GROUP BY olmadan, sadece filtrelenen jobs satırları
+        total = None
+        if total_mode != 'none':
+            count_query = "SELECT COUNT(*) as total FROM jobs j WHERE 1=1" + where_clause
+
+            if total_mode == 'estimate':
+                total = _estimate_row_count(count_query, tuple(params), filtered=bool(conditions))
+            else:
+                count_result = execute_query_one(count_query, tuple(params))
+                total = count_result['total'] if count_result else 0
+
+        query = base_query + where_clause
+        page_params = list(params)
+
+        if cursor:
+            # (created_at, id) sırası idx_jobs_created_at_id ile okunur; derinlikten bağımsız maliyet
+            query += " AND (j.created_at, j.id) < (%s, %s)"
+            page_params.extend(cursor)
+
+        # Aramada alaka sırası (sadece offset modunda; keyset aramayla kullanılamaz)
+        rank_sql, rank_params = (None, [])
+        if search:
+            rank_sql, rank_params = search_rank('jobs', search, alias='j')
+
+        if rank_sql:
+            query += f" ORDER BY {rank_sql} DESC, j.created_at DESC, j.id DESC"
+            page_params.extend(rank_params)
+        else:
+            query += " ORDER BY j.created_at DESC, j.id DESC"
+
+        if keyset:
+            # Bir fazla satır: sonraki sayfa var mı
+            query += f" LIMIT {per_page + 1}"
+        else:
+            # Pagination
+            offset = (page - 1) * per_page
+            query += f" LIMIT {per_page} OFFSET {offset}"
         
-        query += " GROUP BY j.id, c.id, d.id, u.full_name"
-        query += " ORDER BY j.created_at DESC"
-        
-        # Toplam sayı
-        count_query = f"SELECT COUNT(*) as total FROM ({query}) as subquery"
-        count_result = execute_query_one(count_query, tuple(params))
-        total = count_result['total'] if count_result else 0
-        
-        # Pagination
-        offset = (page - 1) * per_page
-        query += f" LIMIT {per_page} OFFSET {offset}"
-        
-        jobs = execute_query(query, tuple(params))
+        jobs = execute_query(query, tuple(page_params))
+
+        has_more = False
+        if keyset:
+            has_more = len(jobs) > per_page
+            jobs = jobs[:per_page]
 
         # PERFORMANCE OPTIMIZATION: Fetch all job steps in a single query
         # This eliminates N+1 query problem (was: 1 query per job, now: 1 query total)
         job_ids = [job['id'] for job in jobs]
 
         all_steps = []
-        if job_ids:
-            all_steps_query = """
+        if job_ids and 'steps' in job_fields:
+            all_steps_query = f"""
                 SELECT
-                    js.job_id,
-                    js.id,
-                    js.process_id,
-                    js.status,
-                    COALESCE(js.order_index, 0) as order_index,
-                    js.assigned_to,
-                    js.completed_at,
-                    js.production_notes,
-                    js.requirements,
-                    js.started_at,
-                    js.due_date,
-                    js.planned_start_date,
-                    js.planned_end_date,
-                    js.due_time,
-                    p.name as process_name,
-                    p.code as process_code,
-                    p.description as process_description,
-                    p.group_id as process_group_id,
-                    pg.name as process_group_name,
-                    pg.color as process_group_color,
-                    u.full_name as assigned_to_name,
-                    starter.full_name as started_by_name,
-                    completer.full_name as completed_by_name,
-                    js.started_by,
-                    js.completed_by
+                    {_JOB_STEP_FIELDS.select_sql(step_fields)}
                 FROM job_steps js
-                LEFT JOIN processes p ON js.process_id = p.id
-                LEFT JOIN process_groups pg ON p.group_id = pg.id
-                LEFT JOIN users u ON js.assigned_to = u.id
-                LEFT JOIN users starter ON js.started_by = starter.id
-                LEFT JOIN users completer ON js.completed_by = completer.id
+                {_JOB_STEP_FIELDS.join_sql(step_fields)}
                 WHERE js.job_id = ANY(%s::uuid[])
                 ORDER BY js.job_id, COALESCE(js.order_index, 0)
             """
+            # Sadece tam alan setinde prepared statement (isim sabit SQL'e bağlı)
+            prepared = 'jobs_list_steps' if _JOB_STEP_FIELDS.is_full(step_fields) else None
             try:
-                all_steps = execute_query(all_steps_query, (job_ids,))
+                all_steps = execute_query(all_steps_query, (job_ids,), prepared=prepared)
             except Exception as e:
                 print(f"Error fetching all job steps: {str(e)}")
                 all_steps = []
 
         # Group steps by job_id for fast lookup
+        serialize_step = _JOB_STEP_FIELDS.serializer(step_fields)
         steps_by_job = {}
         for step in all_steps:
-            job_id = step['job_id']
-            if job_id not in steps_by_job:
-                steps_by_job[job_id] = []
-            steps_by_job[job_id].append(step)
+            steps_by_job.setdefault(step['job_id'], []).append(serialize_step(step))
 
+        serialize_job = _JOB_FIELDS.serializer(job_fields)
         jobs_list = []
         for job in jobs:
             # Get pre-fetched steps for this job
-            job_steps = steps_by_job.get(job['id'], [])
-
-            jobs_list.append({
-                'id': str(job['id']),
-                'job_number': job['job_number'],
-                'title': job['title'],
-                'description': job['description'],
-                'status': job['status'],
-                'priority': job['priority'],
-                'due_date': job['due_date'].isoformat() if job['due_date'] else None,
-                'delivery_date': job['due_date'].isoformat() if job['due_date'] else None,  # Alias for due_date
-                'created_at': job['created_at'].isoformat() if job['created_at'] else None,
-                'revision_no': job['revision_no'],
-                'customer_id': str(job['customer_id']) if job['customer_id'] else None,
-                'customer_name': job['customer_name'],
-                'dealer_id': str(job['dealer_id']) if job.get('dealer_id') else None,
-                'dealer_name': job.get('dealer_name'),
-                'created_by_name': job['created_by_name'],
-                'total_steps': job['total_steps'],
-                'completed_steps': job['completed_steps'],
-                'progress': round((job['completed_steps'] / job['total_steps'] * 100) if job['total_steps'] > 0 else 0),
-                'steps': [{
-                    'id': str(step['id']),
-                    'process_id': str(step['process_id']),
-                    'status': step['status'],
-                    'order_index': step.get('order_index', 0),
-                    'due_date': step['due_date'].isoformat() if step.get('due_date') else None,
-                    'planned_start_date': step['planned_start_date'].isoformat() if step.get('planned_start_date') else None,
-                    'planned_end_date': step['planned_end_date'].isoformat() if step.get('planned_end_date') else None,
-                    'due_time': step['due_time'].isoformat() if step.get('due_time') else None,
-                    'process_name': step.get('process_name'),
-                    'process_code': step.get('process_code'),
-                    'process_description': step.get('process_description'),
-                    'process_group_id': str(step['process_group_id']) if step.get('process_group_id') else None,
-                    'process_group_color': step.get('process_group_color'),
-                    'process_group_name': step.get('process_group_name'),
-                    'assigned_to': {
-                        'id': str(step['assigned_to']) if step.get('assigned_to') else None,
-                        'name': step.get('assigned_to_name')
-                    } if step.get('assigned_to') else None,
-                    'completed_at': step['completed_at'].isoformat() if step.get('completed_at') else None,
-                    'started_by': {
-                        'id': str(step['started_by']) if step.get('started_by') else None,
-                        'name': step.get('started_by_name')
-                    } if step.get('started_by') else None,
-                    'completed_by': {
-                        'id': str(step['completed_by']) if step.get('completed_by') else None,
-                        'name': step.get('completed_by_name')
-                    } if step.get('completed_by') else None,
-                    'production_notes': step.get('production_notes'),
-                    'requirements': step.get('requirements'),
-                    'started_at': step['started_at'].isoformat() if step.get('started_at') else None,
-                } for step in job_steps]
-            })
+            job['steps'] = steps_by_job.get(job['id'], [])
+            jobs_list.append(serialize_job(job))
         
-        return jsonify({
-            'data': jobs_list,
-            'meta': {
-                'total': total,
+        if keyset:
+            meta = {
+                'per_page': per_page,
+                'has_more': has_more,
+                'next_cursor': _encode_jobs_cursor(jobs[-1]) if has_more else None
+            }
+        else:
+            # Alaka sırasında created_at cursor'ı geçerli değil
+            meta = {
                 'page': page,
                 'per_page': per_page,
-                'total_pages': (total + per_page - 1) // per_page
+                'next_cursor': (
+                    _encode_jobs_cursor(jobs[-1]) if len(jobs) == per_page and not rank_sql else None
+                )
             }
+            if total is not None:
+                meta['total_pages'] = (total + per_page - 1) // per_page
+
+        if total is not None:
+            meta['total'] = total
+            meta['total_estimated'] = total_mode == 'estimate'
+
+        return jsonify({
+            'data': jobs_list,
+            'meta': meta
         }), 200
         
     except Exception as e:
@@ -372,6 +510,7 @@ def get_job(job_id):
 @jobs_bp.route('', methods=['POST'])
 @token_required
 @permission_required('jobs', 'create')
+@invalidates_cache('jobs', 'job_steps')
 def create_job():
     """Yeni iş oluştur"""
     try:
@@ -389,8 +528,60 @@ def create_job():
         next_number = count_result['count'] + 1
         job_number = f"TLP-{year}-{next_number:04d}"
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        # Süreçleri önce doğrula; hatalı adımda hiçbir kayıt yazılmaz
+        step_rows = []
+        for idx, step in enumerate(data.get('steps') or []):
+            due_date_value = step.get('due_date')
+            due_time_value = step.get('due_time')
+            planned_start_date_value = step.get('planned_start_date')
+            planned_end_date_value = step.get('planned_end_date')
+            parsed_due_date = None
+            parsed_due_time = None
+
+            if due_date_value not in (None, '', 'null'):
+                try:
+                    parsed_due_date = datetime.strptime(str(due_date_value).strip(), '%Y-%m-%d').date()
+                except ValueError:
+                    return jsonify({'error': 'Adım termin tarihi geçersiz'}), 400
+
+            if due_time_value not in (None, '', 'null'):
+                raw_time = str(due_time_value).strip()
+                try:
+                    if raw_time.count(':') == 1:
+                        parsed_due_time = datetime.strptime(raw_time, '%H:%M').time()
+                    else:
+                        parsed_due_time = datetime.strptime(raw_time, '%H:%M:%S').time()
+                except ValueError:
+                    return jsonify({'error': 'Adım termin saati geçersiz'}), 400
+            
+            parsed_planned_start_date = None
+            if planned_start_date_value not in (None, '', 'null'):
+                try:
+                    parsed_planned_start_date = datetime.strptime(str(planned_start_date_value).strip(), '%Y-%m-%d').date()
+                except ValueError:
+                    pass # Hata verme, sadece null bırak
+
+            parsed_planned_end_date = None
+            if planned_end_date_value not in (None, '', 'null'):
+                try:
+                    parsed_planned_end_date = datetime.strptime(str(planned_end_date_value).strip(), '%Y-%m-%d').date()
+                except ValueError:
+                    pass # Hata verme, sadece null bırak
+
+            step_rows.append((
+                step.get('process_id'),
+                idx,
+                step.get('assigned_to') if step.get('assigned_to') else None,
+                step.get('machine_id') if step.get('machine_id') else None,
+                'pending',  # Tüm süreçler pending başlar
+                step.get('is_parallel', False),
+                step.get('estimated_duration'),
+                parsed_due_date,
+                parsed_due_time,
+                step.get('requirements') if step.get('requirements') else None,
+                parsed_planned_start_date,
+                parsed_planned_end_date
+            ))
         
         # Insert job
         insert_job_query = """
@@ -414,80 +605,21 @@ def create_job():
             user_id
         )
         
-        cursor.execute(insert_job_query, params)
-        result = cursor.fetchone()
-        job_id = result['id']
-        
-        # Süreçleri ekle (eğer varsa)
-        if data.get('steps'):
-            for idx, step in enumerate(data['steps']):
-                due_date_value = step.get('due_date')
-                due_time_value = step.get('due_time')
-                planned_start_date_value = step.get('planned_start_date')
-                planned_end_date_value = step.get('planned_end_date')
-                parsed_due_date = None
-                parsed_due_time = None
-
-                if due_date_value not in (None, '', 'null'):
-                    try:
-                        parsed_due_date = datetime.strptime(str(due_date_value).strip(), '%Y-%m-%d').date()
-                    except ValueError:
-                        conn.close()
-                        return jsonify({'error': 'Adım termin tarihi geçersiz'}), 400
-
-                if due_time_value not in (None, '', 'null'):
-                    raw_time = str(due_time_value).strip()
-                    try:
-                        if raw_time.count(':') == 1:
-                            parsed_due_time = datetime.strptime(raw_time, '%H:%M').time()
-                        else:
-                            parsed_due_time = datetime.strptime(raw_time, '%H:%M:%S').time()
-                    except ValueError:
-                        conn.close()
-                        return jsonify({'error': 'Adım termin saati geçersiz'}), 400
-                
-                parsed_planned_start_date = None
-                if planned_start_date_value not in (None, '', 'null'):
-                    try:
-                        parsed_planned_start_date = datetime.strptime(str(planned_start_date_value).strip(), '%Y-%m-%d').date()
-                    except ValueError:
-                        pass # Hata verme, sadece null bırak
-
-                parsed_planned_end_date = None
-                if planned_end_date_value not in (None, '', 'null'):
-                    try:
-                        parsed_planned_end_date = datetime.strptime(str(planned_end_date_value).strip(), '%Y-%m-%d').date()
-                    except ValueError:
-                        pass # Hata verme, sadece null bırak
-
-                insert_step_query = """
-                    INSERT INTO job_steps (
-                        job_id, process_id, order_index, assigned_to, machine_id,
-                        status, is_parallel, estimated_duration,
-                        due_date, due_time, requirements,
-                        planned_start_date, planned_end_date
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                step_params = (
-                    job_id,
-                    step.get('process_id'),
-                    idx,
-                    step.get('assigned_to') if step.get('assigned_to') else None,
-                    step.get('machine_id') if step.get('machine_id') else None,
-                    'pending',  # Tüm süreçler pending başlar
-                    step.get('is_parallel', False),
-                    step.get('estimated_duration'),
-                    parsed_due_date,
-                    parsed_due_time,
-                    step.get('requirements') if step.get('requirements') else None,
-                    parsed_planned_start_date,
-                    parsed_planned_end_date
-                )
-                cursor.execute(insert_step_query, step_params)
-        
-        conn.commit()
-        conn.close()
+        with transaction():
+            result = execute_write(insert_job_query, params)[0]
+            job_id = result['id']
+            
+            # Süreçleri tek INSERT ile ekle
+            bulk_insert(
+                'job_steps',
+                [
+                    'job_id', 'process_id', 'order_index', 'assigned_to', 'machine_id',
+                    'status', 'is_parallel', 'estimated_duration',
+                    'due_date', 'due_time', 'requirements',
+                    'planned_start_date', 'planned_end_date'
+                ],
+                [(job_id,) + row for row in step_rows]
+            )
         
         return jsonify({
             'message': 'İş başarıyla oluşturuldu',
@@ -505,6 +637,7 @@ def create_job():
 @jobs_bp.route('/<job_id>/activate', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('jobs', 'job_steps')
 def activate_job(job_id):
     """İşi aktif et ve ilk süreci başlat"""
     try:
@@ -562,6 +695,7 @@ def activate_job(job_id):
     
 @jobs_bp.route('/steps/<step_id>/complete', methods=['POST'])
 @token_required
+@invalidates_cache('jobs', 'job_steps')
 def complete_step(step_id):
     """Süreci tamamla ve bir sonrakini aktif et"""
     current_user_id = request.current_user.get('user_id')
@@ -675,6 +809,7 @@ def complete_step(step_id):
 
 @jobs_bp.route('/steps/<step_id>/production', methods=['POST'])
 @token_required
+@invalidates_cache('jobs', 'job_steps')
 def add_production(step_id):
     """Devam eden sürece üretim ekle"""
     try:
@@ -759,6 +894,7 @@ def add_production(step_id):
 
 @jobs_bp.route('/steps/<step_id>/activate', methods=['POST'])
 @token_required
+@invalidates_cache('jobs', 'job_steps')
 def activate_step(step_id):
     """Beklemedeki süreci hazır statüsüne getir"""
     try:
@@ -827,6 +963,7 @@ def activate_step(step_id):
 
 @jobs_bp.route('/steps/<step_id>/start', methods=['POST'])
 @token_required
+@invalidates_cache('jobs', 'job_steps')
 def start_step(step_id):
     """Süreci başlat"""
     current_user_id = request.current_user.get('user_id')
@@ -870,7 +1007,7 @@ def start_step(step_id):
                 started_by = %s
             WHERE id = %s
             RETURNING id, job_id
-        """, (step_id,))
+        """, (current_user_id, step_id))
         
         result = cursor.fetchone()
         conn.commit()
@@ -888,6 +1025,7 @@ def start_step(step_id):
 
 @jobs_bp.route('/steps/<step_id>/pause', methods=['POST'])
 @token_required
+@invalidates_cache('jobs', 'job_steps')
 def pause_step(step_id):
     """Süreci durdur (blocked)"""
     try:
@@ -967,6 +1105,7 @@ def pause_step(step_id):
 
 @jobs_bp.route('/steps/<step_id>/resume', methods=['POST'])
 @token_required
+@invalidates_cache('jobs', 'job_steps')
 def resume_step(step_id):
     """Durdurulan süreci devam ettir"""
     try:
@@ -1038,6 +1177,7 @@ def resume_step(step_id):
 
 @jobs_bp.route('/steps/<step_id>/reopen', methods=['POST'])
 @token_required
+@invalidates_cache('jobs', 'job_steps')
 def reopen_step(step_id):
     """Tamamlanan süreci yeniden aç"""
     try:
@@ -1335,6 +1475,7 @@ def get_job_revisions(job_id):
 @jobs_bp.route('/<job_id>/revise', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('jobs', 'job_steps')
 def create_job_revision(job_id):
     """Yeni revizyon oluştur"""
     try:
@@ -1478,6 +1619,7 @@ def create_job_revision(job_id):
 @jobs_bp.route('/<job_id>', methods=['PATCH'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('jobs', 'job_steps')
 def update_job(job_id):
     """İşi güncelle"""
     try:
@@ -1553,6 +1695,7 @@ def update_job(job_id):
 @jobs_bp.route('/<job_id>/hold', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('jobs', 'job_steps')
 def hold_job(job_id):
     """İşi dondur (on_hold)"""
     try:
@@ -1629,6 +1772,7 @@ def hold_job(job_id):
 @jobs_bp.route('/<job_id>/resume', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('jobs', 'job_steps')
 def resume_job(job_id):
     """Dondurulan işi devam ettir"""
     try:
@@ -1693,6 +1837,7 @@ def resume_job(job_id):
 @jobs_bp.route('/<job_id>/cancel', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('jobs', 'job_steps')
 def cancel_job(job_id):
     """İşi iptal et"""
     try:
@@ -1768,6 +1913,7 @@ def cancel_job(job_id):
 
 @jobs_bp.route('/steps/<step_id>', methods=['PATCH'])
 @token_required
+@invalidates_cache('jobs', 'job_steps')
 def update_job_step(step_id):
     """Süreç adımını güncelle (atanan kişi, makine, paralellik vb.)"""
     try:
@@ -2048,6 +2194,7 @@ def update_job_step(step_id):
 @jobs_bp.route('/<job_id>/steps', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('jobs', 'job_steps')
 def add_job_step(job_id):
     """İşe yeni süreç adımı ekle"""
     try:
@@ -2151,6 +2298,7 @@ def add_job_step(job_id):
 @jobs_bp.route('/steps/<step_id>', methods=['DELETE'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('jobs', 'job_steps')
 def delete_job_step(step_id):
     """Süreç adımını sil"""
     try:
@@ -2301,6 +2449,7 @@ def get_job_material_tracking(job_id):
 
 @jobs_bp.route('/<job_id>/timeline', methods=['GET'])
 @token_required
+@read_replica
 def get_job_timeline(job_id):
     """İşin zaman çizelgeli hikayesini getir (audit_logs + job_step_notes + step transitions)"""
     try:
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.database import execute_query, execute_query_one, get_db_connection
 from app.middleware.auth_middleware import token_required, role_required
+from app.utils.cache import invalidates_cache
 
 machines_bp = Blueprint('machines', __name__, url_prefix='/api/machines')
 
@@ -122,6 +123,7 @@ def get_machine(machine_id):
 @machines_bp.route('', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('machines')
 def create_machine():
     """Yeni makine oluştur"""
     try:
@@ -179,6 +181,7 @@ def create_machine():
 @machines_bp.route('/<machine_id>', methods=['PATCH'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('machines')
 def update_machine(machine_id):
     """Makineyi güncelle"""
     try:
@@ -256,6 +259,7 @@ def update_machine(machine_id):
 @machines_bp.route('/<machine_id>', methods=['DELETE'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('machines')
 def delete_machine(machine_id):
     """Makineyi sil (soft delete)"""
     try:
@@ -25,15 +25,17 @@ def get_notifications():
         """
         
         params = [user_id]
+        statement_name = 'notifications_list'
         
         if is_read is not None:
             query += " AND is_read = %s"
             params.append(is_read.lower() == 'true')
+            statement_name = 'notifications_list_by_read'
         
         query += " ORDER BY created_at DESC LIMIT %s"
         params.append(limit)
         
-        notifications = execute_query(query, tuple(params))
+        notifications = execute_query(query, tuple(params), prepared=statement_name)
         
         notifications_list = []
         for notif in notifications:
@@ -68,7 +70,7 @@ def get_unread_count():
             WHERE user_id = %s AND is_read = FALSE
         """
         
-        result = execute_query_one(query, (user_id,))
+        result = execute_query_one(query, (user_id,), prepared='notifications_unread_count')
         
         return jsonify({
             'data': {
@@ -4,8 +4,9 @@ Handles purchasing needs analysis, RFQs, and supplier quotations
 """
 
 from flask import Blueprint, request, jsonify
-from app.models.database import execute_query, execute_write, execute_query_one
+from app.models.database import execute_query, execute_write, execute_query_one, read_replica
 from app.middleware.auth_middleware import token_required, permission_required
+from app.utils.search import search_condition, search_rank
 import uuid
 from datetime import datetime, timedelta
 
@@ -14,6 +15,7 @@ procurement_bp = Blueprint('procurement', __name__, url_prefix='/api/procurement
 
 @procurement_bp.route('/needs-analysis', methods=['GET'])
 @token_required
+@read_replica
 def get_needs_analysis():
     """
     Comprehensive materials needs analysis combining:
@@ -607,11 +609,18 @@ def list_suppliers():
             query += " AND is_active = %s"
             params.append(is_active == 'true')
 
+        rank_sql, rank_params = (None, [])
         if search:
-            query += " AND (name LIKE %s OR contact_person LIKE %s OR email LIKE %s)"
-            params.extend([f'%{search}%', f'%{search}%', f'%{search}%'])
-
-        query += " ORDER BY name ASC"
+            search_sql, search_params = search_condition('suppliers', search)
+            query += f" AND {search_sql}"
+            params.extend(search_params)
+            rank_sql, rank_params = search_rank('suppliers', search)
+
+        if rank_sql:
+            query += f" ORDER BY {rank_sql} DESC, name ASC"
+            params.extend(rank_params)
+        else:
+            query += " ORDER BY name ASC"
 
         suppliers = execute_query(query, tuple(params) if params else None)
 
@@ -1,25 +1,27 @@
 from flask import Blueprint, request, jsonify
 from app.models.database import execute_query, execute_query_one, get_db_connection
-from app.middleware.auth_middleware import token_required, role_required
+from app.middleware.auth_middleware import token_required, role_required, PERMISSIONS_CACHE_TAG
+from app.utils.cache import invalidates_cache
+from app.models.schema import register_schema_setup, ensure_schema
 
 roles_bp = Blueprint('roles', __name__, url_prefix='/api/roles')
 
 
-def ensure_role_process_table():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS role_process_permissions (
-            role_id UUID NOT NULL REFERENCES roles(id) ON DELETE CASCADE,
-            process_id UUID NOT NULL REFERENCES processes(id) ON DELETE CASCADE,
-            can_view BOOLEAN DEFAULT TRUE,
-            PRIMARY KEY (role_id, process_id)
-        )
-        """
+register_schema_setup('role_process_permissions', [
+    """
+    CREATE TABLE IF NOT EXISTS role_process_permissions (
+        role_id UUID NOT NULL REFERENCES roles(id) ON DELETE CASCADE,
+        process_id UUID NOT NULL REFERENCES processes(id) ON DELETE CASCADE,
+        can_view BOOLEAN DEFAULT TRUE,
+        PRIMARY KEY (role_id, process_id)
     )
-    conn.commit()
-    conn.close()
+    """
+])
+
+
+def ensure_role_process_table():
+    """role_process_permissions tablosunu process başına bir kez oluştur"""
+    ensure_schema('role_process_permissions')
 
 
 @roles_bp.route('', methods=['GET'])
@@ -122,6 +124,7 @@ def get_role(role_id):
 @roles_bp.route('', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache(PERMISSIONS_CACHE_TAG)
 def create_role():
     """Yeni rol oluştur"""
     try:
@@ -193,6 +196,7 @@ def create_role():
 @roles_bp.route('/<role_id>', methods=['PATCH'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache(PERMISSIONS_CACHE_TAG)
 def update_role(role_id):
     """Rol güncelle"""
     try:
@@ -272,6 +276,7 @@ def update_role(role_id):
 @roles_bp.route('/<role_id>', methods=['DELETE'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache(PERMISSIONS_CACHE_TAG)
 def delete_role(role_id):
     """Rol sil"""
     try:
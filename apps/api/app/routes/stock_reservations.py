@@ -5,7 +5,7 @@ Handles material reservations for jobs with planned usage dates
 
 from flask import Blueprint, request, jsonify
 from app.middleware.auth_middleware import token_required, permission_required
-from app.models.database import execute_query, execute_write
+from app.models.database import execute_query, execute_write, bulk_insert
 import uuid
 from datetime import datetime
 
@@ -127,20 +127,14 @@ def create_bulk_reservations():
             return jsonify({'error': 'Job not found'}), 404
 
         created_reservations = []
+        reservation_rows = []
 
         for res_data in reservations_data:
             if not res_data.get('stock_id') or not res_data.get('reserved_quantity') or not res_data.get('planned_usage_date'):
                 continue
 
             reservation_id = str(uuid.uuid4())
-
-            execute_write("""
-                INSERT INTO stock_reservations (
-                    id, job_id, quotation_id, job_material_id, stock_id,
-                    reserved_quantity, planned_usage_date, notes, created_by
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
+            reservation_rows.append((
                 reservation_id,
                 job_id,
                 quotation_id,
@@ -151,9 +145,18 @@ def create_bulk_reservations():
                 res_data.get('notes'),
                 request.current_user['user_id']
             ))
-
             created_reservations.append(reservation_id)
 
+        # Insert all reservations in one statement and one transaction
+        bulk_insert(
+            'stock_reservations',
+            [
+                'id', 'job_id', 'quotation_id', 'job_material_id', 'stock_id',
+                'reserved_quantity', 'planned_usage_date', 'notes', 'created_by'
+            ],
+            reservation_rows
+        )
+
         return jsonify({
             'message': f'{len(created_reservations)} reservations created successfully',
             'reservation_ids': created_reservations
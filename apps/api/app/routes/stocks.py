@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
-from app.models.database import execute_query, execute_write, execute_query_one
+from app.models.database import execute_query, execute_write, execute_query_one, execute_stream
 from app.middleware.auth_middleware import token_required, permission_required
+from app.utils.fields import Field, FieldSelectionError, Projection, column, iso, requested_fields, text_id
+from app.utils.search import search_condition, search_rank
+from app.utils.streaming import stream_json_list
 from decimal import Decimal
 
 stocks_bp = Blueprint('stocks', __name__, url_prefix='/api/stocks')
@@ -21,6 +24,44 @@ def _decimal(v):
     except:
         return None
 
+def _quantity(key):
+    return lambda r: float(r[key]) if r.get(key) else 0
+
+
+def _is_critical(r):
+    return r['current_quantity'] <= r['min_quantity'] if r['min_quantity'] else False
+
+
+# Özel alanlar: group1..10, category1..10, string1..10, properties1..10
+_CUSTOM_STOCK_FIELDS = [
+    f'{prefix}{index}'
+    for prefix in ('group', 'category', 'string', 'properties')
+    for index in range(1, 11)
+]
+
+# GET /api/stocks alanları (?fields=)
+_STOCK_FIELDS = Projection({
+    'id': Field(text_id('id'), ('id',)),
+    'product_code': Field(column('product_code'), ('product_code',)),
+    'product_name': Field(column('product_name'), ('product_name',)),
+    'category': Field(column('category'), ('category',)),
+    'unit': Field(column('unit', 'adet'), ('unit',)),
+    'current_quantity': Field(_quantity('current_quantity'), ('current_quantity',)),
+    'reserved_quantity': Field(_quantity('reserved_quantity'), ('reserved_quantity',)),
+    'available_quantity': Field(_quantity('available_quantity'), ('available_quantity',)),
+    'min_quantity': Field(_quantity('min_quantity'), ('min_quantity',)),
+    'unit_price': Field(lambda r: float(r['unit_price']) if r['unit_price'] else None, ('unit_price',)),
+    'currency': Field(column('currency', 'TRY'), ('currency',)),
+    'supplier_name': Field(column('supplier_name'), ('supplier_name',)),
+    'description': Field(column('description'), ('description',)),
+    'is_active': Field(column('is_active'), ('is_active',)),
+    'is_critical': Field(_is_critical, ('current_quantity', 'min_quantity')),
+    'created_at': Field(iso('created_at'), ('created_at',)),
+    'updated_at': Field(iso('updated_at'), ('updated_at',)),
+    **{name: Field(column(name), (name,)) for name in _CUSTOM_STOCK_FIELDS},
+})
+
+
 @stocks_bp.route('', methods=['GET'])
 @token_required
 @permission_required('stocks', 'view')
@@ -30,15 +71,16 @@ def get_stocks():
         # Query parameters for filtering
         category = request.args.get('category')
         critical_only = request.args.get('critical_only') == 'true'
+        search = request.args.get('search', '').strip()
 
-        query = """
-            SELECT id, product_code, product_name, category, unit, current_quantity,
-                   reserved_quantity, available_quantity, min_quantity, unit_price,
-                   currency, supplier_name, description, is_active, created_at, updated_at,
-                   group1, group2, group3, group4, group5, group6, group7, group8, group9, group10,
-                   category1, category2, category3, category4, category5, category6, category7, category8, category9, category10,
-                   string1, string2, string3, string4, string5, string6, string7, string8, string9, string10,
-                   properties1, properties2, properties3, properties4, properties5, properties6, properties7, properties8, properties9, properties10
+        try:
+            fields = requested_fields(_STOCK_FIELDS)
+        except FieldSelectionError as e:
+            return jsonify({'error': f"Geçersiz alan: {', '.join(e.unknown)}"}), 400
+
+        # Sadece seçilen alanların kolonları
+        query = f"""
+            SELECT {_STOCK_FIELDS.select_sql(fields)}
             FROM stocks
             WHERE is_active = TRUE
         """
@@ -51,41 +93,22 @@ def get_stocks():
         if critical_only:
             query += " AND current_quantity <= min_quantity"
 
-        query += " ORDER BY product_name"
-
-        rows = execute_query(query, tuple(params) if params else None)
-        data = [{
-            'id': str(r['id']),
-            'product_code': r['product_code'],
-            'product_name': r['product_name'],
-            'category': r.get('category'),
-            'unit': r.get('unit', 'adet'),
-            'current_quantity': float(r['current_quantity']) if r['current_quantity'] else 0,
-            'reserved_quantity': float(r['reserved_quantity']) if r.get('reserved_quantity') else 0,
-            'available_quantity': float(r['available_quantity']) if r.get('available_quantity') else 0,
-            'min_quantity': float(r['min_quantity']) if r['min_quantity'] else 0,
-            'unit_price': float(r['unit_price']) if r['unit_price'] else None,
-            'currency': r.get('currency', 'TRY'),
-            'supplier_name': r.get('supplier_name'),
-            'description': r.get('description'),
-            'is_active': r['is_active'],
-            'is_critical': r['current_quantity'] <= r['min_quantity'] if r['min_quantity'] else False,
-            'created_at': r['created_at'].isoformat() if r.get('created_at') else None,
-            'updated_at': r['updated_at'].isoformat() if r.get('updated_at') else None,
-            'group1': r.get('group1'), 'group2': r.get('group2'), 'group3': r.get('group3'),
-            'group4': r.get('group4'), 'group5': r.get('group5'), 'group6': r.get('group6'),
-            'group7': r.get('group7'), 'group8': r.get('group8'), 'group9': r.get('group9'), 'group10': r.get('group10'),
-            'category1': r.get('category1'), 'category2': r.get('category2'), 'category3': r.get('category3'),
-            'category4': r.get('category4'), 'category5': r.get('category5'), 'category6': r.get('category6'),
-            'category7': r.get('category7'), 'category8': r.get('category8'), 'category9': r.get('category9'), 'category10': r.get('category10'),
-            'string1': r.get('string1'), 'string2': r.get('string2'), 'string3': r.get('string3'),
-            'string4': r.get('string4'), 'string5': r.get('string5'), 'string6': r.get('string6'),
-            'string7': r.get('string7'), 'string8': r.get('string8'), 'string9': r.get('string9'), 'string10': r.get('string10'),
-            'properties1': r.get('properties1'), 'properties2': r.get('properties2'), 'properties3': r.get('properties3'),
-            'properties4': r.get('properties4'), 'properties5': r.get('properties5'), 'properties6': r.get('properties6'),
-            'properties7': r.get('properties7'), 'properties8': r.get('properties8'), 'properties9': r.get('properties9'), 'properties10': r.get('properties10'),
-        } for r in rows]
-        return jsonify({'data': data}), 200
+        # Arama: ürün kodu/adı (trigram indeksli), alaka sırasına göre
+        rank_sql, rank_params = (None, [])
+        if search:
+            search_sql, search_params = search_condition('stocks', search)
+            query += f" AND {search_sql}"
+            params.extend(search_params)
+            rank_sql, rank_params = search_rank('stocks', search)
+
+        if rank_sql:
+            query += f" ORDER BY {rank_sql} DESC, product_name"
+            params.extend(rank_params)
+        else:
+            query += " ORDER BY product_name"
+
+        rows = execute_stream(query, tuple(params) if params else None, itersize=500)
+        return stream_json_list(rows, _STOCK_FIELDS.serializer(fields))
     except Exception as e:
         return jsonify({'error': f'Bir hata oluştu: {str(e)}'}), 500
 
@@ -1,38 +1,101 @@
 from flask import Blueprint, request, jsonify
-from app.models.database import execute_query, execute_query_one
+from app.models.database import execute_query, execute_query_one, read_replica
 from app.middleware.auth_middleware import token_required
+from app.models.schema import has_column
+from app.utils.fields import Field, FieldSelectionError, Projection, column, iso, requested_fields
 
 tasks_bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
 
+
+def _float_or_none(key):
+    return lambda row: float(row[key]) if row.get(key) else None
+
+
+# GET /api/tasks alanları (?fields=); {has_production}/{required_quantity} migration 010'a bağlı
+_TASK_FIELDS = Projection(
+    {
+        'id': Field(lambda row: str(row['id']), ('js.id',)),
+        'status': Field(column('status'), ('js.status',)),
+        'order_index': Field(column('order_index'), ('js.order_index',)),
+        'started_at': Field(iso('started_at'), ('js.started_at',)),
+        'completed_at': Field(iso('completed_at'), ('js.completed_at',)),
+        'estimated_duration': Field(column('estimated_duration'), ('js.estimated_duration',)),
+        'production_quantity': Field(_float_or_none('production_quantity'), ('js.production_quantity',)),
+        'production_unit': Field(column('production_unit'), ('js.production_unit',)),
+        'production_notes': Field(column('production_notes'), ('js.production_notes',)),
+        'has_production': Field(column('has_production', False), ('{has_production} AS has_production',)),
+        'required_quantity': Field(
+            _float_or_none('required_quantity'), ('{required_quantity} AS required_quantity',)
+        ),
+        'job': Field(
+            lambda task: {
+                'id': str(task['job_id']),
+                'job_number': task['job_number'],
+                'title': task['job_title'],
+                'status': task['job_status'],
+                'due_date': task['due_date'].isoformat() if task['due_date'] else None,
+                'customer_name': task['customer_name'],
+                'dealer_name': task.get('dealer_name'),
+                'dealer': {
+                    'id': str(task['job_dealer_id']),
+                    'name': task.get('dealer_name')
+                } if task.get('job_dealer_id') else None
+            },
+            (
+                'j.id as job_id', 'j.job_number', 'j.title as job_title', 'j.status as job_status',
+                'j.due_date', 'j.dealer_id as job_dealer_id', 'd.name as dealer_name', 'c.name as customer_name'
+            ),
+            ('customer', 'dealer')
+        ),
+        'process': Field(
+            lambda task: {
+                'id': str(task['process_id']),
+                'name': task['process_name'],
+                'code': task['process_code']
+            },
+            ('p.id as process_id', 'p.name as process_name', 'p.code as process_code'),
+            ('process',)
+        ),
+        'machine': Field(
+            lambda task: {
+                'id': str(task['machine_id']) if task['machine_id'] else None,
+                'name': task['machine_name']
+            } if task['machine_id'] else None,
+            ('m.id as machine_id', 'm.name as machine_name'),
+            ('machine',)
+        ),
+    },
+    joins={
+        'process': 'JOIN processes p ON js.process_id = p.id',
+        'machine': 'LEFT JOIN machines m ON js.machine_id = m.id',
+        'customer': 'LEFT JOIN customers c ON j.customer_id = c.id',
+        'dealer': 'LEFT JOIN customer_dealers d ON j.dealer_id = d.id',
+    },
+)
+
 @tasks_bp.route('', methods=['GET'])
 @token_required
 def get_my_tasks():
     """Kullanıcıya atanan görevleri getir"""
     try:
         user_id = request.current_user['user_id']
-        
-        query = """
-            SELECT 
-                js.*,
-                j.id as job_id,
-                j.job_number,
-                j.title as job_title,
-                j.status as job_status,
-                j.due_date,
-                j.dealer_id as job_dealer_id,
-                d.name as dealer_name,
-                p.id as process_id,
-                p.name as process_name,
-                p.code as process_code,
-                m.id as machine_id,
-                m.name as machine_name,
-                c.name as customer_name
+
+        try:
+            fields = requested_fields(_TASK_FIELDS)
+        except FieldSelectionError as e:
+            return jsonify({'error': f"Geçersiz alan: {', '.join(e.unknown)}"}), 400
+
+        # Sadece seçilen alanların kolonları ve join'leri
+        optional_columns = {
+            'has_production': 'js.has_production' if has_column('job_steps', 'has_production') else 'FALSE',
+            'required_quantity': 'js.required_quantity' if has_column('job_steps', 'required_quantity') else 'NULL',
+        }
+        query = f"""
+            SELECT
+                {_TASK_FIELDS.select_sql(fields, **optional_columns)}
             FROM job_steps js
             JOIN jobs j ON js.job_id = j.id
-            JOIN processes p ON js.process_id = p.id
-            LEFT JOIN machines m ON js.machine_id = m.id
-            LEFT JOIN customers c ON j.customer_id = c.id
-            LEFT JOIN customer_dealers d ON j.dealer_id = d.id
+            {_TASK_FIELDS.join_sql(fields)}
             WHERE js.assigned_to = %s
             AND js.status IN ('ready', 'in_progress', 'completed')
             ORDER BY 
@@ -46,44 +109,9 @@ def get_my_tasks():
         """
         
         tasks = execute_query(query, (user_id,))
-        
-        tasks_list = []
-        for task in tasks:
-            tasks_list.append({
-                'id': str(task['id']),
-                'status': task['status'],
-                'order_index': task['order_index'],
-                'started_at': task['started_at'].isoformat() if task['started_at'] else None,
-                'completed_at': task['completed_at'].isoformat() if task['completed_at'] else None,
-                'estimated_duration': task['estimated_duration'],
-                'production_quantity': float(task['production_quantity']) if task['production_quantity'] else None,
-                'production_unit': task['production_unit'],
-                'production_notes': task['production_notes'],
-                'has_production': task.get('has_production', False),
-                'required_quantity': float(task['required_quantity']) if task.get('required_quantity') else None,
-                'job': {
-                    'id': str(task['job_id']),
-                    'job_number': task['job_number'],
-                    'title': task['job_title'],
-                    'status': task['job_status'],
-                    'due_date': task['due_date'].isoformat() if task['due_date'] else None,
-                    'customer_name': task['customer_name'],
-                    'dealer_name': task.get('dealer_name'),
-                    'dealer': {
-                        'id': str(task['job_dealer_id']),
-                        'name': task.get('dealer_name')
-                    } if task.get('job_dealer_id') else None
-                },
-                'process': {
-                    'id': str(task['process_id']),
-                    'name': task['process_name'],
-                    'code': task['process_code']
-                },
-                'machine': {
-                    'id': str(task['machine_id']) if task['machine_id'] else None,
-                    'name': task['machine_name']
-                } if task['machine_id'] else None
-            })
+
+        serialize_task = _TASK_FIELDS.serializer(fields)
+        tasks_list = [serialize_task(task) for task in tasks]
         
         return jsonify({'data': tasks_list}), 200
         
@@ -351,6 +379,7 @@ def get_production_stats():
 
 @tasks_bp.route('/performance', methods=['GET'])
 @token_required
+@read_replica
 def get_performance_metrics():
     """Gelişmiş performans metrikleri (Dashboard için)"""
     try:
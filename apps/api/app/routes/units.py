@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.database import execute_query, execute_query_one, execute_write
 from app.middleware.auth_middleware import token_required, permission_required
+from app.models.schema import register_schema_setup, ensure_schema
 
 units_bp = Blueprint('units', __name__, url_prefix='/api/units')
 
@@ -12,65 +13,63 @@ def _s(value):
     return text if text != '' else None
 
 
+# Tablo/trigger/varsayılan birimler: açılışta bir kez (app.models.schema)
+register_schema_setup('units', [
+    """
+    CREATE TABLE IF NOT EXISTS units (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        code VARCHAR(50) UNIQUE NOT NULL,
+        name VARCHAR(100) NOT NULL,
+        description TEXT,
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_units_active ON units(is_active)",
+    "CREATE INDEX IF NOT EXISTS idx_units_name ON units(name)",
+    """
+    CREATE OR REPLACE FUNCTION update_units_timestamp()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        NEW.updated_at = NOW();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger WHERE tgname = 'trigger_update_units_timestamp'
+        ) THEN
+            CREATE TRIGGER trigger_update_units_timestamp
+                BEFORE UPDATE ON units
+                FOR EACH ROW
+                EXECUTE FUNCTION update_units_timestamp();
+        END IF;
+    END;
+    $$;
+    """,
+    """
+    INSERT INTO units (code, name, description)
+    VALUES
+        ('ADET', 'Adet', 'Adet bazlı sayım birimi'),
+        ('PAKET', 'Paket', 'Paket bazlı sayım birimi'),
+        ('KUTU', 'Kutu', 'Kutu bazlı sayım birimi'),
+        ('KG', 'Kilogram', 'Ağırlık birimi'),
+        ('M', 'Metre', 'Uzunluk birimi'),
+        ('M2', 'Metrekare', 'Alan birimi'),
+        ('CM', 'Santimetre', 'Uzunluk birimi'),
+        ('L', 'Litre', 'Hacim birimi')
+    ON CONFLICT (code) DO NOTHING;
+    """,
+])
+
+
 def ensure_units_initialized():
-    """Tablo/trigger yoksa oluştur ve varsayılanları ekle."""
-    statements = [
-        """
-        CREATE TABLE IF NOT EXISTS units (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-            code VARCHAR(50) UNIQUE NOT NULL,
-            name VARCHAR(100) NOT NULL,
-            description TEXT,
-            is_active BOOLEAN DEFAULT TRUE,
-            created_at TIMESTAMP DEFAULT NOW(),
-            updated_at TIMESTAMP DEFAULT NOW()
-        )
-        """,
-        "CREATE INDEX IF NOT EXISTS idx_units_active ON units(is_active)",
-        "CREATE INDEX IF NOT EXISTS idx_units_name ON units(name)",
-        """
-        CREATE OR REPLACE FUNCTION update_units_timestamp()
-        RETURNS TRIGGER AS $$
-        BEGIN
-            NEW.updated_at = NOW();
-            RETURN NEW;
-        END;
-        $$ LANGUAGE plpgsql;
-        """,
-        """
-        DO $$
-        BEGIN
-            IF NOT EXISTS (
-                SELECT 1 FROM pg_trigger WHERE tgname = 'trigger_update_units_timestamp'
-            ) THEN
-                CREATE TRIGGER trigger_update_units_timestamp
-                    BEFORE UPDATE ON units
-                    FOR EACH ROW
-                    EXECUTE FUNCTION update_units_timestamp();
-            END IF;
-        END;
-        $$;
-        """,
-        """
-        INSERT INTO units (code, name, description)
-        VALUES
-            ('ADET', 'Adet', 'Adet bazlı sayım birimi'),
-            ('PAKET', 'Paket', 'Paket bazlı sayım birimi'),
-            ('KUTU', 'Kutu', 'Kutu bazlı sayım birimi'),
-            ('KG', 'Kilogram', 'Ağırlık birimi'),
-            ('M', 'Metre', 'Uzunluk birimi'),
-            ('M2', 'Metrekare', 'Alan birimi'),
-            ('CM', 'Santimetre', 'Uzunluk birimi'),
-            ('L', 'Litre', 'Hacim birimi')
-        ON CONFLICT (code) DO NOTHING;
-        """,
-    ]
-
-    for statement in statements:
-        try:
-            execute_write(statement)
-        except Exception:
-            continue
+    """Tablo/trigger yoksa oluştur ve varsayılanları ekle (process başına bir kez)."""
+    ensure_schema('units')
 
 
 @units_bp.route('', methods=['GET'])
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.database import execute_query, execute_query_one, get_db_connection
-from app.middleware.auth_middleware import token_required, role_required
+from app.middleware.auth_middleware import token_required, role_required, PERMISSIONS_CACHE_TAG
+from app.utils.cache import invalidates_cache
 
 user_roles_bp = Blueprint('user_roles', __name__, url_prefix='/api/user-roles')
 
@@ -49,6 +50,7 @@ def get_user_roles(user_id):
 @user_roles_bp.route('/user/<user_id>', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('users', PERMISSIONS_CACHE_TAG)
 def assign_roles_to_user(user_id):
     """Kullanıcıya rol(ler) ata"""
     try:
@@ -112,6 +114,7 @@ def assign_roles_to_user(user_id):
 @user_roles_bp.route('/user/<user_id>/role/<role_id>', methods=['DELETE'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('users', PERMISSIONS_CACHE_TAG)
 def remove_role_from_user(user_id, role_id):
     """Kullanıcıdan rol kaldır"""
     try:
@@ -171,6 +174,7 @@ def remove_role_from_user(user_id, role_id):
 @user_roles_bp.route('/user/<user_id>/primary/<role_id>', methods=['PATCH'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('users', PERMISSIONS_CACHE_TAG)
 def set_primary_role(user_id, role_id):
     """Primary rolü ayarla"""
     try:
@@ -1,41 +1,26 @@
 from flask import Blueprint, request, jsonify
 import json
 from app.models.database import execute_query, execute_query_one, get_db_connection
-from app.middleware.auth_middleware import token_required, role_required
+from app.middleware.auth_middleware import token_required, role_required, PERMISSIONS_CACHE_TAG
+from app.utils.cache import invalidates_cache
+from app.models.schema import has_column
+from app.utils.passwords import BUSY_RETRY_AFTER, PasswordVerifierBusy, hash_password
 
 users_bp = Blueprint('users', __name__, url_prefix='/api/users')
 
 def _get_user_avatar_column_flags():
-    """Determine whether legacy avatar columns are available."""
-    avatar_columns_query = """
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_name = 'users'
-        AND column_name IN ('avatar_url', 'avatar_file_id')
-    """
-    columns = execute_query(avatar_columns_query)
-    has_avatar_url = any(col['column_name'] == 'avatar_url' for col in columns or [])
-    has_avatar_file_id = any(col['column_name'] == 'avatar_file_id' for col in columns or [])
-    return has_avatar_url, has_avatar_file_id
+    """Determine whether legacy avatar columns are available (resolved at startup)."""
+    return has_column('users', 'avatar_url'), has_column('users', 'avatar_file_id')
 
 @users_bp.route('', methods=['GET'])
 @token_required
 def get_users():
     """Kullanıcıları listele"""
     try:
-        # Legacy role kolonunun varlığını kontrol et
-        role_column_exists_query = """
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.columns
-                WHERE table_name = 'users'
-                AND column_name = 'role'
-            ) AS role_exists
-        """
-        role_column_exists = execute_query_one(role_column_exists_query)
+        # Legacy role kolonu varsa (açılışta çözülür)
         legacy_role_map = {}
 
-        if role_column_exists and role_column_exists.get('role_exists'):
+        if has_column('users', 'role'):
             legacy_roles = execute_query("""
                 SELECT id, role
                 FROM users
@@ -253,17 +238,8 @@ def get_user(user_id):
 
         # Legacy support: primary role yoksa users.role kolonu ile doldur
         legacy_role_code = None
-        role_column_exists_query = """
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.columns
-                WHERE table_name = 'users'
-                AND column_name = 'role'
-            ) AS role_exists
-        """
-        role_column_exists = execute_query_one(role_column_exists_query)
 
-        if role_column_exists and role_column_exists.get('role_exists'):
+        if has_column('users', 'role'):
             legacy_role_result = execute_query_one(
                 "SELECT role FROM users WHERE id = %s",
                 (user_id,)
@@ -338,6 +314,7 @@ def get_user(user_id):
 @users_bp.route('', methods=['POST'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('users', PERMISSIONS_CACHE_TAG)
 def create_user():
     """Yeni kullanıcı oluştur"""
     try:
@@ -365,14 +342,14 @@ def create_user():
 
         insert_query = f"""
             INSERT INTO users (username, email, password_hash, full_name, role)
-            VALUES (%s, %s, crypt(%s, gen_salt('bf')), %s, %s)
+            VALUES (%s, %s, %s, %s, %s)
             RETURNING {', '.join(returning_fields)}
         """
         
         params = (
             data.get('username'),
             data.get('email'),
-            data.get('password'),
+            hash_password(data.get('password')),
             data.get('full_name'),
             data.get('role', 'operator')
         )
@@ -397,7 +374,9 @@ def create_user():
                 'avatar_file_id': str(avatar_file_id) if avatar_file_id else None
             }
         }), 201
-        
+
+    except PasswordVerifierBusy:
+        return jsonify({'error': 'Sunucu yoğun, lütfen tekrar deneyin'}), 503, {'Retry-After': str(BUSY_RETRY_AFTER)}
     except Exception as e:
         print(f"Error creating user: {str(e)}")
         return jsonify({'error': f'Bir hata oluştu: {str(e)}'}), 500
@@ -406,6 +385,7 @@ def create_user():
 @users_bp.route('/<user_id>', methods=['PATCH'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('users', PERMISSIONS_CACHE_TAG)
 def update_user(user_id):
     """Kullanıcıyı güncelle"""
     try:
@@ -441,8 +421,8 @@ def update_user(user_id):
         
         # Şifre güncellemesi (opsiyonel)
         if data.get('password'):
-            update_fields.append("password_hash = crypt(%s, gen_salt('bf'))")
-            params.append(data['password'])
+            update_fields.append("password_hash = %s")
+            params.append(hash_password(data['password']))
         
         if not update_fields:
             return jsonify({'error': 'Güncellenecek alan bulunamadı'}), 400
@@ -474,7 +454,9 @@ def update_user(user_id):
                 'full_name': result['full_name']
             }
         }), 200
-        
+
+    except PasswordVerifierBusy:
+        return jsonify({'error': 'Sunucu yoğun, lütfen tekrar deneyin'}), 503, {'Retry-After': str(BUSY_RETRY_AFTER)}
     except Exception as e:
         print(f"Error updating user: {str(e)}")
         return jsonify({'error': f'Bir hata oluştu: {str(e)}'}), 500
@@ -483,6 +465,7 @@ def update_user(user_id):
 @users_bp.route('/<user_id>', methods=['DELETE'])
 @token_required
 @role_required(['yonetici'])
+@invalidates_cache('users', PERMISSIONS_CACHE_TAG)
 def delete_user(user_id):
     """Kullanıcıyı sil (soft delete)"""
     try:
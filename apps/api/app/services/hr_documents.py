@@ -13,6 +13,7 @@ from werkzeug.utils import secure_filename
 from psycopg2.extras import RealDictRow, Json
 
 from app.models.database import (
+    bulk_insert,
     execute_query,
     execute_query_one,
     execute_write,
@@ -1153,41 +1154,37 @@ def sync_requirement_documents(
         )
 
     total_users = len(user_rows or [])
-    created_count = 0
-    skipped = 0
-
-    for row in user_rows or []:
-        user_id = row["id"]
-        existing = get_employee_document_by_scope(
-            user_id,
-            document_type_id,
-            requirement_id,
-        )
-        if existing:
-            skipped += 1
-            continue
 
-        execute_write(
-            """
-            INSERT INTO hr_employee_documents (
-                user_id,
-                document_type_id,
-                requirement_id,
-                status,
-                created_by,
-                updated_by
-            )
-            VALUES (%s, %s, %s, 'missing', %s, %s)
-            """,
-            (
-                str(user_id),
-                str(document_type_id),
-                str(requirement_id),
-                str(initiated_by) if initiated_by else None,
-                str(initiated_by) if initiated_by else None,
-            ),
+    existing_rows = execute_query(
+        """
+        SELECT user_id
+        FROM hr_employee_documents
+        WHERE document_type_id = %s
+          AND requirement_id = %s
+        """,
+        (str(document_type_id), str(requirement_id)),
+    )
+    existing_user_ids = {str(row["user_id"]) for row in existing_rows or []}
+
+    new_rows = [
+        (
+            str(row["id"]),
+            str(document_type_id),
+            str(requirement_id),
+            "missing",
+            str(initiated_by) if initiated_by else None,
+            str(initiated_by) if initiated_by else None,
         )
-        created_count += 1
+        for row in user_rows or []
+        if str(row["id"]) not in existing_user_ids
+    ]
+    bulk_insert(
+        "hr_employee_documents",
+        ["user_id", "document_type_id", "requirement_id", "status", "created_by", "updated_by"],
+        new_rows,
+    )
+    created_count = len(new_rows)
+    skipped = total_users - created_count
 
     return {
         "requirement_id": str(requirement_id),
@@ -1471,6 +1468,30 @@ def _read_file_from_storage(file_row: DocumentRow) -> bytes:
     return data
 
 
+# hr_document_import_items kolonları ve tek INSERT'te yazılan satır sayısı
+_IMPORT_ITEM_COLUMNS = [
+    "import_job_id",
+    "line_number",
+    "employee_identifier",
+    "document_type_code",
+    "requirement_id",
+    "matched_user_id",
+    "status",
+    "error_message",
+    "generated_document_id",
+    "generated_version_id",
+    "metadata",
+]
+_IMPORT_ITEM_BATCH_SIZE = 200
+
+
+def _flush_import_items(import_items: List[tuple]) -> None:
+    """Biriken satır kayıtlarını yaz ve listeyi boşalt"""
+    if import_items:
+        bulk_insert("hr_document_import_items", _IMPORT_ITEM_COLUMNS, import_items)
+        import_items.clear()
+
+
 def process_import_job(
     job_id: UUID,
     initiated_by: Optional[UUID] = None,
@@ -1532,6 +1553,7 @@ def process_import_job(
     processed = 0
     zip_handle = None
     archive_map: Dict[str, zipfile.ZipInfo] = {}
+    import_items: List[tuple] = []
 
     try:
         csv_bytes = _read_file_from_storage(csv_file)
@@ -1566,6 +1588,7 @@ def process_import_job(
             generated_doc_id = None
             generated_version_id = None
             matched_user_id = None
+            requirement_id = None
 
             metadata = {
                 "file_name": file_name,
@@ -1755,23 +1778,7 @@ def process_import_job(
                 error_message = str(row_exc)
                 failure_count += 1
             finally:
-                execute_write(
-                    """
-                    INSERT INTO hr_document_import_items (
-                        import_job_id,
-                        line_number,
-                        employee_identifier,
-                        document_type_code,
-                        requirement_id,
-                        matched_user_id,
-                        status,
-                        error_message,
-                        generated_document_id,
-                        generated_version_id,
-                        metadata
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
+                import_items.append(
                     (
                         str(job_id),
                         idx,
@@ -1783,10 +1790,16 @@ def process_import_job(
                         error_message,
                         str(generated_doc_id) if generated_doc_id else None,
                         str(generated_version_id) if generated_version_id else None,
-                        metadata,
-                    ),
+                        Json(metadata),
+                    )
                 )
 
+            # Sabit boyutlu partiler: iş yarıda kesilirse yazılmış kayıtlar kalır
+            if len(import_items) >= _IMPORT_ITEM_BATCH_SIZE:
+                _flush_import_items(import_items)
+
+        _flush_import_items(import_items)
+
         final_status = "completed" if failure_count == 0 else "completed"
         if success_count == 0 and failure_count > 0:
             final_status = "failed"
@@ -1826,6 +1839,12 @@ def process_import_job(
 
         return rows[0] if rows else job
     except Exception as exc:
+        # İşlenmiş satırların kayıtları kaybolmasın
+        try:
+            _flush_import_items(import_items)
+        except Exception as flush_exc:
+            print(f"Error saving import items: {str(flush_exc)}")
+
         summary.update(
             {
                 "last_error": str(exc),
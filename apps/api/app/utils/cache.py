@@ -1,30 +1,531 @@
 """
 Simple TTL-based caching utility for Flask routes
-Provides in-memory caching with time-to-live (TTL) support
+Provides TTL caching on a pluggable backend:
+in-process memory (default) or Redis (shared across gunicorn workers)
 """
 
 import time
 import hashlib
 import json
+import pickle
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Any, Callable, Optional
+from itertools import islice
+from typing import Any, Callable, NamedTuple, Optional
 import logging
 
+from flask import copy_current_request_context, current_app, g, has_app_context, has_request_context, request
+
+from app.config import Config
+
 logger = logging.getLogger(__name__)
 
-# Simple in-memory cache store
-_cache_store = {}
+# Simple in-memory cache store (used by the memory backend, kept in LRU order)
+_cache_store = OrderedDict()
+
+# Returned by backends on a cache miss (None is a valid cached value)
+_MISS = object()
+
+# Expired entries checked from the LRU end on every write (amortized cleanup)
+_EXPIRY_SWEEP_SIZE = 16
 
 
 class CacheEntry:
     """Cache entry with TTL"""
 
-    def __init__(self, value: Any, ttl: int):
+    __slots__ = ('value', 'expires_at', 'size')
+
+    def __init__(self, value: Any, ttl: int, size: int = 0):
         self.value = value
         self.expires_at = time.time() + ttl
+        self.size = size
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) > self.expires_at
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Rough memory footprint of a cached value in bytes
+    Exact for bytes/str payloads, shallow-recursive for containers
+    """
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+class CacheBackend:
+    """Storage interface used by the cache decorators"""
+
+    name = 'base'
+    # True if every worker sees the same entries and tag versions
+    shared = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any:
+        """Return the cached value or _MISS"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: int):
+        raise NotImplementedError
+
+    def clear(self) -> int:
+        raise NotImplementedError
+
+    def clear_prefix(self, prefix: str) -> int:
+        raise NotImplementedError
+
+    def clear_expired(self) -> int:
+        raise NotImplementedError
+
+    def info(self, prefix: Optional[str] = None) -> dict:
+        raise NotImplementedError
+
+    def get_tag_versions(self, tags) -> Optional[list]:
+        """Current version of each tag, or None if unavailable (caching is skipped)"""
+        raise NotImplementedError
+
+    def bump_tags(self, tags):
+        """Invalidate every entry that was cached under these tags"""
+        raise NotImplementedError
+
+    def get_tag_token(self, tag: str) -> Optional[str]:
+        """
+        Opaque version of a tag that never repeats, even if the counter is lost
+        (cache clear, Redis restart, eviction). Safe to embed in long-lived tokens.
+        None if unavailable.
+        """
+        raise NotImplementedError
+
+    def acquire_lock(self, key: str, timeout: float):
+        """
+        Cross-process compute lock for a key
+        Returns a handle for release_lock, or None if another process holds it
+        """
+        return True
+
+    def release_lock(self, handle):
+        pass
+
+    def _counters(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else None
+        }
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process bounded LRU store (each gunicorn worker has its own copy)
+    Bounded by entry count and estimated bytes; least recently used entries are evicted.
+    Expired entries are dropped lazily on read and in small batches on every write,
+    so no cleanup thread is needed.
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        super().__init__()
+        self.max_entries = max_entries or Config.CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or Config.CACHE_MAX_BYTES
+        self.evictions = 0
+        self.expirations = 0
+        self._bytes = 0
+        self._tag_versions = {}
+        # Tag versions live only as long as this process
+        self._epoch = uuid.uuid4().hex
+        self._lock = threading.Lock()
+
+    def _remove(self, key: str):
+        entry = _cache_store.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        return entry
+
+    def _sweep_expired(self, now: float):
+        """Drop expired entries from the least recently used end"""
+        for key in list(islice(_cache_store.keys(), _EXPIRY_SWEEP_SIZE)):
+            entry = _cache_store.get(key)
+            if entry is not None and entry.is_expired(now):
+                self._remove(key)
+                self.expirations += 1
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = _cache_store.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISS
+            if entry.is_expired():
+                logger.debug(f"Cache EXPIRED: {key}")
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return _MISS
+            _cache_store.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: int):
+        size = estimate_size(value) + sys.getsizeof(key)
+        if size > self.max_bytes:
+            logger.debug(f"Cache entry too large to store: {key} ({size} bytes)")
+            return
+
+        with self._lock:
+            now = time.time()
+            self._remove(key)
+            _cache_store[key] = CacheEntry(value, ttl, size)
+            self._bytes += size
+
+            self._sweep_expired(now)
+            while len(_cache_store) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(_cache_store))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(_cache_store)
+            _cache_store.clear()
+            self._bytes = 0
+        return count
+
+    def clear_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys_to_delete = [k for k in _cache_store.keys() if k.startswith(prefix)]
+            for key in keys_to_delete:
+                self._remove(key)
+        return len(keys_to_delete)
+
+    def clear_expired(self) -> int:
+        with self._lock:
+            now = time.time()
+            keys_to_delete = [k for k, v in _cache_store.items() if v.is_expired(now)]
+            for key in keys_to_delete:
+                self._remove(key)
+            self.expirations += len(keys_to_delete)
+        return len(keys_to_delete)
+
+    def info(self, prefix: Optional[str] = None) -> dict:
+        with self._lock:
+            now = time.time()
+            if prefix:
+                entries = [v for k, v in _cache_store.items() if k.startswith(prefix)]
+            else:
+                entries = list(_cache_store.values())
+            total_bytes = self._bytes
+
+        expired = sum(1 for v in entries if v.is_expired(now))
+
+        stats = {
+            'total_entries': len(entries),
+            'active_entries': len(entries) - expired,
+            'expired_entries': expired,
+            'bytes': sum(v.size for v in entries) if prefix else total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+        stats.update(self._counters())
+        return stats
+
+    def get_tag_versions(self, tags) -> Optional[list]:
+        with self._lock:
+            return [self._tag_versions.get(tag, 0) for tag in tags]
+
+    def bump_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    def get_tag_token(self, tag: str) -> Optional[str]:
+        with self._lock:
+            return f"{self._epoch}:{self._tag_versions.get(tag, 0)}"
+
+
+# Each tag counter is paired with a random epoch. Whenever the counter is (re)created the
+# epoch is replaced, so an epoch:counter pair handed out earlier can never come back.
+_BUMP_TAG_SCRIPT = """
+local version = redis.call('INCR', KEYS[1])
+if version == 1 or redis.call('EXISTS', KEYS[2]) == 0 then
+    redis.call('SET', KEYS[2], ARGV[1])
+end
+return version
+"""
+
+_TAG_TOKEN_SCRIPT = """
+local version = redis.call('GET', KEYS[1])
+local epoch = redis.call('GET', KEYS[2])
+if not version or not epoch then
+    epoch = ARGV[1]
+    redis.call('SET', KEYS[2], epoch)
+    version = redis.call('INCR', KEYS[1])
+end
+return {epoch, tonumber(version)}
+"""
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis store shared by all workers
+    Values are pickled; keys are namespaced with CACHE_KEY_NAMESPACE.
+    Redis errors are logged and treated as a miss so the API keeps serving.
+    """
+
+    name = 'redis'
+    shared = True
+
+    def __init__(self, url: str, namespace: str = ''):
+        import redis
+
+        super().__init__()
+        self._redis = redis.Redis.from_url(
+            url,
+            socket_timeout=Config.CACHE_REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=Config.CACHE_REDIS_SOCKET_TIMEOUT
+        )
+        self._namespace = namespace
+        self._errors = redis.RedisError
+        self._bump_script = self._redis.register_script(_BUMP_TAG_SCRIPT)
+        self._token_script = self._redis.register_script(_TAG_TOKEN_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return f"{self._namespace}{key}"
+
+    def _scan(self, prefix: str = ''):
+        return self._redis.scan_iter(match=f"{self._namespace}{prefix}*", count=500)
+
+    def _delete_matching(self, prefix: str) -> int:
+        # Tag counters/epochs are never cleared: a reset version could match old entries or tokens
+        protected = self._tag_key('').encode()
+        count = 0
+        batch = []
+        for key in self._scan(prefix):
+            if key.startswith(protected):
+                continue
+            batch.append(key)
+            if len(batch) >= 500:
+                count += self._redis.delete(*batch)
+                batch = []
+        if batch:
+            count += self._redis.delete(*batch)
+        return count
+
+    def get(self, key: str) -> Any:
+        try:
+            raw = self._redis.get(self._key(key))
+        except self._errors as e:
+            logger.warning(f"Redis cache get failed: {e}")
+            return _MISS
+        if raw is None:
+            self.misses += 1
+            return _MISS
+        try:
+            value = pickle.loads(raw)
+            self.hits += 1
+            return value
+        except Exception as e:
+            logger.warning(f"Failed to decode cache entry {key}: {e}")
+            return _MISS
+
+    def set(self, key: str, value: Any, ttl: int):
+        try:
+            raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Value for {key} is not cacheable: {e}")
+            return
+        try:
+            self._redis.set(self._key(key), raw, ex=max(1, int(ttl)))
+        except self._errors as e:
+            logger.warning(f"Redis cache set failed: {e}")
+
+    def clear(self) -> int:
+        try:
+            return self._delete_matching('')
+        except self._errors as e:
+            logger.warning(f"Redis cache clear failed: {e}")
+            return 0
+
+    def clear_prefix(self, prefix: str) -> int:
+        try:
+            return self._delete_matching(prefix)
+        except self._errors as e:
+            logger.warning(f"Redis cache clear failed: {e}")
+            return 0
+
+    def clear_expired(self) -> int:
+        # Redis expires keys itself
+        return 0
+
+    def info(self, prefix: Optional[str] = None) -> dict:
+        try:
+            total = sum(1 for _ in self._scan(prefix or ''))
+        except self._errors as e:
+            logger.warning(f"Redis cache info failed: {e}")
+            return {'total_entries': 0, 'active_entries': 0, 'expired_entries': 0, 'error': str(e)}
+
+        stats = {
+            'total_entries': total,
+            'active_entries': total,
+            'expired_entries': 0
+        }
+        # Hit/miss counters are per worker
+        stats.update(self._counters())
+        return stats
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._namespace}tag:{tag}"
+
+    def get_tag_versions(self, tags) -> Optional[list]:
+        try:
+            values = self._redis.mget([self._tag_key(tag) for tag in tags])
+        except self._errors as e:
+            logger.warning(f"Redis tag lookup failed: {e}")
+            return None
+        return [int(v) if v is not None else 0 for v in values]
+
+    def acquire_lock(self, key: str, timeout: float):
+        try:
+            lock = self._redis.lock(f"{self._namespace}lock:{key}", timeout=timeout, blocking=False)
+            return lock if lock.acquire() else None
+        except self._errors as e:
+            logger.warning(f"Redis lock failed for {key}: {e}")
+            # Fail open: compute locally rather than block
+            return True
+
+    def release_lock(self, handle):
+        if handle is True:
+            return
+        try:
+            handle.release()
+        except Exception as e:
+            # Lock expired (computation took longer than its timeout) or Redis is down
+            logger.debug(f"Redis lock release failed: {e}")
+
+    def bump_tags(self, tags):
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for tag in tags:
+                key = self._tag_key(tag)
+                self._bump_script(keys=[key, f"{key}:epoch"], args=[uuid.uuid4().hex], client=pipe)
+            pipe.execute()
+        except self._errors as e:
+            logger.warning(f"Redis tag invalidation failed for {list(tags)}: {e}")
+
+    def get_tag_token(self, tag: str) -> Optional[str]:
+        key = self._tag_key(tag)
+        try:
+            epoch, version = self._token_script(keys=[key, f"{key}:epoch"], args=[uuid.uuid4().hex])
+        except self._errors as e:
+            logger.warning(f"Redis tag token lookup failed for {tag}: {e}")
+            return None
+        if isinstance(epoch, bytes):
+            epoch = epoch.decode()
+        return f"{epoch}:{int(version)}"
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _create_backend() -> CacheBackend:
+    if Config.CACHE_BACKEND == 'redis':
+        try:
+            backend = RedisCacheBackend(Config.CACHE_REDIS_URL, Config.CACHE_KEY_NAMESPACE)
+            logger.info("Using Redis cache backend")
+            return backend
+        except ImportError:
+            logger.warning("CACHE_BACKEND=redis but the redis package is not installed, using memory cache")
+        except Exception as e:
+            logger.warning(f"Failed to create Redis cache backend, using memory cache: {e}")
+    elif Config.CACHE_BACKEND != 'memory':
+        logger.warning(f"Unknown CACHE_BACKEND '{Config.CACHE_BACKEND}', using memory cache")
+
+    return MemoryCacheBackend()
+
+
+def get_cache_backend() -> CacheBackend:
+    """Return the configured cache backend (created on first use)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend):
+    """Replace the cache backend (e.g. for scripts or tests)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+class CachedResponse(NamedTuple):
+    """Serialized route response as stored in the cache"""
+    body: bytes
+    status: int
+    content_type: str
+    etag: str
+    headers: list
+
+
+# Bump when CachedResponse changes so old entries in shared backends are ignored
+_ROUTE_CACHE_FORMAT = 2
+
+# Headers rebuilt from CachedResponse fields instead of being copied
+_DERIVED_HEADERS = {'content-length', 'content-type', 'etag'}
+
+
+def _freeze_response(result) -> Optional[CachedResponse]:
+    """
+    Convert a route result into body bytes + metadata
+    Returns None for non-2xx or streamed responses, which are not cached
+    """
+    response = current_app.make_response(result)
+    if response.status_code < 200 or response.status_code >= 300 or response.is_streamed:
+        return None
 
-    def is_expired(self) -> bool:
-        return time.time() > self.expires_at
+    body = response.get_data()
+    headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _DERIVED_HEADERS]
+    etag = hashlib.sha1(body).hexdigest()[:32]
+    return CachedResponse(body, response.status_code, response.content_type, etag, headers)
+
+
+def _thaw_response(cached: CachedResponse):
+    """Build a fresh response from cached bytes (304 if the client already has them)"""
+    if cached.etag in request.if_none_match:
+        response = current_app.response_class(status=304, headers=cached.headers)
+    else:
+        response = current_app.response_class(
+            cached.body, status=cached.status, headers=cached.headers,
+            content_type=cached.content_type
+        )
+    response.set_etag(cached.etag)
+    # Browser may keep the body but must revalidate (cheap 304 on a cache hit)
+    if 'Cache-Control' not in response.headers:
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 def generate_cache_key(prefix: str, *args, **kwargs) -> str:
@@ -54,16 +555,251 @@ def generate_cache_key(prefix: str, *args, **kwargs) -> str:
         return f"{prefix}:{time.time()}"
 
 
-def cache_with_ttl(ttl: int = 60, key_prefix: Optional[str] = None):
+def _tagged_key(backend: CacheBackend, cache_key: str, tags) -> Optional[str]:
+    """
+    Append current tag versions to a cache key
+    Bumping a tag changes the key, so older entries are never read again
+    and age out through TTL/LRU. Returns None if versions are unavailable.
+    """
+    if not tags:
+        return cache_key
+    versions = backend.get_tag_versions(tags)
+    if versions is None:
+        return None
+    return f"{cache_key}@" + ','.join(str(v) for v in versions)
+
+
+def invalidate_cache_tags(*tags: str):
+    """
+    Invalidate all cache entries depending on the given tags
+
+    Usage:
+        invalidate_cache_tags('jobs', 'job_steps')
+    """
+    if not tags:
+        return
+    get_cache_backend().bump_tags(tags)
+    logger.debug(f"Cache tags invalidated: {', '.join(tags)}")
+
+
+def _response_status(result) -> int:
+    if isinstance(result, tuple) and len(result) > 1 and isinstance(result[1], int):
+        return result[1]
+    return getattr(result, 'status_code', 200)
+
+
+def invalidates_cache(*tags: str):
+    """
+    Decorator for write routes: invalidates the given tags after a successful (<400) response
+
+    Usage:
+        @jobs_bp.route('', methods=['POST'])
+        @token_required
+        @invalidates_cache('jobs', 'job_steps')
+        def create_job():
+            ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if _response_status(result) < 400:
+                invalidate_cache_tags(*tags)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers can wait on"""
+
+    __slots__ = ('event', 'cacheable', 'value')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.cacheable = False
+        self.value = None
+
+
+_flights = {}
+_refreshing = set()
+_flights_lock = threading.Lock()
+_refresh_executor = None
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    global _refresh_executor
+    if _refresh_executor is None:
+        with _flights_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(
+                    max_workers=Config.CACHE_REFRESH_WORKERS,
+                    thread_name_prefix='cache-refresh'
+                )
+    return _refresh_executor
+
+
+def _load(backend: CacheBackend, cache_key: str):
+    """Return (value, is_fresh); value is _MISS if absent"""
+    cached = backend.get(cache_key)
+    if cached is _MISS:
+        return _MISS, False
+    fresh_until, value = cached
+    return value, time.time() < fresh_until
+
+
+def _store(backend: CacheBackend, cache_key: str, value: Any, ttl: int, stale_ttl: int):
+    # Entries live ttl + stale_ttl; past fresh_until they are served stale while refreshing
+    backend.set(cache_key, (time.time() + ttl, value), ttl + stale_ttl)
+
+
+def _single_flight(backend: CacheBackend, cache_key: str, compute: Callable):
+    """
+    Run compute() once per key; concurrent callers wait for its result
+    compute() returns (cacheable, value). Within a worker, waiters share the
+    leader's value; across workers (Redis) waiters poll the cache until the
+    lock holder has stored it.
+    """
+    with _flights_lock:
+        flight = _flights.get(cache_key)
+        leader = flight is None
+        if leader:
+            flight = _flights[cache_key] = _Flight()
+
+    timeout = Config.CACHE_LOCK_TIMEOUT
+
+    if not leader:
+        if flight.event.wait(timeout) and flight.cacheable:
+            return True, flight.value
+        return compute()
+
+    try:
+        lock = backend.acquire_lock(cache_key, timeout)
+        if lock is None:
+            deadline = time.time() + timeout
+            while time.time() < deadline:
+                time.sleep(0.05)
+                value, _ = _load(backend, cache_key)
+                if value is not _MISS:
+                    flight.cacheable, flight.value = True, value
+                    return True, value
+            logger.debug(f"Cache lock wait timed out: {cache_key}")
+
+        try:
+            flight.cacheable, flight.value = compute()
+        finally:
+            if lock is not None:
+                backend.release_lock(lock)
+        return flight.cacheable, flight.value
+    finally:
+        with _flights_lock:
+            _flights.pop(cache_key, None)
+        flight.event.set()
+
+
+def _bind_context(func: Callable) -> Callable:
+    """Make func runnable in a worker thread with the current Flask context"""
+    if has_request_context():
+        prefer_replica = g.get('_db_prefer_replica')
+
+        @copy_current_request_context
+        def run():
+            # Fresh g in the copied context; keep read replica routing
+            if prefer_replica:
+                g._db_prefer_replica = prefer_replica
+            return func()
+
+        return run
+
+    if has_app_context():
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                return func()
+
+        return run
+
+    return func
+
+
+def _refresh_in_background(cache_key: str, compute: Callable):
+    """Recompute a stale entry once, off the request thread"""
+    with _flights_lock:
+        if cache_key in _refreshing or cache_key in _flights:
+            return
+        _refreshing.add(cache_key)
+
+    bound = _bind_context(compute)
+
+    def run():
+        try:
+            bound()
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed for {cache_key}: {e}")
+        finally:
+            with _flights_lock:
+                _refreshing.discard(cache_key)
+
+    try:
+        _get_refresh_executor().submit(run)
+    except RuntimeError as e:
+        # Executor shut down (interpreter exiting)
+        with _flights_lock:
+            _refreshing.discard(cache_key)
+        logger.debug(f"Cache refresh not scheduled: {e}")
+
+
+def _get_or_compute(backend: CacheBackend, cache_key: str, compute: Callable,
+                    ttl: int, stale_ttl: int):
+    """
+    Cache lookup with single-flight on miss and stale-while-revalidate
+    compute() returns (cacheable, value). Returns (cacheable, value);
+    values read from cache are always cacheable.
+    """
+    value, fresh = _load(backend, cache_key)
+    if value is not _MISS:
+        if not fresh:
+            logger.debug(f"Cache STALE: {cache_key}")
+            _refresh_in_background(cache_key, lambda: _compute_and_store(backend, cache_key, compute, ttl, stale_ttl))
+        else:
+            logger.debug(f"Cache HIT: {cache_key}")
+        return True, value
+
+    logger.debug(f"Cache MISS: {cache_key}")
+    return _single_flight(
+        backend, cache_key,
+        lambda: _compute_and_store(backend, cache_key, compute, ttl, stale_ttl)
+    )
+
+
+def _compute_and_store(backend: CacheBackend, cache_key: str, compute: Callable,
+                       ttl: int, stale_ttl: int):
+    cacheable, value = compute()
+    if cacheable:
+        _store(backend, cache_key, value, ttl, stale_ttl)
+    return cacheable, value
+
+
+def cache_with_ttl(ttl: int = 60, key_prefix: Optional[str] = None, tags: tuple = (),
+                   stale_ttl: int = 0):
     """
     Decorator for caching function results with TTL
 
+    Concurrent misses for the same key are computed once (single-flight).
+
     Args:
         ttl: Time-to-live in seconds (default: 60)
         key_prefix: Custom cache key prefix (default: function name)
+        tags: Entities the result depends on (see invalidate_cache_tags)
+        stale_ttl: Seconds after ttl during which the old value is served
+            while a background thread refreshes it (default: 0, disabled)
 
     Usage:
-        @cache_with_ttl(ttl=300)  # 5 minutes
+        @cache_with_ttl(ttl=300, tags=('jobs',))  # 5 minutes
         def expensive_query():
             return execute_query("SELECT ...")
 
@@ -74,27 +810,18 @@ def cache_with_ttl(ttl: int = 60, key_prefix: Optional[str] = None):
 
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = generate_cache_key(cache_prefix, *args, **kwargs)
-
-            # Check cache
-            if cache_key in _cache_store:
-                entry = _cache_store[cache_key]
-                if not entry.is_expired():
-                    logger.debug(f"Cache HIT: {cache_key}")
-                    return entry.value
-                else:
-                    # Expired, remove it
-                    logger.debug(f"Cache EXPIRED: {cache_key}")
-                    del _cache_store[cache_key]
-
-            # Cache miss - execute function
-            logger.debug(f"Cache MISS: {cache_key}")
-            result = func(*args, **kwargs)
-
-            # Store in cache
-            _cache_store[cache_key] = CacheEntry(result, ttl)
+            backend = get_cache_backend()
 
+            # Generate cache key
+            cache_key = _tagged_key(backend, generate_cache_key(cache_prefix, *args, **kwargs), tags)
+            if cache_key is None:
+                return func(*args, **kwargs)
+
+            _, result = _get_or_compute(
+                backend, cache_key,
+                lambda: (True, func(*args, **kwargs)),
+                ttl, stale_ttl
+            )
             return result
 
         # Add cache control methods
@@ -108,31 +835,23 @@ def cache_with_ttl(ttl: int = 60, key_prefix: Optional[str] = None):
 
 def clear_cache():
     """Clear all cache entries"""
-    global _cache_store
-    count = len(_cache_store)
-    _cache_store = {}
+    count = get_cache_backend().clear()
     logger.info(f"Cleared {count} cache entries")
     return count
 
 
 def clear_cache_by_prefix(prefix: str):
     """Clear cache entries matching a prefix"""
-    global _cache_store
-    keys_to_delete = [k for k in _cache_store.keys() if k.startswith(prefix)]
-    for key in keys_to_delete:
-        del _cache_store[key]
-    logger.info(f"Cleared {len(keys_to_delete)} cache entries with prefix '{prefix}'")
-    return len(keys_to_delete)
+    count = get_cache_backend().clear_prefix(prefix)
+    logger.info(f"Cleared {count} cache entries with prefix '{prefix}'")
+    return count
 
 
 def clear_expired_cache():
     """Remove all expired cache entries"""
-    global _cache_store
-    keys_to_delete = [k for k, v in _cache_store.items() if v.is_expired()]
-    for key in keys_to_delete:
-        del _cache_store[key]
-    logger.debug(f"Cleared {len(keys_to_delete)} expired cache entries")
-    return len(keys_to_delete)
+    count = get_cache_backend().clear_expired()
+    logger.debug(f"Cleared {count} expired cache entries")
+    return count
 
 
 def get_cache_info(prefix: Optional[str] = None) -> dict:
@@ -145,81 +864,104 @@ def get_cache_info(prefix: Optional[str] = None) -> dict:
     Returns:
         Dict with cache stats
     """
-    if prefix:
-        entries = {k: v for k, v in _cache_store.items() if k.startswith(prefix)}
-    else:
-        entries = _cache_store
-
-    expired = sum(1 for v in entries.values() if v.is_expired())
-    active = len(entries) - expired
-
-    return {
-        'total_entries': len(entries),
-        'active_entries': active,
-        'expired_entries': expired,
-        'prefix': prefix or 'all'
-    }
-
-
-def cache_route_with_user(ttl: int = 60):
+    backend = get_cache_backend()
+    stats = backend.info(prefix)
+    stats['prefix'] = prefix or 'all'
+    stats['backend'] = backend.name
+    return stats
+
+
+def _vary_values(vary, current_user: dict) -> list:
+    """Resolve a vary policy against the current user"""
+    values = []
+    for item in vary:
+        if callable(item):
+            values.append(item(current_user))
+        elif item == 'user':
+            values.append(current_user.get('user_id'))
+        elif item == 'role':
+            values.append(current_user.get('role'))
+        else:
+            raise ValueError(f"Unknown cache vary policy: {item}")
+    return values
+
+
+def cache_route_with_user(ttl: int = 60, tags: tuple = (), stale_ttl: int = 0,
+                          vary: tuple = ('user',), args: Optional[tuple] = None,
+                          shared_ttl: Optional[int] = None, shared_stale_ttl: Optional[int] = None):
     """
     Decorator for caching Flask route results with user-specific caching
 
+    Concurrent misses for the same key are computed once (single-flight).
+
+    Args:
+        ttl: Time-to-live in seconds (default: 60)
+        tags: Entities the response depends on (see invalidates_cache)
+        stale_ttl: Seconds after ttl during which the old response is served
+            while a background thread refreshes it (default: 0, disabled)
+        vary: What besides the URL changes the response: 'user', 'role' or
+            callable(current_user) -> value. () shares one entry across all users.
+            Only drop 'user' if the SQL really does not depend on the caller.
+        args: Query args that change the response (default: all of them);
+            others (e.g. cache busters) are ignored
+        shared_ttl / shared_stale_ttl: Used instead of ttl / stale_ttl when the
+            backend is shared (Redis). Tag invalidation only reaches every worker
+            there; with the memory backend other workers keep serving their own
+            entry until it expires, so long TTLs must be limited to shared backends.
+
     Usage:
         @app.route('/api/data')
         @token_required
-        @cache_route_with_user(ttl=300)
+        @cache_route_with_user(ttl=300, tags=('jobs',), vary=('role',), args=('limit',))
         def get_data():
             ...
     """
 
     def decorator(func: Callable) -> Callable:
         @wraps(func)
-        def wrapper(*args, **kwargs):
+        def wrapper(*route_args, **route_kwargs):
             # Get user from request context (set by @token_required)
-            from flask import request
+            current_user = getattr(request, 'current_user', None) or {}
 
-            user_id = None
-            if hasattr(request, 'current_user'):
-                user_id = request.current_user.get('user_id')
+            if args is None:
+                query_args = request.args.to_dict()
+            else:
+                query_args = {name: request.args.get(name) for name in args}
 
-            # Generate cache key including user_id
-            cache_key = generate_cache_key(
-                func.__name__,
-                user_id,
-                request.args.to_dict(),
-                *args,
-                **kwargs
-            )
+            backend = get_cache_backend()
 
-            # Check cache
-            if cache_key in _cache_store:
-                entry = _cache_store[cache_key]
-                if not entry.is_expired():
-                    logger.debug(f"Route cache HIT: {func.__name__} (user: {user_id})")
-                    return entry.value
-                else:
-                    del _cache_store[cache_key]
-
-            # Cache miss - execute function
-            logger.debug(f"Route cache MISS: {func.__name__} (user: {user_id})")
-            result = func(*args, **kwargs)
-
-            # Store in cache
-            _cache_store[cache_key] = CacheEntry(result, ttl)
-
-            return result
+            # Generate cache key from the declared inputs only
+            cache_key = _tagged_key(backend, generate_cache_key(
+                func.__name__,
+                _ROUTE_CACHE_FORMAT,
+                _vary_values(vary, current_user),
+                query_args,
+                *route_args,
+                **route_kwargs
+            ), tags)
+            if cache_key is None:
+                return func(*route_args, **route_kwargs)
+
+            def compute():
+                result = func(*route_args, **route_kwargs)
+                # Store the encoded bytes; hits never run the view or jsonify
+                frozen = _freeze_response(result)
+                if frozen is None:
+                    return False, result
+                return True, frozen
+
+            if backend.shared and shared_ttl is not None:
+                entry_ttl = shared_ttl
+                entry_stale_ttl = stale_ttl if shared_stale_ttl is None else shared_stale_ttl
+            else:
+                entry_ttl, entry_stale_ttl = ttl, stale_ttl
+
+            cacheable, value = _get_or_compute(backend, cache_key, compute, entry_ttl, entry_stale_ttl)
+            if not cacheable:
+                return value
+            return _thaw_response(value)
 
         return wrapper
 
     return decorator
 
-
-# Scheduled cleanup task (call this periodically)
-def cleanup_cache_task():
-    """Background task to cleanup expired cache entries"""
-    while True:
-        time.sleep(60)  # Run every minute
-        cleared = clear_expired_cache()
-        if cleared > 0:
-            logger.info(f"Cache cleanup: removed {cleared} expired entries")
@@ -0,0 +1,133 @@
+"""
+Sparse fieldsets for list endpoints
+A Projection declares, per output field, the SQL columns and joins it needs and how it
+is serialized, so ?fields=a,b prunes both the SELECT list and the per-row work.
+"""
+
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from flask import request
+
+from app.utils.serializers import native_encoding
+
+
+class FieldSelectionError(ValueError):
+    """Unknown field requested; routes answer 400"""
+
+    def __init__(self, unknown):
+        self.unknown = list(unknown)
+        super().__init__(f"Unknown fields: {', '.join(self.unknown)}")
+
+
+class Field(NamedTuple):
+    value: Callable[[dict], Any]
+    columns: Tuple[str, ...] = ()
+    joins: Tuple[str, ...] = ()
+
+
+class Projection:
+    """
+    Ordered set of selectable fields for one entity
+
+    Column and join SQL may contain str.format placeholders filled per request
+    (e.g. a table alias that depends on the schema).
+    """
+
+    def __init__(self, fields: Dict[str, Field], joins: Optional[Dict[str, str]] = None,
+                 required_columns: Sequence[str] = (), default: Optional[Sequence[str]] = None):
+        self.fields = dict(fields)
+        self.joins = dict(joins or {})
+        self.required_columns = tuple(required_columns)
+        self.default = tuple(default) if default is not None else tuple(self.fields)
+
+    def parse(self, raw: Optional[str], include: Optional[str] = None) -> Tuple[str, ...]:
+        """
+        Resolve ?fields= (replaces the default set) and ?include= (adds to it)
+
+        Returns the selected names in declaration order.
+        """
+        selected = set(_split(raw)) if raw else set(self.default)
+        selected.update(_split(include))
+        unknown = sorted(selected - set(self.fields))
+        if unknown:
+            raise FieldSelectionError(unknown)
+        return tuple(name for name in self.fields if name in selected)
+
+    def is_full(self, names: Sequence[str]) -> bool:
+        return len(names) == len(self.fields)
+
+    def select_sql(self, names: Sequence[str], **fmt) -> str:
+        columns = list(self.required_columns)
+        for name in names:
+            columns.extend(self.fields[name].columns)
+        return ',\n'.join(_unique(column.format(**fmt) for column in columns))
+
+    def join_sql(self, names: Sequence[str], **fmt) -> str:
+        needed = set()
+        for name in names:
+            needed.update(self.fields[name].joins)
+        return '\n'.join(sql.format(**fmt) for key, sql in self.joins.items() if key in needed)
+
+    def serializer(self, names: Sequence[str], native: Optional[bool] = None) -> Callable[[dict], dict]:
+        """
+        Row -> dict closure (also usable with stream_json_list)
+
+        With a native encoder (orjson provider) datetime/UUID values are passed through
+        raw and encoded in C; otherwise they are converted here.
+        """
+        if native is None:
+            native = native_encoding()
+        getters = []
+        for name in names:
+            value = self.fields[name].value
+            if native:
+                value = getattr(value, 'native', value)
+            getters.append((name, value))
+        return lambda row: {name: value(row) for name, value in getters}
+
+    def serialize(self, row: dict, names: Sequence[str]) -> dict:
+        return self.serializer(names)(row)
+
+
+def requested_fields(projection: Projection, param: str = 'fields',
+                     include_param: Optional[str] = 'include') -> Tuple[str, ...]:
+    """Parse the projection from the current request's query string"""
+    include = request.args.get(include_param) if include_param else None
+    return projection.parse(request.args.get(param), include)
+
+
+def _split(value: Optional[str]):
+    return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+
+def _unique(items):
+    seen = set()
+    result = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+    return result
+
+
+# Value helpers shared by projections
+# .native is the cheaper getter used when the encoder handles the raw type itself
+
+def _raw(key: str) -> Callable[[dict], Any]:
+    return lambda row: row.get(key) or None
+
+
+def iso(key: str) -> Callable[[dict], Optional[str]]:
+    value = lambda row: row[key].isoformat() if row.get(key) else None
+    value.native = _raw(key)
+    return value
+
+
+def text_id(key: str) -> Callable[[dict], Optional[str]]:
+    value = lambda row: str(row[key]) if row.get(key) else None
+    value.native = _raw(key)
+    return value
+
+
+def column(key: str, default: Any = None) -> Callable[[dict], Any]:
+    return lambda row: row.get(key, default)
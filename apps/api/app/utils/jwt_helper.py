@@ -1,9 +1,25 @@
 import jwt
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from app.config import Config
 
-def generate_token(user_id, username, role):
-    """JWT token oluştur"""
+# Doğrulanmış token cache'i: sha256(token) -> (exp, payload)
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+_token_cache_hits = 0
+_token_cache_misses = 0
+
+def generate_token(user_id, username, role, permissions=None, permissions_version=None):
+    """
+    JWT token oluştur
+
+    Args:
+        permissions: Opsiyonel yetki claim'i {resource: bitmask} (bkz. permission_required)
+        permissions_version: Claim'in üretildiği andaki yetki versiyonu
+    """
     payload = {
         'user_id': str(user_id),
         'username': username,
@@ -11,16 +27,73 @@ def generate_token(user_id, username, role):
         'exp': datetime.utcnow() + timedelta(hours=Config.JWT_EXPIRATION_HOURS),
         'iat': datetime.utcnow()
     }
+
+    if permissions is not None and permissions_version is not None:
+        payload['perm'] = permissions
+        payload['pv'] = permissions_version
     
     token = jwt.encode(payload, Config.JWT_SECRET_KEY, algorithm=Config.JWT_ALGORITHM)
     return token
 
-def decode_token(token):
-    """JWT token'ı decode et"""
+def _verify_token(token):
+    """JWT imzasını doğrula ve payload'ı döndür"""
     try:
         payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=[Config.JWT_ALGORITHM])
         return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
-        return None
\ No newline at end of file
+        return None
+
+
+def decode_token(token):
+    """
+    JWT token'ı decode et
+
+    Doğrulanmış payload'lar token digest'i ile küçük bir LRU'da exp zamanına kadar
+    tutulur; polling yapan istemciler her istekte imza doğrulaması yapmaz.
+    Geçersiz token'lar cache'lenmez.
+    """
+    global _token_cache_hits, _token_cache_misses
+
+    if Config.JWT_DECODE_CACHE_SIZE <= 0:
+        return _verify_token(token)
+
+    digest = hashlib.sha256(token.encode() if isinstance(token, str) else token).digest()
+    now = time.time()
+
+    with _token_cache_lock:
+        cached = _token_cache.get(digest)
+        if cached is not None:
+            expires_at, payload = cached
+            if now < expires_at:
+                _token_cache.move_to_end(digest)
+                _token_cache_hits += 1
+                # Kopya: request.current_user üzerinde yapılan değişiklikler cache'e sızmasın
+                return dict(payload)
+            del _token_cache[digest]
+        _token_cache_misses += 1
+
+    payload = _verify_token(token)
+    if payload is None or 'exp' not in payload:
+        return payload
+
+    with _token_cache_lock:
+        _token_cache[digest] = (float(payload['exp']), payload)
+        while len(_token_cache) > Config.JWT_DECODE_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+    return dict(payload)
+
+
+def get_token_cache_info():
+    """Decode cache istatistikleri"""
+    with _token_cache_lock:
+        lookups = _token_cache_hits + _token_cache_misses
+        return {
+            'entries': len(_token_cache),
+            'max_entries': Config.JWT_DECODE_CACHE_SIZE,
+            'hits': _token_cache_hits,
+            'misses': _token_cache_misses,
+            'hit_ratio': round(_token_cache_hits / lookups, 3) if lookups else None
+        }
\ No newline at end of file
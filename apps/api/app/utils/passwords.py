@@ -0,0 +1,138 @@
+"""
+Password hashing and verification on the API tier
+bcrypt runs in a bounded thread pool instead of Postgres crypt(), so login bursts
+spend app CPU (bounded by PASSWORD_HASH_WORKERS) rather than contended DB CPU
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import logging
+
+import bcrypt
+
+from app.config import Config
+from app.models.connection_pool import Histogram
+
+logger = logging.getLogger(__name__)
+
+_BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(Config.PASSWORD_VERIFY_MAX_PENDING)
+
+_stats_lock = threading.Lock()
+_verify_latency = Histogram()
+_queue_wait = Histogram()
+_counters = {'verified': 0, 'mismatched': 0, 'rejected': 0, 'timeouts': 0, 'hashed': 0}
+
+
+# Seconds clients are told to wait (Retry-After) when the pool is busy
+BUSY_RETRY_AFTER = 1
+
+
+class PasswordVerifierBusy(Exception):
+    """Too many verifications pending; caller should answer 503 with Retry-After"""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix='password-hash'
+                )
+    return _executor
+
+
+def is_bcrypt_hash(password_hash) -> bool:
+    return bool(password_hash) and password_hash.startswith(_BCRYPT_PREFIXES)
+
+
+def _submit(func, *args):
+    """Run func in the hash pool, bounded by PASSWORD_VERIFY_MAX_PENDING"""
+    if not _slots.acquire(blocking=False):
+        with _stats_lock:
+            _counters['rejected'] += 1
+        raise PasswordVerifierBusy('Too many password verifications in progress')
+
+    submitted = time.perf_counter()
+
+    def run():
+        # The slot is held until the hash finishes, even if the caller timed out
+        try:
+            with _stats_lock:
+                _queue_wait.observe(time.perf_counter() - submitted)
+            return func(*args)
+        finally:
+            _slots.release()
+
+    try:
+        future = _get_executor().submit(run)
+    except Exception:
+        _slots.release()
+        raise
+
+    try:
+        return future.result(timeout=Config.PASSWORD_VERIFY_TIMEOUT)
+    except FutureTimeout:
+        with _stats_lock:
+            _counters['timeouts'] += 1
+        raise PasswordVerifierBusy('Password verification timed out')
+
+
+def _checkpw(password: str, password_hash: str) -> bool:
+    started = time.perf_counter()
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    except ValueError:
+        # Malformed hash
+        return False
+    finally:
+        with _stats_lock:
+            _verify_latency.observe(time.perf_counter() - started)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """
+    Check a password against a bcrypt hash (Postgres crypt(..., gen_salt('bf')) compatible)
+
+    Raises:
+        PasswordVerifierBusy: queue is full or the check timed out
+        ValueError: hash is not bcrypt (callers may fall back to the database)
+    """
+    if not is_bcrypt_hash(password_hash):
+        raise ValueError('Unsupported password hash format')
+
+    matched = _submit(_checkpw, password, password_hash)
+    with _stats_lock:
+        _counters['verified' if matched else 'mismatched'] += 1
+    return matched
+
+
+def hash_password(password: str) -> str:
+    """bcrypt hash with PASSWORD_BCRYPT_ROUNDS cost, computed in the hash pool"""
+    def _hash():
+        salt = bcrypt.gensalt(rounds=Config.PASSWORD_BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    password_hash = _submit(_hash)
+    with _stats_lock:
+        _counters['hashed'] += 1
+    return password_hash
+
+
+def get_password_stats() -> dict:
+    """Verification counters and latency histograms"""
+    with _stats_lock:
+        return {
+            'workers': Config.PASSWORD_HASH_WORKERS,
+            'max_pending': Config.PASSWORD_VERIFY_MAX_PENDING,
+            'bcrypt_rounds': Config.PASSWORD_BCRYPT_ROUNDS,
+            **_counters,
+            'verify_latency': _verify_latency.snapshot(),
+            'queue_wait': _queue_wait.snapshot()
+        }
@@ -0,0 +1,181 @@
+"""
+Query-level instrumentation for database helpers
+Times every query, attributes it to the Flask endpoint, keeps per-request
+counters and an aggregated top-N view, and logs slow queries
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+import logging
+
+from flask import g, has_app_context, has_request_context, request
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+_COMMENT_RE = re.compile(r'--[^\n]*')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s|%\(\w+\)s|\$\d+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Aggregates: normalized SQL -> stats
+_MAX_FINGERPRINTS = 500
+_OVERFLOW_KEY = '<other>'
+_query_stats = {}
+_slow_queries = deque(maxlen=50)
+_stats_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """
+    Collapse a SQL statement into a fingerprint:
+    comments removed, literals and placeholders replaced with ?, whitespace collapsed
+    """
+    text = _COMMENT_RE.sub(' ', query)
+    text = _STRING_RE.sub('?', text)
+    text = _PLACEHOLDER_RE.sub('?', text)
+    text = _NUMBER_RE.sub('?', text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def params_shape(params) -> str:
+    """Describe parameters by type only (never log values)"""
+    if params is None:
+        return '()'
+    if isinstance(params, dict):
+        return '{' + ', '.join(f'{k}: {_value_shape(v)}' for k, v in sorted(params.items())) + '}'
+    if isinstance(params, (list, tuple)):
+        return '(' + ', '.join(_value_shape(v) for v in params) + ')'
+    return _value_shape(params)
+
+
+def _value_shape(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return f'{type(value).__name__}[{len(value)}]'
+    return type(value).__name__
+
+
+def _current_endpoint() -> str:
+    if has_request_context():
+        return request.endpoint or request.path
+    return '<no-request>'
+
+
+def record_query(query, params, duration: float, rows: int = None):
+    """
+    Record one executed statement
+
+    Args:
+        query: SQL text as sent by the helper
+        params: Query parameters (only their shape is kept)
+        duration: Execution time in seconds
+        rows: Optional number of rows returned/affected
+    """
+    duration_ms = duration * 1000.0
+    fingerprint = normalize_sql(query if isinstance(query, str) else str(query))
+    endpoint = _current_endpoint()
+
+    if has_app_context():
+        g._db_query_count = g.get('_db_query_count', 0) + 1
+        g._db_time_ms = g.get('_db_time_ms', 0.0) + duration_ms
+
+    with _stats_lock:
+        key = fingerprint
+        if key not in _query_stats and len(_query_stats) >= _MAX_FINGERPRINTS:
+            key = _OVERFLOW_KEY
+        stats = _query_stats.get(key)
+        if stats is None:
+            stats = _query_stats[key] = {
+                'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'endpoints': {}
+            }
+        stats['calls'] += 1
+        stats['total_ms'] += duration_ms
+        if duration_ms > stats['max_ms']:
+            stats['max_ms'] = duration_ms
+        if rows is not None and rows > 0:
+            stats['rows'] += rows
+        stats['endpoints'][endpoint] = stats['endpoints'].get(endpoint, 0) + 1
+
+    if duration_ms >= Config.SLOW_QUERY_THRESHOLD_MS:
+        shape = params_shape(params)
+        with _stats_lock:
+            _slow_queries.append({
+                'at': time.time(),
+                'endpoint': endpoint,
+                'duration_ms': round(duration_ms, 2),
+                'sql': fingerprint,
+                'params': shape
+            })
+        logger.warning(
+            f"Slow query ({duration_ms:.1f} ms) in {endpoint}: {fingerprint} params={shape}"
+        )
+
+
+def get_query_stats(limit: int = 20, order_by: str = 'total_ms') -> dict:
+    """
+    Top-N aggregated queries
+
+    Args:
+        limit: Number of fingerprints to return
+        order_by: total_ms, calls, max_ms or avg_ms
+    """
+    with _stats_lock:
+        snapshot = [
+            (sql, dict(stats, endpoints=dict(stats['endpoints'])))
+            for sql, stats in _query_stats.items()
+        ]
+        slow = list(_slow_queries)
+
+    items = []
+    for sql, stats in snapshot:
+        top_endpoints = sorted(stats['endpoints'].items(), key=lambda item: item[1], reverse=True)[:5]
+        items.append({
+            'sql': sql,
+            'calls': stats['calls'],
+            'total_ms': round(stats['total_ms'], 2),
+            'avg_ms': round(stats['total_ms'] / stats['calls'], 2) if stats['calls'] else 0,
+            'max_ms': round(stats['max_ms'], 2),
+            'rows': stats['rows'],
+            'endpoints': dict(top_endpoints)
+        })
+
+    if order_by not in ('total_ms', 'calls', 'max_ms', 'avg_ms'):
+        order_by = 'total_ms'
+    items.sort(key=lambda item: item[order_by], reverse=True)
+
+    return {
+        'fingerprints': len(items),
+        'slow_query_threshold_ms': Config.SLOW_QUERY_THRESHOLD_MS,
+        'top_queries': items[:limit],
+        'recent_slow_queries': slow[::-1]
+    }
+
+
+def reset_query_stats() -> int:
+    """Clear aggregated stats; returns number of removed fingerprints"""
+    with _stats_lock:
+        count = len(_query_stats)
+        _query_stats.clear()
+        _slow_queries.clear()
+    return count
+
+
+def _add_request_timing(response):
+    """Expose per-request query count and DB time as a Server-Timing header"""
+    count = g.get('_db_query_count', 0)
+    if count:
+        total_ms = g.get('_db_time_ms', 0.0)
+        response.headers.add('Server-Timing', f'db;dur={total_ms:.1f};desc="{count} queries"')
+        logger.debug(f"{request.method} {request.path}: {count} queries, {total_ms:.1f} ms DB time")
+    return response
+
+
+def init_app(app):
+    """Register the per-request timing hook"""
+    app.after_request(_add_request_timing)
@@ -0,0 +1,105 @@
+"""
+Shared search query builder for list endpoints
+Matches against a normalized per-table document (search_normalize(), migration 031)
+backed by pg_trgm GIN indexes, so '%term%' lookups use an index instead of a seq scan.
+Falls back to plain ILIKE on the same columns until the migration is applied.
+"""
+
+from typing import Optional, Tuple
+
+from app.models.schema import has_function
+
+# Turkish-aware folding; must match search_normalize() in migrations/031_search_trgm.sql
+_FOLD_FROM = 'İIıŞşĞğÜüÖöÇçÂâÎîÛû'
+_FOLD_TO = 'iiissgguuooccaaiiuu'
+_FOLD_TABLE = str.maketrans(_FOLD_FROM, _FOLD_TO)
+
+# table -> searched columns; order must match the expression indexes in migration 031
+SEARCH_DOCUMENTS = {
+    'jobs': ('job_number', 'title'),
+    'customers': ('name', 'code'),
+    'stocks': ('product_code', 'product_name'),
+    'suppliers': ('name', 'contact_person', 'email'),
+}
+
+_MAX_TERMS = 8
+
+
+def normalize_search_text(text: str) -> str:
+    """Fold Turkish characters and case the same way search_normalize() does in SQL"""
+    return (text or '').translate(_FOLD_TABLE).lower()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def search_terms(term: str) -> list:
+    """Normalized, de-duplicated words of a search string (every word must match)"""
+    words = []
+    for word in normalize_search_text(term).split():
+        if word not in words:
+            words.append(word)
+    return words[:_MAX_TERMS]
+
+
+def search_enabled() -> bool:
+    """True once search_normalize() and the trigram indexes are installed"""
+    return has_function('search_normalize')
+
+
+def search_document(table: str, alias: Optional[str] = None) -> str:
+    """SQL expression of the indexed search document for a table"""
+    prefix = f'{alias}.' if alias else ''
+    parts = " || ' ' || ".join(
+        f"coalesce({prefix}{column}, '')" for column in SEARCH_DOCUMENTS[table]
+    )
+    return f'search_normalize({parts})'
+
+
+def search_condition(table: str, term: str, alias: Optional[str] = None) -> Tuple[str, list]:
+    """
+    WHERE fragment matching every word of term somewhere in the table's document
+
+    Returns:
+        (sql, params); sql is 'TRUE' when term has no words
+    """
+    words = search_terms(term)
+    if not words:
+        return 'TRUE', []
+
+    params = []
+    clauses = []
+    if search_enabled():
+        document = search_document(table, alias)
+        for word in words:
+            clauses.append(f'{document} LIKE %s')
+            params.append(f'%{_escape_like(word)}%')
+    else:
+        # Pre-migration: case-insensitive substring per column (not diacritic-folded)
+        prefix = f'{alias}.' if alias else ''
+        pattern = f"%{_escape_like(term.strip())}%"
+        columns = SEARCH_DOCUMENTS[table]
+        clauses.append('(' + ' OR '.join(f'{prefix}{column} ILIKE %s' for column in columns) + ')')
+        params.extend([pattern] * len(columns))
+
+    return '(' + ' AND '.join(clauses) + ')', params
+
+
+def search_subquery(table: str, term: str) -> Tuple[str, list]:
+    """'SELECT id FROM <table> WHERE <match>' for filtering a related table by id"""
+    condition, params = search_condition(table, term)
+    return f'SELECT id FROM {table} WHERE {condition}', params
+
+
+def search_rank(table: str, term: str, alias: Optional[str] = None) -> Tuple[Optional[str], list]:
+    """
+    Relevance expression (higher is better) for ORDER BY
+
+    Returns:
+        (sql, params), or (None, []) when ranking is unavailable
+    """
+    words = search_terms(term)
+    if not words or not search_enabled():
+        return None, []
+    return f"word_similarity(%s, {search_document(table, alias)})", [' '.join(words)]
@@ -0,0 +1,88 @@
+"""
+Fast JSON encoding for API responses
+Installs an orjson-backed Flask JSON provider: datetime/date/time and UUID are encoded
+natively in C (ISO 8601 / canonical string), so serializers can hand raw DB values to
+the encoder instead of calling isoformat()/str() per field.
+Falls back to Flask's default provider when orjson is not installed or JSON_ENCODER=stdlib.
+"""
+
+import dataclasses
+import decimal
+import logging
+from typing import Any
+
+from flask import current_app, has_app_context
+from flask.json.provider import DefaultJSONProvider
+
+from app.config import Config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(o: Any) -> Any:
+    """Types orjson does not encode natively (mirrors Flask's default where it applies)"""
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider using orjson
+
+    Differences from the default provider: datetimes are ISO 8601 (not HTTP dates)
+    and non-ASCII text is emitted as UTF-8 instead of \\u escapes.
+    """
+
+    native_types = True
+
+    def _options(self, indent=False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _indent(self) -> bool:
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, default=_default, option=self._options(indent))
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, indent=bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self.dumps_bytes(obj, indent=self._indent()) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def native_encoding() -> bool:
+    """True when the active app's JSON provider encodes datetime/UUID natively"""
+    return has_app_context() and getattr(current_app.json, 'native_types', False)
+
+
+def init_app(app):
+    """Install the orjson provider unless disabled or unavailable"""
+    if Config.JSON_ENCODER != 'orjson':
+        return
+    if orjson is None:
+        logger.warning("orjson not installed; using Flask's default JSON provider")
+        return
+    app.json = OrjsonProvider(app)
@@ -0,0 +1,81 @@
+"""
+Streaming JSON responses for large list endpoints
+Writes {"data": [...]} incrementally so worker memory stays flat
+"""
+
+import logging
+from itertools import chain
+from typing import Callable, Iterable, Optional
+
+from flask import Response, current_app
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+def stream_json_list(rows: Iterable, serialize: Callable[[dict], Optional[dict]],
+                     key: str = 'data', chunk_size: int = 200) -> Response:
+    """
+    Stream rows as a JSON object {"<key>": [...]}
+
+    The first row is fetched before the response starts, so query errors
+    still raise inside the route and can be returned as a normal 500.
+    serialize() may return None to skip a row (e.g. permission filtering).
+
+    Args:
+        rows: Row iterator (usually execute_stream(...))
+        serialize: Row -> JSON-serializable dict (or None to skip)
+        key: Top-level key of the list
+        chunk_size: Number of items encoded and written together
+
+    Usage:
+        rows = execute_stream(query, params)
+        return stream_json_list(rows, _serialize_row)
+    """
+    # Same encoder as jsonify (bound here while the app context is active)
+    dumps = current_app.json.dumps
+    iterator = iter(rows)
+    first = next(iterator, _END)
+
+    def generate():
+        try:
+            yield '{' + dumps(key) + ': ['
+            buffer = []
+            written = False
+            pending = [] if first is _END else [first]
+
+            for row in chain(pending, iterator):
+                item = serialize(row)
+                if item is None:
+                    continue
+                buffer.append(item)
+                if len(buffer) >= chunk_size:
+                    yield (',' if written else '') + _encode_items(dumps, buffer)
+                    written = True
+                    buffer = []
+
+            if buffer:
+                yield (',' if written else '') + _encode_items(dumps, buffer)
+            yield ']}'
+        except Exception as e:
+            # Headers already sent; the truncated body signals the failure to the client
+            logger.error(f"Streaming response aborted: {e}")
+        finally:
+            _close(iterator)
+
+    response = Response(generate(), mimetype='application/json')
+    # Release the cursor/connection even if the body is never read (HEAD, early disconnect)
+    response.call_on_close(lambda: _close(iterator))
+    return response
+
+
+def _encode_items(dumps, items):
+    """Encode a chunk with one encoder call: '[a,b,c]' -> 'a,b,c'"""
+    return dumps(items)[1:-1]
+
+
+def _close(iterator):
+    close = getattr(iterator, 'close', None)
+    if close:
+        close()
@@ -0,0 +1,142 @@
+"""
+JSON serialization benchmark
+GET /api/jobs ve GET /api/stocks satırlarının JSON'a çevrilme süresini ölçer:
+Flask varsayılan encoder + isoformat()/str() dönüşümü ile orjson provider + ham değerler.
+Veritabanı gerekmez; satırlar sentetik üretilir.
+
+Kullanım: python benchmark_serialization.py [--jobs 20] [--steps 8] [--stocks 5000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.routes.jobs import _JOB_FIELDS, _JOB_STEP_FIELDS
+from app.routes.stocks import _CUSTOM_STOCK_FIELDS, _STOCK_FIELDS
+from app.utils.serializers import OrjsonProvider, orjson
+
+
+def _job_rows(count, steps_per_job):
+    now = datetime.now(timezone.utc)
+    jobs, steps = [], []
+    for i in range(count):
+        job_id = uuid.uuid4()
+        jobs.append({
+            'id': job_id, 'job_number': f'JOB-{i:05d}', 'title': f'Baskı işi {i} – ölçü/renk',
+            'description': 'Müşteri onayı bekleniyor', 'status': 'active', 'priority': 'normal',
+            'due_date': date.today() + timedelta(days=i), 'created_at': now - timedelta(hours=i),
+            'revision_no': 1, 'customer_id': uuid.uuid4(), 'customer_name': 'Örnek Müşteri A.Ş.',
+            'dealer_id': None, 'dealer_name': None, 'created_by_name': 'Şükrü Çelik',
+            'total_steps': steps_per_job, 'completed_steps': steps_per_job // 2,
+            'in_progress_steps': 1, 'blocked_steps': 0,
+        })
+        for order in range(steps_per_job):
+            steps.append({
+                'id': uuid.uuid4(), 'job_id': job_id, 'process_id': uuid.uuid4(), 'status': 'ready',
+                'order_index': order, 'due_date': date.today(), 'planned_start_date': None,
+                'planned_end_date': None, 'due_time': None, 'process_name': 'Kesim',
+                'process_code': 'KSM', 'process_description': None, 'process_group_id': uuid.uuid4(),
+                'process_group_color': '#ff9900', 'process_group_name': 'Üretim',
+                'assigned_to': uuid.uuid4(), 'assigned_to_name': 'Ayşe Yılmaz',
+                'completed_at': now, 'started_by': None, 'started_by_name': None,
+                'completed_by': None, 'completed_by_name': None, 'production_notes': None,
+                'requirements': None, 'started_at': now,
+            })
+    return jobs, steps
+
+
+def _stock_rows(count):
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        row = {name: None for name in _CUSTOM_STOCK_FIELDS}
+        row.update({
+            'id': uuid.uuid4(), 'product_code': f'STK-{i:06d}', 'product_name': f'Kuşe kağıt {i}',
+            'category': 'Kağıt', 'unit': 'adet', 'current_quantity': Decimal('120.50'),
+            'reserved_quantity': Decimal('10'), 'available_quantity': Decimal('110.50'),
+            'min_quantity': Decimal('50'), 'unit_price': Decimal('2.75'), 'currency': 'TRY',
+            'supplier_name': 'Tedarikçi Ltd.', 'description': None, 'is_active': True,
+            'created_at': now, 'updated_at': now, 'group1': 'Grup', 'property1': 'Özellik',
+        })
+        rows.append(row)
+    return rows
+
+
+def _encode_jobs(app, jobs, steps, native):
+    with app.app_context():
+        serialize_step = _JOB_STEP_FIELDS.serializer(_JOB_STEP_FIELDS.default, native=native)
+        serialize_job = _JOB_FIELDS.serializer(_JOB_FIELDS.default, native=native)
+        steps_by_job = {}
+        for step in steps:
+            steps_by_job.setdefault(step['job_id'], []).append(serialize_step(step))
+        data = []
+        for job in jobs:
+            job['steps'] = steps_by_job.get(job['id'], [])
+            data.append(serialize_job(job))
+        return app.json.response({'data': data}).get_data()
+
+
+def _encode_stocks(app, rows, native):
+    with app.app_context():
+        serialize = _STOCK_FIELDS.serializer(_STOCK_FIELDS.default, native=native)
+        return app.json.response({'data': [serialize(row) for row in rows]}).get_data()
+
+
+def _measure(fn, repeat):
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON serialization benchmark')
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--steps', type=int, default=8)
+    parser.add_argument('--stocks', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print('orjson kurulu değil: pip install orjson')
+        return 1
+
+    stdlib_app = Flask('stdlib')
+    stdlib_app.json = DefaultJSONProvider(stdlib_app)
+    orjson_app = Flask('orjson')
+    orjson_app.json = OrjsonProvider(orjson_app)
+
+    jobs, steps = _job_rows(args.jobs, args.steps)
+    stocks = _stock_rows(args.stocks)
+
+    cases = [
+        (f'jobs ({args.jobs} iş, {args.steps} adım)',
+         lambda: _encode_jobs(stdlib_app, jobs, steps, native=False),
+         lambda: _encode_jobs(orjson_app, jobs, steps, native=True)),
+        (f'stocks ({args.stocks} satır)',
+         lambda: _encode_stocks(stdlib_app, stocks, native=False),
+         lambda: _encode_stocks(orjson_app, stocks, native=True)),
+    ]
+
+    print(f"{'endpoint':<28}{'stdlib ms':>12}{'orjson ms':>12}{'hız':>8}")
+    for name, stdlib_fn, orjson_fn in cases:
+        stdlib_ms = _measure(stdlib_fn, args.repeat)
+        orjson_ms = _measure(orjson_fn, args.repeat)
+        print(f"{name:<28}{stdlib_ms:>12.2f}{orjson_ms:>12.2f}{stdlib_ms / orjson_ms:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,11 @@
+-- Migration: Keyset pagination index for the jobs list
+-- Created: 2026-10-16
+-- Description: GET /api/jobs?after=<created_at>,<id> reads jobs in (created_at DESC, id DESC) order;
+-- this index lets each page start at the cursor instead of skipping OFFSET rows
+
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at_id
+ON jobs(created_at DESC, id DESC);
+
+COMMENT ON INDEX idx_jobs_created_at_id IS 'Performance: Keyset (cursor) pagination for the jobs list';
+
+ANALYZE jobs;
@@ -0,0 +1,93 @@
+-- Migration: Denormalized job step counters
+-- Created: 2026-10-16
+-- Description: total/completed/in_progress/blocked step counts stored on jobs.
+-- A trigger on job_steps keeps them current in the same transaction as every
+-- INSERT/DELETE and status/job_id change, whichever code path writes the step.
+-- List endpoints (GET /api/jobs, /api/dashboard/recent-jobs) read them instead of
+-- joining job_steps. API workers start reading the columns after a restart (or
+-- POST /api/health/schema/refresh with CACHE_BACKEND=redis); until then they count
+-- steps per query, so results stay correct either way.
+
+BEGIN;
+
+ALTER TABLE jobs
+ADD COLUMN IF NOT EXISTS total_steps INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS completed_steps INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS in_progress_steps INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS blocked_steps INTEGER NOT NULL DEFAULT 0;
+
+-- Apply +1/-1 deltas for the affected job(s); the jobs row lock serializes
+-- concurrent step changes of the same job
+CREATE OR REPLACE FUNCTION update_job_step_counters()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.job_id = NEW.job_id THEN
+        UPDATE jobs
+        SET completed_steps = completed_steps
+                + (NEW.status IS NOT DISTINCT FROM 'completed')::int
+                - (OLD.status IS NOT DISTINCT FROM 'completed')::int,
+            in_progress_steps = in_progress_steps
+                + (NEW.status IS NOT DISTINCT FROM 'in_progress')::int
+                - (OLD.status IS NOT DISTINCT FROM 'in_progress')::int,
+            blocked_steps = blocked_steps
+                + (NEW.status IS NOT DISTINCT FROM 'blocked')::int
+                - (OLD.status IS NOT DISTINCT FROM 'blocked')::int
+        WHERE id = NEW.job_id;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE jobs
+        SET total_steps = total_steps - 1,
+            completed_steps = completed_steps - (OLD.status IS NOT DISTINCT FROM 'completed')::int,
+            in_progress_steps = in_progress_steps - (OLD.status IS NOT DISTINCT FROM 'in_progress')::int,
+            blocked_steps = blocked_steps - (OLD.status IS NOT DISTINCT FROM 'blocked')::int
+        WHERE id = OLD.job_id;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        UPDATE jobs
+        SET total_steps = total_steps + 1,
+            completed_steps = completed_steps + (NEW.status IS NOT DISTINCT FROM 'completed')::int,
+            in_progress_steps = in_progress_steps + (NEW.status IS NOT DISTINCT FROM 'in_progress')::int,
+            blocked_steps = blocked_steps + (NEW.status IS NOT DISTINCT FROM 'blocked')::int
+        WHERE id = NEW.job_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_update_job_step_counters ON job_steps;
+
+CREATE TRIGGER trigger_update_job_step_counters
+AFTER INSERT OR DELETE OR UPDATE OF status, job_id ON job_steps
+FOR EACH ROW
+EXECUTE FUNCTION update_job_step_counters();
+
+-- Backfill from job_steps; writers wait until commit so no change is missed
+LOCK TABLE job_steps IN SHARE MODE;
+
+UPDATE jobs j
+SET total_steps = c.total_steps,
+    completed_steps = c.completed_steps,
+    in_progress_steps = c.in_progress_steps,
+    blocked_steps = c.blocked_steps
+FROM (
+    SELECT
+        job_id,
+        COUNT(*) AS total_steps,
+        COUNT(*) FILTER (WHERE status = 'completed') AS completed_steps,
+        COUNT(*) FILTER (WHERE status = 'in_progress') AS in_progress_steps,
+        COUNT(*) FILTER (WHERE status = 'blocked') AS blocked_steps
+    FROM job_steps
+    GROUP BY job_id
+) c
+WHERE j.id = c.job_id;
+
+COMMENT ON COLUMN jobs.total_steps IS 'Denormalized: COUNT(job_steps), maintained by trigger_update_job_step_counters';
+COMMENT ON COLUMN jobs.completed_steps IS 'Denormalized: job_steps with status completed';
+COMMENT ON COLUMN jobs.in_progress_steps IS 'Denormalized: job_steps with status in_progress';
+COMMENT ON COLUMN jobs.blocked_steps IS 'Denormalized: job_steps with status blocked';
+
+COMMIT;
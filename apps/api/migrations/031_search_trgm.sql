@@ -0,0 +1,42 @@
+-- Migration: Trigram search for jobs, customers, stocks and suppliers
+-- Created: 2026-10-16
+-- Description: search_normalize() folds case and Turkish characters (İ/I/ı -> i, ş -> s,
+-- ğ -> g, ü -> u, ö -> o, ç -> c, â/î/û) so "isik" finds "IŞIK". GIN trigram indexes on the
+-- normalized document let '%term%' searches use an index instead of scanning the table.
+-- The document expressions must stay identical to SEARCH_DOCUMENTS in app/utils/search.py.
+-- Running API workers pick the function up on restart, or within seconds of
+-- POST /api/health/schema/refresh when CACHE_BACKEND=redis (memory backend: that worker only).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION search_normalize(value TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT lower(translate(coalesce(value, ''), 'İIıŞşĞğÜüÖöÇçÂâÎîÛû', 'iiissgguuooccaaiiuu'))
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_search_trgm
+ON jobs USING gin (search_normalize(coalesce(job_number, '') || ' ' || coalesce(title, '')) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_customers_search_trgm
+ON customers USING gin (search_normalize(coalesce(name, '') || ' ' || coalesce(code, '')) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_stocks_search_trgm
+ON stocks USING gin (search_normalize(coalesce(product_code, '') || ' ' || coalesce(product_name, '')) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_suppliers_search_trgm
+ON suppliers USING gin (search_normalize(coalesce(name, '') || ' ' || coalesce(contact_person, '') || ' ' || coalesce(email, '')) gin_trgm_ops);
+
+COMMENT ON FUNCTION search_normalize(TEXT) IS 'Search: lowercase + Turkish character folding (app/utils/search.py)';
+COMMENT ON INDEX idx_jobs_search_trgm IS 'Performance: Trigram search on job number and title';
+COMMENT ON INDEX idx_customers_search_trgm IS 'Performance: Trigram search on customer name and code';
+COMMENT ON INDEX idx_stocks_search_trgm IS 'Performance: Trigram search on product code and name';
+COMMENT ON INDEX idx_suppliers_search_trgm IS 'Performance: Trigram search on supplier name, contact and email';
+
+ANALYZE jobs;
+ANALYZE customers;
+ANALYZE stocks;
+ANALYZE suppliers;
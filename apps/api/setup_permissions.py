@@ -211,6 +211,13 @@ def setup_permissions():
     cursor.close()
     conn.close()
 
+    # Çalışan API worker'larının yetki cache'ini geçersiz kıl (Redis cache backend ile)
+    try:
+        from app.middleware.auth_middleware import invalidate_permission_cache
+        invalidate_permission_cache()
+    except Exception as e:
+        print(f"⚠️  Yetki cache'i temizlenemedi (PERMISSION_CACHE_TTL sonunda yenilenir): {e}")
+
     print("\n\n✅ Permission setup tamamlandı!")
     print("\n📊 Özet:")
     print(f"  - {len(roles)} rol")